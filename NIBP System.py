@@ -3,101 +3,109 @@ import serial
 import csv
 import time
 from datetime import datetime
-import pandas as pd
 import numpy as np
-from scipy.signal import find_peaks
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QPushButton, QVBoxLayout, QHBoxLayout, 
-    QLabel, QTextEdit, QFileDialog, QTabWidget, QGroupBox
+    QLabel, QTextEdit, QFileDialog, QTabWidget, QGroupBox, QComboBox, QProgressBar
 )
-from PyQt5.QtCore import QThread, pyqtSignal
+from PyQt5.QtCore import QThread, QTimer, pyqtSignal
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from line_parser import ChunkParser, TEKANAN, parse_nibp_result, nibp_result_lines
+from sample_batch import SampleBatcher
+from replay_source import ReplayReader
+from latency import LatencyTracker
+from latency_overlay import LatencyOverlay
+from live_plot import create_live_plot
+from log_console import LogConsole
+from bp_analyzer import BPAnalyzer, StreamingBPAnalyzer
+from refresh_scheduler import update_text
+from analysis_jobs import AnalysisRunner
+from decimation import decimate
+
+# Ringkasan latensi per tahap (serial -> pixel) ditulis berkala ke file ini; F3 = overlay
+LATENCY_JSON = "nibp_latency_stats.json"
+# Plot live digambar ulang dengan frame rate tetap, bukan per sampel
+# "matplotlib" (blitting) atau "pyqtgraph"
+LIVE_PLOT_BACKEND = "matplotlib"
+LIVE_PLOT_FPS = 30
+# Laju sampel deflasi untuk tahap detrend + band-pass analisis (None = moving average lama,
+# bp_analyzer.DEFLATION_FS = laju firmware). Dengan fs estimasi live memakai filter kausal
+# dan hasil akhir dihitung ulang offline di thread pool
+ANALYSIS_FS = None
+# Algoritma sistolik/diastolik dari bp_analyzer.ALGORITHMS (peak_index, firmware_ratio, envelope_fit)
+ANALYSIS_ALGORITHM = "peak_index"
+# Titik maksimum kurva (min/max per bin) dan marker puncak di plot analisis;
+# matplotlib tetap menggambar di thread GUI
+ANALYSIS_PLOT_POINTS = 4000
+# Log Output menyimpan LOG_MAX_LINES baris terakhir. Baris per sampel hanya ditampilkan
+# tiap LOG_SAMPLE_EVERY sampel (0 = tidak ditampilkan); file log tetap berisi semua sampel.
+LOG_MAX_LINES = 2000
+LOG_SAMPLE_EVERY = 5
+# Batas tunggu (detik) sisa blok hasil setelah baris "=== HASIL NIBP ==="
+HASIL_TIMEOUT = 3.0
 
 # --- Worker Thread untuk Serial ---
 class SerialReader(QThread):
-    data_received = pyqtSignal(str, int, float)  # time_str, raw, mmHg
+    # timestamps (n,), blok (n x 2) kolom [raw, mmHg]; dikirim paling sering tiap batch_interval_ms
+    data_received = pyqtSignal(object, object)
     done = pyqtSignal(str)
 
-    def __init__(self, port='COM14', baud=115200):
+    def __init__(self, port='COM14', baud=115200, batch_interval_ms=50, latency=None, connect_delay=2.0):
         super().__init__()
         self.port = port
         self.baud = baud
+        self.batch_interval_ms = batch_interval_ms
+        self.latency = latency
+        # Arduino reset saat port dibuka; START dikirim setelah jeda ini
+        self.connect_delay = connect_delay
         self.running = False
 
     def run(self):
         try:
             with serial.Serial(self.port, self.baud, timeout=1) as ser:
-                time.sleep(2)  # tunggu koneksi serial
+                time.sleep(self.connect_delay)  # tunggu koneksi serial
                 ser.write(b'START\n')
                 self.running = True
+                parser = ChunkParser(TEKANAN)
+                batcher = SampleBatcher(2, self.batch_interval_ms)
+                # Baris hasil sejak baris "HASIL"; blok Print_Hasil.ino bisa datang di beberapa read
+                hasil = None
                 while self.running:
-                    line = ser.readline().decode().strip()
-                    if "Tekanan:" in line:
-                        try:
-                            mmhg_str = line.replace("Tekanan:", "").replace("mmHg", "").strip()
-                            mmhg = float(mmhg_str)
-                            raw = int((mmhg / 0.05825) + 1648)
-                            now = datetime.now().strftime('%H:%M:%S')
-                            self.data_received.emit(now, raw, mmhg)
-                        except:
-                            continue
-                    elif "HASIL" in line:
-                        self.done.emit(line)
-                        break
+                    # Semua baris yang sudah masuk di-parse sekaligus
+                    chunk = ser.read(max(1, ser.in_waiting))
+                    t_read = time.time()
+                    values, other = parser.feed(chunk)
+                    if self.latency is not None and len(values):
+                        self.latency.record('parse', t_read)
+                    mmhgs = values[:, 0]
+                    if hasil is None:
+                        start = next((k for k, (_, line) in enumerate(other) if "HASIL" in line), None)
+                        if start is not None:
+                            mmhgs = mmhgs[:other[start][0]]
+                            hasil = [line for _, line in other[start:]]
+                            hasil_deadline = t_read + HASIL_TIMEOUT
+                    else:
+                        mmhgs = mmhgs[:0]
+                        hasil.extend(line for _, line in other)
+
+                    raws = np.floor((mmhgs / 0.05825) + 1648)
+                    batcher.add(np.column_stack((raws, mmhgs)), t_read)
+                    batch = batcher.pop(force=hasil is not None)
+                    if batch is not None:
+                        self.data_received.emit(*batch)
+
+                    if hasil is not None:
+                        lengkap = nibp_result_lines(hasil)
+                        if lengkap is not None or t_read > hasil_deadline:
+                            self.done.emit("\n".join(lengkap or hasil))
+                            break
         except Exception as e:
             self.done.emit(f"Gagal konek: {e}")
 
     def stop(self):
         self.running = False
 
-# --- Class untuk Analisis BP ---
-class BPAnalyzer:
-    def __init__(self):
-        pass
-    
-    def moving_average(self, x, w=5):
-        """Smoothing filter untuk mengurangi noise"""
-        return np.convolve(x, np.ones(w)/w, mode='valid')
-    
-    def analyze_bp(self, pressure_data):
-        """Analisis tekanan darah dari data deflasi"""
-        try:
-            # Cari puncak inflasi (mulai deflasi)
-            peak_idx = np.argmax(pressure_data)
-            deflation_data = pressure_data[peak_idx:]
-            
-            # Apply smoothing filter
-            smoothed = self.moving_average(deflation_data, w=5)
-            
-            # Deteksi puncak osilasi
-            peaks, _ = find_peaks(smoothed, distance=5)
-            if len(peaks) == 0:
-                return None, None, None, None, None, None
-            
-            peak_values = smoothed[peaks]
-            
-            # Hitung MAP (Maximum Amplitude Point)
-            max_peak_index = peaks[np.argmax(peak_values)]
-            MAP_value = smoothed[max_peak_index]
-            
-            # Filter puncak yang signifikan
-            threshold = 0.3 * np.max(peak_values)
-            valid_peaks = peaks[peak_values > threshold]
-            
-            if len(valid_peaks) < 20:
-                return None, None, None, None, None, None
-            
-            # Estimasi Sistolik dan Diastolik
-            systolic_value = smoothed[valid_peaks[1]] if len(valid_peaks) > 1 else MAP_value
-            diastolic_value = smoothed[valid_peaks[-19]] if len(valid_peaks) >= 20 else MAP_value
-            
-            return smoothed, peaks, MAP_value, systolic_value, diastolic_value, valid_peaks
-            
-        except Exception as e:
-            print(f"Error dalam analisis: {e}")
-            return None, None, None, None, None, None
-
 # --- GUI Utama ---
 class NIBPGUI(QWidget):
     def __init__(self):
@@ -106,13 +114,21 @@ class NIBPGUI(QWidget):
         self.resize(1200, 800)
         
         # Inisialisasi analyzer
-        self.bp_analyzer = BPAnalyzer()
+        self.bp_analyzer = BPAnalyzer(fs=ANALYSIS_FS, algorithm=ANALYSIS_ALGORITHM)
+        # Analisis inkremental selama pengukuran (hasil sama dengan bp_analyzer)
+        self.stream_analyzer = StreamingBPAnalyzer(fs=ANALYSIS_FS, algorithm=ANALYSIS_ALGORITHM)
+        # Baca CSV + analyze_bp di thread pool; job baru membatalkan job lama
+        self.analysis_runner = AnalysisRunner(self)
         
         # Setup UI
         self.setup_ui()
+        self.latency = LatencyTracker(dump_path=LATENCY_JSON)
+        self.session_latency = self.latency
+        self.latency_overlay = LatencyOverlay(self, self.latency)
         
         # Data penyimpanan
         self.times, self.raws, self.mmhgs = [], [], []
+        self.log_sample_count = 0
         self.current_csv_file = None
         self.log_file = None
         self.csv_file = None
@@ -147,28 +163,32 @@ class NIBPGUI(QWidget):
         self.stop_btn = QPushButton("STOP Pengukuran")
         self.stop_btn.setEnabled(False)
         self.analyze_btn = QPushButton("Analisis Data Terakhir")
+        self.replay_btn = QPushButton("Replay CSV")
+        self.replay_speed = QComboBox()
+        # Label -> kelipatan real time (0 = secepat mungkin)
+        for label, speed in (("1x", 1.0), ("5x", 5.0), ("20x", 20.0), ("Maks", 0.0)):
+            self.replay_speed.addItem(label, speed)
         
         control_layout.addWidget(self.start_btn)
         control_layout.addWidget(self.stop_btn)
         control_layout.addWidget(self.analyze_btn)
+        control_layout.addWidget(self.replay_btn)
+        control_layout.addWidget(self.replay_speed)
         layout.addLayout(control_layout)
         
         # Real-time plot
-        self.canvas = FigureCanvas(plt.Figure(figsize=(10, 4)))
-        self.ax = self.canvas.figure.subplots()
-        self.line, = self.ax.plot([], [], label="Tekanan (mmHg)")
-        self.ax.set_title("Grafik Tekanan Real-time")
-        self.ax.set_xlabel("Sample")
-        self.ax.set_ylabel("mmHg")
-        self.ax.grid(True)
-        self.ax.legend()
-        
-        layout.addWidget(self.canvas)
+        self.live_plot = create_live_plot(LIVE_PLOT_BACKEND)
+        layout.addWidget(self.live_plot.widget)
+        self.estimate_label = QLabel(self.format_estimates({}))
+        self.estimate_label.setStyleSheet("font-size: 16px; font-weight: bold;")
+        layout.addWidget(self.estimate_label)
+        self.plot_timer = QTimer()
+        self.plot_timer.timeout.connect(self.refresh_live_plot)
+        self.plot_timer.start(int(1000 / LIVE_PLOT_FPS))
         
         # Output text
         layout.addWidget(QLabel("Log Output:"))
-        self.output_text = QTextEdit()
-        self.output_text.setReadOnly(True)
+        self.output_text = LogConsole(max_lines=LOG_MAX_LINES)
         self.output_text.setMaximumHeight(200)
         layout.addWidget(self.output_text)
         
@@ -178,6 +198,7 @@ class NIBPGUI(QWidget):
         self.start_btn.clicked.connect(self.start_serial)
         self.stop_btn.clicked.connect(self.stop_measurement)
         self.analyze_btn.clicked.connect(self.analyze_current_data)
+        self.replay_btn.clicked.connect(lambda: self.start_replay())
 
     def setup_analysis_tab(self):
         layout = QVBoxLayout()
@@ -186,8 +207,15 @@ class NIBPGUI(QWidget):
         file_layout = QHBoxLayout()
         self.load_btn = QPushButton("Load CSV File")
         self.file_label = QLabel("No file selected")
+        self.analysis_progress = QProgressBar()
+        self.analysis_progress.setRange(0, 100)
+        self.analysis_progress.setVisible(False)
+        self.cancel_analysis_btn = QPushButton("Batal")
+        self.cancel_analysis_btn.setVisible(False)
         file_layout.addWidget(self.load_btn)
         file_layout.addWidget(self.file_label)
+        file_layout.addWidget(self.analysis_progress)
+        file_layout.addWidget(self.cancel_analysis_btn)
         layout.addLayout(file_layout)
         
         # Analysis plot
@@ -209,11 +237,32 @@ class NIBPGUI(QWidget):
         
         # Connect signals
         self.load_btn.clicked.connect(self.load_csv_file)
+        self.cancel_analysis_btn.clicked.connect(self.analysis_runner.cancel)
+        self.analysis_runner.progress.connect(self.on_analysis_progress)
+        self.analysis_runner.finished.connect(self.on_analysis_finished)
+        self.analysis_runner.failed.connect(self.on_analysis_failed)
+        self.analysis_runner.cancelled.connect(self.on_analysis_cancelled)
 
     def start_serial(self):
+        self.start_reader(SerialReader(latency=self.latency), "nibp_data")
+
+    def start_replay(self, path=None, speed=None):
+        """Putar ulang rekaman CSV lewat jalur yang sama dengan pengukuran live"""
+        if path is None:
+            path, _ = QFileDialog.getOpenFileName(self, "Pilih rekaman CSV", "", "CSV files (*.csv)")
+            if not path:
+                return
+        if speed is None:
+            speed = self.replay_speed.currentData()
+        # Timestamp replay adalah waktu rekaman asli, jadi tidak dicatat sebagai latensi
+        self.start_reader(ReplayReader(path, speed), "replay_data", track_latency=False)
+        self.output_text.append(f"🔁 Replay {path.split('/')[-1]} pada {speed:g}x" if speed else
+                                f"🔁 Replay {path.split('/')[-1]} secepat mungkin")
+
+    def start_reader(self, reader, prefix, track_latency=True):
         # Setup file untuk saving
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        self.current_csv_file = f"nibp_data_{timestamp}.csv"
+        self.current_csv_file = f"{prefix}_{timestamp}.csv"
         
         self.log_file = open(f"log_{timestamp}.txt", "w")
         self.csv_file = open(self.current_csv_file, "w", newline='')
@@ -222,31 +271,42 @@ class NIBPGUI(QWidget):
         
         # Clear data dan UI
         self.output_text.clear()
+        self.log_sample_count = 0
         self.times.clear()
         self.raws.clear()
         self.mmhgs.clear()
+        self.stream_analyzer.reset()
+        update_text(self.estimate_label, self.format_estimates({}))
         self.reset_plot()
         
-        # Start serial reader
-        self.reader = SerialReader()
+        # Start reader (serial atau replay)
+        self.reader = reader
+        self.session_latency = self.latency if track_latency else LatencyTracker()
         self.reader.data_received.connect(self.update_data)
         self.reader.done.connect(self.stop_serial)
         self.reader.start()
         
         # Update button states
         self.start_btn.setEnabled(False)
+        self.replay_btn.setEnabled(False)
         self.stop_btn.setEnabled(True)
         
         self.output_text.append(f"📊 Mulai pengukuran... File: {self.current_csv_file}")
 
     def reset_plot(self):
-        self.ax.clear()
-        self.ax.set_title("Grafik Tekanan Real-time")
-        self.ax.set_xlabel("Sample")
-        self.ax.set_ylabel("mmHg")
-        self.ax.grid(True)
-        self.line, = self.ax.plot([], [], label="Tekanan (mmHg)")
-        self.ax.legend()
+        self.live_plot.reset()
+
+    def refresh_live_plot(self):
+        # Satu frame: hanya digambar kalau ada sampel baru sejak frame sebelumnya
+        if self.live_plot.redraw():
+            self.session_latency.complete('paint')
+            update_text(self.estimate_label, self.format_estimates(self.stream_analyzer.estimates()))
+
+    def format_estimates(self, estimates):
+        def fmt(key):
+            value = estimates.get(key)
+            return "--" if value is None else f"{value:.1f}"
+        return f"Estimasi live: SYS {fmt('systolic')} | DIA {fmt('diastolic')} | MAP {fmt('map')} mmHg"
 
     def stop_measurement(self):
         if hasattr(self, 'reader'):
@@ -255,26 +315,34 @@ class NIBPGUI(QWidget):
             self.reader.wait()
         
         self.start_btn.setEnabled(True)
+        self.replay_btn.setEnabled(True)
         self.stop_btn.setEnabled(False)
         self.output_text.append("⏹️ Pengukuran dihentikan secara manual")
 
-    def update_data(self, time_str, raw, mmhg):
-        self.times.append(time_str)
-        self.raws.append(raw)
-        self.mmhgs.append(mmhg)
+    def update_data(self, timestamps, block):
+        # Satu batch sampel dari SerialReader: kolom [raw, mmHg]
+        self.session_latency.record('deliver', timestamps)
+        time_strs = [datetime.fromtimestamp(t).strftime('%H:%M:%S') for t in timestamps]
+        raws = block[:, 0].astype(int).tolist()
+        mmhgs = block[:, 1].tolist()
+        self.times.extend(time_strs)
+        self.raws.extend(raws)
+        self.mmhgs.extend(mmhgs)
+        self.session_latency.record('buffer', timestamps)
 
-        # Update grafik real-time
-        self.line.set_xdata(range(len(self.mmhgs)))
-        self.line.set_ydata(self.mmhgs)
-        self.ax.relim()
-        self.ax.autoscale_view()
-        self.canvas.draw()
+        # Grafik digambar oleh timer frame (refresh_live_plot), di sini hanya tambah data
+        self.live_plot.append(mmhgs)
+        self.stream_analyzer.feed(mmhgs)
+        self.session_latency.defer('paint', timestamps)
 
-        # Tampilkan dan simpan
-        log_line = f"{time_str} | RAW: {raw} | mmHg: {mmhg:.2f}"
-        self.output_text.append(log_line)
-        self.log_file.write(log_line + "\n")
-        self.csv_writer.writerow([time_str, raw, mmhg])
+        # Simpan semua sampel, tampilkan sebagian
+        log_lines = [f"{t} | RAW: {r} | mmHg: {m:.2f}" for t, r, m in zip(time_strs, raws, mmhgs)]
+        self.log_file.write("\n".join(log_lines) + "\n")
+        if LOG_SAMPLE_EVERY:
+            first = -self.log_sample_count % LOG_SAMPLE_EVERY
+            self.output_text.append_lines(log_lines[first::LOG_SAMPLE_EVERY])
+            self.log_sample_count += len(log_lines)
+        self.csv_writer.writerows(zip(time_strs, raws, mmhgs))
 
     def stop_serial(self, message):
         self.output_text.append("\n✅ Pengukuran selesai.")
@@ -290,26 +358,37 @@ class NIBPGUI(QWidget):
         
         # Update button states
         self.start_btn.setEnabled(True)
+        self.replay_btn.setEnabled(True)
         self.stop_btn.setEnabled(False)
         
         # Parse dan tampilkan hasil jika ada
-        if "Sistolik" in message and "Diastolik" in message:
-            try:
-                parts = message.split(',')
-                sistolik = parts[0].split('=')[1].strip().replace("mmHg", "")
-                diastolik = parts[1].split('=')[1].strip().replace("mmHg", "")
-                bpm = parts[2].split('=')[1].strip()
-
-                self.output_text.append("\n💡 Hasil dari Arduino:")
-                self.output_text.append(f"   🩺 Sistolik  : {sistolik} mmHg")
-                self.output_text.append(f"   🫀 Diastolik : {diastolik} mmHg")
-                self.output_text.append(f"   ❤️ BPM       : {bpm}")
-            except:
-                self.output_text.append("\n⚠️ Format hasil tidak dikenali:")
-                self.output_text.append(message)
+        hasil = parse_nibp_result(message)
+        if hasil is not None:
+            sistolik, diastolik, bpm = hasil
+            self.output_text.append("\n💡 Hasil dari Arduino:")
+            self.output_text.append(f"   🩺 Sistolik  : {sistolik:g} mmHg")
+            self.output_text.append(f"   🫀 Diastolik : {diastolik:g} mmHg")
+            if bpm is not None:
+                self.output_text.append(f"   ❤️ BPM       : {bpm:g}")
+        elif "Sistolik" in message and "Diastolik" in message:
+            self.output_text.append("\n⚠️ Format hasil tidak dikenali:")
+            self.output_text.append(message)
         else:
             self.output_text.append(message)
 
+        # Hasil analisis streaming sudah tersedia begitu sampel terakhir masuk
+        _, _, MAP, systolic, diastolic, _ = self.stream_analyzer.result()
+        if MAP is not None:
+            if self.stream_analyzer.matches_batch:
+                self.output_text.append("\n📈 Hasil analisis streaming:")
+            else:
+                # Filter kausal: bisa beberapa mmHg dari analisis offline (zero-phase)
+                self.output_text.append("\n📈 Hasil analisis streaming (sementara, filter kausal; "
+                                        "hasil akhir lewat 'Analisis Data Terakhir'):")
+            self.output_text.append(f"   🩺 Sistolik  : {systolic:.1f} mmHg")
+            self.output_text.append(f"   🫀 Diastolik : {diastolic:.1f} mmHg")
+            self.output_text.append(f"   💓 MAP       : {MAP:.1f} mmHg")
+
     def analyze_current_data(self):
         """Analisis data yang baru saja diambil"""
         if len(self.mmhgs) < 50:
@@ -318,10 +397,15 @@ class NIBPGUI(QWidget):
         
         self.output_text.append("\n🔍 Memulai analisis data...")
         
-        # Lakukan analisis
-        pressure_data = np.array(self.mmhgs)
-        smoothed, peaks, MAP, systolic, diastolic, valid_peaks = self.bp_analyzer.analyze_bp(pressure_data)
-        
+        # Pakai hasil streaming kalau sudah mencakup semua sampel dan identik dengan batch,
+        # selain itu analisis di thread pool
+        if self.stream_analyzer.matches_batch and self.stream_analyzer.n_samples == len(self.mmhgs):
+            self.show_live_result(self.stream_analyzer.result())
+        else:
+            self.start_analysis("Analisis Data Real-time", pressure=np.array(self.mmhgs))
+
+    def show_live_result(self, result):
+        smoothed, peaks, MAP, systolic, diastolic, valid_peaks = result
         if smoothed is not None:
             self.display_analysis_results(smoothed, peaks, MAP, systolic, diastolic, valid_peaks, 
                                         "Analisis Data Real-time")
@@ -343,48 +427,72 @@ class NIBPGUI(QWidget):
         )
         
         if file_path:
-            try:
-                df = pd.read_csv(file_path)
-                if 'mmHg' not in df.columns:
-                    self.results_text.setText("❌ File CSV harus memiliki kolom 'mmHg'")
-                    return
-                
-                self.file_label.setText(f"File: {file_path.split('/')[-1]}")
-                pressure_data = df['mmHg'].values
-                
-                # Lakukan analisis
-                smoothed, peaks, MAP, systolic, diastolic, valid_peaks = self.bp_analyzer.analyze_bp(pressure_data)
-                
-                if smoothed is not None:
-                    self.display_analysis_results(smoothed, peaks, MAP, systolic, diastolic, valid_peaks,
-                                                f"Analisis File: {file_path.split('/')[-1]}")
-                    
-                    results = f"""📊 Hasil Analisis File CSV:
+            # Job file sebelumnya (kalau masih jalan) dibatalkan oleh start_analysis
+            self.file_label.setText(f"File: {file_path.split('/')[-1]}")
+            self.start_analysis(f"Analisis File: {file_path.split('/')[-1]}", path=file_path)
+            self.results_text.setText("⏳ Membaca dan menganalisis file...")
+
+    def start_analysis(self, title, path=None, pressure=None):
+        # submit membatalkan job aktif (signal cancelled) sebelum progress job baru ditampilkan
+        self.analysis_runner.submit(self.bp_analyzer, title, path=path, pressure=pressure)
+        self.analysis_progress.setValue(0)
+        self.analysis_progress.setFormat("%p%")
+        self.analysis_progress.setVisible(True)
+        self.cancel_analysis_btn.setVisible(True)
+
+    def finish_analysis(self):
+        self.analysis_progress.setVisible(False)
+        self.cancel_analysis_btn.setVisible(False)
+
+    def on_analysis_progress(self, percent, stage):
+        self.analysis_progress.setValue(percent)
+        self.analysis_progress.setFormat(f"{stage} %p%")
+
+    def on_analysis_finished(self, job):
+        self.finish_analysis()
+        if job.path is None:
+            self.show_live_result(job.result)
+        else:
+            self.show_file_result(job)
+
+    def on_analysis_failed(self, message):
+        self.finish_analysis()
+        self.results_text.setText(f"❌ Error membaca file: {message}")
+
+    def on_analysis_cancelled(self):
+        self.finish_analysis()
+        self.results_text.setText("⏹️ Analisis dibatalkan")
+
+    def show_file_result(self, job):
+        smoothed, peaks, MAP, systolic, diastolic, valid_peaks = job.result
+        if smoothed is not None:
+            self.display_analysis_results(smoothed, peaks, MAP, systolic, diastolic, valid_peaks, job.title)
+            
+            results = f"""📊 Hasil Analisis File CSV:
 🩺 Sistolik  : {systolic:.1f} mmHg
 🫀 Diastolik : {diastolic:.1f} mmHg  
 💓 MAP       : {MAP:.1f} mmHg
 
-📈 Total samples: {len(pressure_data)}
+📈 Total samples: {job.samples}
 🔍 Deflation samples: {len(smoothed)}
 📍 Peaks detected: {len(peaks)}
 ✅ Valid peaks: {len(valid_peaks)}"""
-                    
-                    self.results_text.setText(results)
-                else:
-                    self.results_text.setText("❌ Gagal menganalisis data dari file CSV")
-                    
-            except Exception as e:
-                self.results_text.setText(f"❌ Error membaca file: {str(e)}")
+            
+            self.results_text.setText(results)
+        else:
+            self.results_text.setText("❌ Gagal menganalisis data dari file CSV")
 
     def display_analysis_results(self, smoothed, peaks, MAP, systolic, diastolic, valid_peaks, title):
         """Tampilkan hasil analisis di plot"""
         self.analysis_ax.clear()
         
         # Plot data smoothed
-        self.analysis_ax.plot(smoothed, label='Tekanan (smoothed)', color='blue', linewidth=1.5)
+        x, y = decimate(np.arange(len(smoothed)), smoothed, len(smoothed) * 2 // ANALYSIS_PLOT_POINTS)
+        self.analysis_ax.plot(x, y, label='Tekanan (smoothed)', color='blue', linewidth=1.5)
         
-        # Plot semua peaks
-        self.analysis_ax.plot(peaks, smoothed[peaks], "rx", label="Puncak Osilasi", markersize=6)
+        # Plot semua peaks (dijarangkan kalau lebih banyak dari ANALYSIS_PLOT_POINTS)
+        shown = peaks[::max(1, len(peaks) // ANALYSIS_PLOT_POINTS)]
+        self.analysis_ax.plot(shown, smoothed[shown], "rx", label="Puncak Osilasi", markersize=6)
         
         # Plot garis referensi
         self.analysis_ax.axhline(y=MAP, color='green', linestyle='--', 
@@ -396,7 +504,8 @@ class NIBPGUI(QWidget):
         
         # Highlight valid peaks
         if valid_peaks is not None and len(valid_peaks) > 0:
-            self.analysis_ax.plot(valid_peaks, smoothed[valid_peaks], "go", 
+            shown = valid_peaks[::max(1, len(valid_peaks) // ANALYSIS_PLOT_POINTS)]
+            self.analysis_ax.plot(shown, smoothed[shown], "go", 
                                 label="Valid Peaks", markersize=4, alpha=0.7)
         
         self.analysis_ax.set_title(title)
@@ -405,10 +514,13 @@ class NIBPGUI(QWidget):
         self.analysis_ax.legend()
         self.analysis_ax.grid(True, alpha=0.3)
         
-        self.analysis_canvas.draw()
+        # draw_idle: render Agg digabung ke iterasi event loop berikutnya, tidak di dalam slot ini
+        self.analysis_canvas.draw_idle()
 
     def closeEvent(self, event):
         # Cleanup saat aplikasi ditutup
+        self.analysis_runner.cancel()
+        self.analysis_runner.wait(2000)
         try:
             if hasattr(self, 'reader'):
                 self.reader.stop()
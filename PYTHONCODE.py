@@ -3,16 +3,16 @@ import numpy as np
 import datetime
 import serial
 import threading
+import time
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QLabel, QVBoxLayout, QHBoxLayout, QFrame,
     QPushButton, QDialog
 )
-from PyQt5.QtCore import Qt, QTimer, pyqtSignal, QObject
+from PyQt5.QtCore import Qt, QTimer
 import pyqtgraph as pg
-
-# ----------- Komunikasi Data Serial ----------
-class SerialData(QObject):
-    data_received = pyqtSignal(float, float, float)  # ECG, SpO₂, RESP
+from line_parser import ChunkParser, ECG_SPO2_RESP
+from ring_buffer import SPSCRingBuffer
+from sweep_renderer import SweepTrace
 
 # ----------- Kelas Utama ----------
 class PatientMonitor(QWidget):
@@ -22,9 +22,8 @@ class PatientMonitor(QWidget):
         self.resize(1820, 960)
         self.setStyleSheet("background-color: black;")
 
-        # Signal serial
-        self.serial_data = SerialData()
-        self.serial_data.data_received.connect(self.receive_serial_data)
+        # Ring buffer antara thread serial (tulis) dan timer display (baca): ECG, SpO₂, RESP
+        self.ring = SPSCRingBuffer(3, 4096)
 
         # Buffer data sinyal
         self.buffer_size = 1000
@@ -41,9 +40,9 @@ class PatientMonitor(QWidget):
         graph_layout = QVBoxLayout()
 
         # Grafik sinyal
-        self.ecg_plot, self.ecg_curve, self.ecg_vline = self.create_plot("ECG", "lime", self.ecg_data, (-1.5, 1.5))
-        self.spo2_plot, self.spo2_curve, self.spo2_vline = self.create_plot("SpO₂", "red", self.spo2_data, (-0.2, 1.2))
-        self.resp_plot, self.resp_curve, self.resp_vline = self.create_plot("RESP", "yellow", self.resp_data, (-0.5, 1.5))
+        self.ecg_plot, self.ecg_trace = self.create_plot("ECG", "lime", self.ecg_data, (-1.5, 1.5))
+        self.spo2_plot, self.spo2_trace = self.create_plot("SpO₂", "red", self.spo2_data, (-0.2, 1.2))
+        self.resp_plot, self.resp_trace = self.create_plot("RESP", "yellow", self.resp_data, (-0.5, 1.5))
 
         graph_layout.addWidget(self.ecg_plot)
         graph_layout.addWidget(self.spacer())
@@ -104,13 +103,12 @@ class PatientMonitor(QWidget):
         plot.setYRange(*y_range)
         plot.getPlotItem().hideAxis('bottom')
         plot.getPlotItem().hideAxis('left')
-        curve = plot.plot(self.x, data_array, pen=pg.mkPen(color, width=2))
-        vline = pg.InfiniteLine(pos=0, angle=90, pen=pg.mkPen('black', width=9))
-        plot.addItem(vline)
+        # Sweep: hanya segmen di sekitar kursor yang digambar ulang, erase bar berupa celah NaN
+        trace = SweepTrace(plot, self.x, data_array, pg.mkPen(color, width=2))
 
         layout.addWidget(plot)
         container.setLayout(layout)
-        return container, curve, vline
+        return container, trace
 
     def spacer(self):
         s = QFrame()
@@ -206,20 +204,26 @@ class PatientMonitor(QWidget):
         self.label_datetime.setText(now.strftime("%Y-%m-%d %H:%M:%S"))
 
     def update_waveform_display(self):
-        self.ecg_curve.setData(self.x, self.ecg_data)
-        self.spo2_curve.setData(self.x, self.spo2_data)
-        self.resp_curve.setData(self.x, self.resp_data)
-
-        vpos = self.x[self.index]
-        self.ecg_vline.setPos(vpos)
-        self.spo2_vline.setPos(vpos)
-        self.resp_vline.setPos(vpos)
-        self.index = (self.index + 1) % self.buffer_size
-
-    def receive_serial_data(self, ecg, spo2, resp):
-        self.ecg_data[self.index] = ecg
-        self.spo2_data[self.index] = spo2
-        self.resp_data[self.index] = resp
+        # Ambil semua sampel baru dari thread serial; kursor hanya maju sesuai data yang datang
+        _, rows = self.ring.read()
+        self.receive_serial_data(rows)
+
+        for trace in (self.ecg_trace, self.spo2_trace, self.resp_trace):
+            trace.advance(self.index, len(rows))
+            trace.render()
+
+    def receive_serial_data(self, rows):
+        n = len(rows)
+        if n == 0:
+            return
+        rows = rows[-self.buffer_size:]
+        idx = (self.index + n - len(rows) + np.arange(len(rows))) % self.buffer_size
+        self.ecg_data[idx] = rows[:, 0]
+        self.spo2_data[idx] = rows[:, 1]
+        self.resp_data[idx] = rows[:, 2]
+        self.index = (self.index + n) % self.buffer_size
+
+        ecg, spo2, resp = rows[-1].tolist()
 
         self.label_hr.value_label.setText(str(int(60 + ecg * 10)))
         self.label_spo2.value_label.setText(f"{int(spo2 * 100)}%")
@@ -230,17 +234,10 @@ class PatientMonitor(QWidget):
             try:
                 # Ganti COM port jika perlu (Windows: "COM3", Linux: "/dev/ttyUSB0")
                 ser = serial.Serial("/dev/ttyACM0", 9600, timeout=1)
+                parser = ChunkParser(ECG_SPO2_RESP)
                 while True:
-                    line = ser.readline().decode(errors="ignore").strip()
-                    if line.startswith("ECG:"):
-                        try:
-                            parts = line.split(',')
-                            ecg = float(parts[0].split(':')[1])
-                            spo2 = float(parts[1].split(':')[1])
-                            resp = float(parts[2].split(':')[1])
-                            self.serial_data.data_received.emit(ecg, spo2, resp)
-                        except:
-                            continue
+                    values, _ = parser.read_from(ser)
+                    self.ring.write(values, time.time())
             except serial.SerialException:
                 print("Gagal membuka port serial.")
 
@@ -0,0 +1,147 @@
+"""Akuisisi serial di proses terpisah dengan ring buffer di shared memory.
+
+Parsing serial, DSP dan rendering Qt berbagi satu GIL kalau semuanya jalan di
+satu interpreter. Mode proses menjalankan reader + parser di proses anak yang
+menulis ke `SPSCRingBuffer` di atas `multiprocessing.shared_memory`; GUI
+memetakan memori yang sama tanpa copy. Shared memory dimiliki supervisor
+(proses GUI), jadi kalau proses anak mati ring dan posisinya tetap utuh dan
+proses pengganti melanjutkan dari `write_pos` terakhir.
+"""
+import multiprocessing as mp
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+import serial
+
+from line_parser import MonitorStreamParser
+from ring_buffer import SPSCRingBuffer, HEADER_SLOTS
+
+
+# --- Shared memory ring ---
+def _ring_nbytes(n_channels, capacity):
+    return HEADER_SLOTS * 8 + capacity * 8 + capacity * n_channels * 4
+
+
+def _ring_views(buf, n_channels, capacity):
+    header = np.ndarray((HEADER_SLOTS,), dtype=np.int64, buffer=buf, offset=0)
+    times = np.ndarray((capacity,), dtype=np.float64, buffer=buf, offset=HEADER_SLOTS * 8)
+    data = np.ndarray((capacity, n_channels), dtype=np.float32, buffer=buf,
+                      offset=HEADER_SLOTS * 8 + capacity * 8)
+    return SPSCRingBuffer(n_channels, capacity, header=header, data=data, times=times)
+
+
+def create_shared_ring(n_channels, capacity):
+    """Buat shared memory baru, return (shm, ring)"""
+    shm = shared_memory.SharedMemory(create=True, size=_ring_nbytes(n_channels, capacity))
+    ring = _ring_views(shm.buf, n_channels, capacity)
+    ring.header[:] = 0
+    return shm, ring
+
+
+def attach_shared_ring(name, n_channels, capacity):
+    """Petakan shared memory yang sudah ada, return (shm, ring)"""
+    # Proses anak spawn memakai resource tracker yang sama dengan supervisor, jadi
+    # attach di sini tidak membuat segmen di-unlink saat anak keluar
+    shm = shared_memory.SharedMemory(name=name)
+    return shm, _ring_views(shm.buf, n_channels, capacity)
+
+
+# --- Loop reader (dipakai oleh thread maupun proses) ---
+def read_monitor_stream(ser, ring, running=lambda: True, latency=None, on_data=None):
+    """Baca stream monitor 16-field (teks atau frame biner) dan tulis ke ring sampai `running()` False.
+
+    `latency` (LatencyTracker, opsional) mencatat tahap 'parse' tiap batch.
+    `on_data` (opsional) dipanggil dari thread reader setiap ada baris baru di ring.
+    """
+    parser = MonitorStreamParser()
+    while running():
+        # Ambil semua byte yang sudah masuk sekaligus
+        chunk = ser.read(max(1, ser.in_waiting))
+        t_read = time.time()
+        rows = parser.feed(chunk)
+        if latency is not None and len(rows):
+            latency.record('parse', t_read)
+        ring.write(rows, t_read)
+        if on_data is not None and len(rows):
+            on_data()
+
+
+def _acquisition_main(shm_name, n_channels, capacity, port, baud):
+    """Entry point proses anak"""
+    shm, ring = attach_shared_ring(shm_name, n_channels, capacity)
+    try:
+        # serial_for_url menerima path device maupun URL (loop://, socket://, ...)
+        with serial.serial_for_url(port, baud, timeout=1) as ser:
+            read_monitor_stream(ser, ring)
+    except serial.SerialException as e:
+        print(f"Akuisisi: gagal membaca port {port}: {e}")
+    finally:
+        # Jangan unlink: shared memory milik supervisor
+        del ring
+        try:
+            shm.close()
+        except BufferError:
+            pass
+
+
+# --- Supervisor ---
+class AcquisitionSupervisor:
+    """Jalankan proses akuisisi dan restart dengan backoff kalau mati"""
+
+    def __init__(self, port, baud, n_channels, capacity, restart_delay=1.0, max_restart_delay=10.0):
+        self.port = port
+        self.baud = baud
+        self.n_channels = n_channels
+        self.capacity = capacity
+        self.restart_delay = restart_delay
+        self.max_restart_delay = max_restart_delay
+        self.shm, self.ring = create_shared_ring(n_channels, capacity)
+        # spawn: aman dipakai dari aplikasi Qt yang sudah punya thread
+        self._ctx = mp.get_context('spawn')
+        self.process = None
+        self.restarts = 0
+        self._delay = restart_delay
+        self._next_start = 0.0
+
+    def start(self):
+        self.process = self._ctx.Process(
+            target=_acquisition_main,
+            args=(self.shm.name, self.n_channels, self.capacity, self.port, self.baud),
+            daemon=True,
+        )
+        self.process.start()
+        self._started_at = time.monotonic()
+
+    def poll(self):
+        """Dipanggil berkala dari GUI; restart proses anak yang mati"""
+        if self.process is None or self.process.is_alive():
+            # Proses yang sudah stabil beberapa saat mereset backoff
+            if self.process is not None and time.monotonic() - self._started_at > self.max_restart_delay:
+                self._delay = self.restart_delay
+            return
+        now = time.monotonic()
+        if self._next_start == 0.0:
+            self._next_start = now + self._delay
+            print(f"Akuisisi berhenti (exit {self.process.exitcode}), restart dalam {self._delay:.1f} s")
+            return
+        if now >= self._next_start:
+            self.process.join(timeout=0)
+            self.restarts += 1
+            self._next_start = 0.0
+            self._delay = min(self._delay * 2, self.max_restart_delay)
+            self.start()
+
+    def stop(self):
+        if self.process is not None and self.process.is_alive():
+            self.process.terminate()
+            self.process.join(timeout=2)
+        self.process = None
+        # Lepas view numpy sebelum menutup shared memory. Kalau GUI masih memegang
+        # view ring, close ditunda sampai proses selesai; unlink tetap dilakukan.
+        self.ring = None
+        try:
+            self.shm.close()
+        except BufferError:
+            pass
+        self.shm.unlink()
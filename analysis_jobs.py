@@ -0,0 +1,167 @@
+"""Analisis NIBP di luar thread GUI: baca CSV + analyze_bp sebagai job QThreadPool.
+
+AnalysisRunner.submit() membatalkan job yang masih berjalan lalu memulai job baru
+(tanpa signal `cancelled`, yang hanya untuk pembatalan lewat cancel()); progress
+dan hasil kembali lewat signal (queued ke thread GUI). Job hanya bisa
+berhenti di antara langkah: CSV dibaca per potongan (progress dan pembatalan dicek
+tiap potongan), sedangkan analyze_bp tidak bisa diinterupsi sehingga hasilnya
+dibuang kalau job sudah dibatalkan. Signal dari job lama tidak pernah diteruskan.
+"""
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+from nibp_io import pressure_column
+
+# Baris per potongan pd.read_csv; tiap potongan = satu titik progress/pembatalan
+READ_CHUNK_ROWS = 20000
+# Porsi progress bar (persen) untuk membaca file; sisanya untuk analisis
+READ_PROGRESS = 80
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class AnalysisResult:
+    """Hasil satu job: `result` = tuple analyze_bp, `path` None untuk data pengukuran live"""
+
+    def __init__(self, title, path, samples, result):
+        self.title = title
+        self.path = path
+        self.samples = samples
+        self.result = result
+
+
+class _JobSignals(QObject):
+    progress = pyqtSignal(int, int, str)  # job_id, persen, tahap
+    finished = pyqtSignal(int, object)    # job_id, AnalysisResult
+    failed = pyqtSignal(int, str)         # job_id, pesan
+
+
+class AnalysisJob(QRunnable):
+    """Baca `path` (atau pakai `pressure` langsung) lalu analyzer.analyze_bp"""
+
+    def __init__(self, job_id, analyzer, title, path=None, pressure=None):
+        super().__init__()
+        self.job_id = job_id
+        self.analyzer = analyzer
+        self.title = title
+        self.path = path
+        self.pressure = pressure
+        self.signals = _JobSignals()
+        self._cancel = threading.Event()
+
+    def cancel(self):
+        self._cancel.set()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def _check(self):
+        if self._cancel.is_set():
+            raise JobCancelled()
+
+    def _progress(self, percent, stage):
+        self.signals.progress.emit(self.job_id, int(percent), stage)
+
+    def read_pressure(self):
+        """Kolom tekanan per potongan; progress dari posisi baca file"""
+        size = max(os.path.getsize(self.path), 1)
+        with open(self.path, 'rb') as f:
+            column = pressure_column(pd.read_csv(f, nrows=0).columns)
+            f.seek(0)
+            chunks = []
+            for chunk in pd.read_csv(f, usecols=[column], chunksize=READ_CHUNK_ROWS):
+                self._check()
+                chunks.append(chunk[column].to_numpy(dtype=np.float64))
+                self._progress(READ_PROGRESS * min(f.tell() / size, 1.0), "membaca")
+        return np.concatenate(chunks) if chunks else np.empty(0)
+
+    def run(self):
+        try:
+            if self.path is not None:
+                self._progress(0, "membaca")
+                pressure = self.read_pressure()
+            else:
+                pressure = self.pressure
+            self._check()
+            self._progress(READ_PROGRESS, "analisis")
+            result = self.analyzer.analyze_bp(pressure)
+            self._check()
+            self._progress(100, "selesai")
+            self.signals.finished.emit(self.job_id, AnalysisResult(self.title, self.path, len(pressure), result))
+        except JobCancelled:
+            pass
+        except Exception as e:
+            if not self.cancelled:
+                self.signals.failed.emit(self.job_id, str(e))
+
+
+class AnalysisRunner(QObject):
+    """Satu job aktif; job baru membatalkan yang lama. Signal hanya untuk job aktif"""
+
+    progress = pyqtSignal(int, str)   # persen, tahap
+    finished = pyqtSignal(object)     # AnalysisResult
+    failed = pyqtSignal(str)
+    cancelled = pyqtSignal()
+
+    def __init__(self, parent=None, max_threads=2):
+        super().__init__(parent)
+        # Job lama yang masih di analyze_bp tidak menahan job baru
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_threads)
+        self.job = None
+        self.job_id = 0
+
+    @property
+    def busy(self):
+        return self.job is not None
+
+    def submit(self, analyzer, title, path=None, pressure=None):
+        """Batalkan job aktif dan jalankan job baru; return job_id"""
+        self._drop()
+        self.job_id += 1
+        job = AnalysisJob(self.job_id, analyzer, title, path, pressure)
+        job.signals.progress.connect(self._on_progress)
+        job.signals.finished.connect(self._on_finished)
+        job.signals.failed.connect(self._on_failed)
+        self.job = job
+        self.pool.start(job)
+        return self.job_id
+
+    def cancel(self):
+        """Pembatalan oleh pengguna: hentikan job aktif dan emit `cancelled`"""
+        if self._drop():
+            self.cancelled.emit()
+
+    def _drop(self):
+        if self.job is None:
+            return False
+        self.job.cancel()
+        self.job = None
+        return True
+
+    def wait(self, msecs=-1):
+        return self.pool.waitForDone(msecs)
+
+    def _active(self, job_id):
+        return self.job is not None and job_id == self.job_id
+
+    def _on_progress(self, job_id, percent, stage):
+        if self._active(job_id):
+            self.progress.emit(percent, stage)
+
+    def _on_finished(self, job_id, result):
+        if self._active(job_id):
+            self.job = None
+            self.finished.emit(result)
+
+    def _on_failed(self, job_id, message):
+        if self._active(job_id):
+            self.job = None
+            self.failed.emit(message)
@@ -0,0 +1,82 @@
+"""Benchmark throughput decode: frame biner vs format teks 16 field (per baris dan chunk).
+
+Jalankan dari root repo:
+    python benchmarks/bench_frame_protocol.py [--frames 100000]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from frame_protocol import FrameDecoder, encode_frames  # noqa: E402
+from firmware_emulator import format_monitor_line  # noqa: E402
+from line_parser import ChunkParser, MONITOR_16  # noqa: E402
+from synthetic import monitor_rows  # noqa: E402
+
+
+def decode_text_legacy(payload):
+    """Jalur lama read_serial: per baris decode/strip/split/float"""
+    count = 0
+    for raw in payload.splitlines():
+        line = raw.decode(errors="ignore").strip()
+        parts = line.split(',')
+        if len(parts) == 16:
+            nibp_parts = parts[15].split('\\')
+            if len(nibp_parts) == 2:
+                [float(p) for p in parts[:15]]
+                int(nibp_parts[0]), int(nibp_parts[1])
+                count += 1
+    return count
+
+
+def decode_text_chunked(payload, chunk_size):
+    parser = ChunkParser(MONITOR_16)
+    count = 0
+    for i in range(0, len(payload), chunk_size):
+        count += len(parser.feed(payload[i:i + chunk_size]).values)
+    return count
+
+
+def decode_binary(payload, chunk_size):
+    decoder = FrameDecoder()
+    count = 0
+    for i in range(0, len(payload), chunk_size):
+        count += len(decoder.feed(payload[i:i + chunk_size]))
+    return count
+
+
+def timed(fn, *args):
+    t0 = time.perf_counter()
+    n = fn(*args)
+    return n, time.perf_counter() - t0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--frames', type=int, default=100000)
+    args = parser.parse_args()
+
+    # Payload sama dengan bagian parsing run_benchmarks.py
+    rows = monitor_rows(args.frames, noise=0.3, rng=np.random.default_rng(0))
+    text = ("\r\n".join(format_monitor_line(r) for r in rows) + "\r\n").encode()
+    binary = encode_frames(rows)
+
+    print(f"{args.frames} sampel | teks {len(text) / args.frames:.1f} B/sampel | "
+          f"biner {len(binary) / args.frames:.1f} B/sampel")
+
+    n, dt = timed(decode_text_legacy, text)
+    print(f"{'teks (per baris)':<28} {n / dt:>12,.0f} frame/s")
+    # 64 B ~ satu read kecil di 115200 baud, 4096 B ~ read USB-CDC penuh
+    for chunk in (64, 512, 4096, len(text)):
+        n, dt = timed(decode_text_chunked, text, chunk)
+        print(f"{'teks chunk ' + str(chunk) + ' B':<28} {n / dt:>12,.0f} frame/s")
+    for chunk in (64, 512, 4096, len(binary)):
+        n, dt = timed(decode_binary, binary, chunk)
+        print(f"{'biner chunk ' + str(chunk) + ' B':<28} {n / dt:>12,.0f} frame/s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,679 @@
+"""Harness benchmark: parsing, analisis NIBP dan rendering GUI, hasil disimpan sebagai JSON.
+
+Tanpa hardware (data dari synthetic.py) dan tanpa display (QT_QPA_PLATFORM=offscreen),
+jadi bisa dijalankan di CI. Setiap run menulis satu file JSON berisi sha git supaya
+regresi antar commit terlihat dengan --compare.
+
+    python benchmarks/run_benchmarks.py                     # semua, simpan ke benchmarks/results/
+    python benchmarks/run_benchmarks.py --quick --only parsing analyze
+    python benchmarks/run_benchmarks.py --compare benchmarks/results/lama.json
+
+Bagian:
+    parsing      throughput ChunkParser / FrameDecoder untuk semua format baris repo
+    analyze      latensi BPAnalyzer.analyze_bp vs panjang rekaman, dan biaya StreamingBPAnalyzer per batch
+    bandpass     analyze_bp cara lama vs detrend + band-pass SOS pada rekaman panjang, biaya desain filter (cache),
+                 biaya per frame StreamingBPAnalyzer (feed + estimates) dan selisihnya dari analisis offline
+    algorithms   akurasi (MAE vs nilai sintetis, dua model envelope synthetic.ENVELOPES) dan waktu tiap
+                 algoritma bp_analyzer.ALGORITHMS; model 'ratio' menguntungkan envelope_fit, lihat ALGORITHMS_NOTE
+    decimation   throughput min/max dan LTTB (decimation.py)
+    waveform     waktu frame PatientMonitor.update_waveform_display + paint (5/11/20 kanal, beberapa buffer_size)
+    idle         CPU% PatientMonitor saat data mengalir vs idle (tanpa data), dan latensi bangun dari idle
+    render_backend  frame PatientMonitor 1820x960: raster vs OpenGL (kalau tersedia, mis. Mesa llvmpipe)
+    multilead    frame 9 lead EKG: 9 PlotWidget + SweepTrace vs satu LeadGridItem (lead_grid.py)
+    central      waktu frame central station (4/8/16 bed sintetis), tanpa vs dengan anggaran render
+    nibp_redraw  biaya NIBPGUI.update_data + satu frame plot live vs panjang riwayat, per backend
+"""
+import argparse
+import csv
+import io
+import json
+import os
+import platform
+import subprocess
+import time
+from datetime import datetime
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+import numpy as np  # noqa: E402
+
+from script_loader import REPO_ROOT, load_script  # noqa: E402
+from frame_protocol import FrameDecoder, encode_frames  # noqa: E402
+from firmware_emulator import format_monitor_line  # noqa: E402
+from line_parser import (ChunkParser, ECG_SPO2_RESP, MONITOR_16, PRESSURE_SMOOTHED,  # noqa: E402
+                         TEKANAN)
+from synthetic import monitor_rows, nibp_session  # noqa: E402
+
+SECTIONS = ('parsing', 'analyze', 'bandpass', 'algorithms', 'decimation', 'waveform', 'idle', 'render_backend', 'multilead', 'central', 'nibp_redraw')
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+
+_app = None
+
+
+def qt_app():
+    global _app
+    if _app is None:
+        from PyQt5.QtWidgets import QApplication
+        _app = QApplication.instance() or QApplication([])
+    return _app
+
+
+def stats_ms(durations):
+    d = np.asarray(durations) * 1000.0
+    return {'p50_ms': round(float(np.percentile(d, 50)), 4),
+            'p99_ms': round(float(np.percentile(d, 99)), 4),
+            'mean_ms': round(float(d.mean()), 4)}
+
+
+def best_of(fn, repeat):
+    """Waktu terbaik dari beberapa pengulangan (detik) dan hasil terakhir"""
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+# --- Parsing ---
+def parsing_payloads(n, seed=0):
+    """Payload serial sintetis per format dan LineFormat-nya (tanpa entri = frame biner)"""
+    rng = np.random.default_rng(seed)
+    rows = monitor_rows(n, noise=0.3, rng=rng)
+    _, deflate = nibp_session(n_deflate=n, rng=rng)
+    wave = np.round(rng.normal(0.5, 0.2, (n, 3)), 2)
+
+    def text(lines):
+        return ("\r\n".join(lines) + "\r\n").encode()
+
+    payloads = {
+        'monitor_16': text([format_monitor_line(r) for r in rows]),
+        'ecg_spo2_resp': text([f"ECG:{e:.2f},SpO2:{s:.2f},RESP:{r:.2f}" for e, s, r in wave]),
+        'tekanan': text([f"Tekanan: {p:.2f} mmHg" for p in deflate]),
+        'pressure_smoothed': text([f"Pressure (mmHg): {p:.2f} | Smoothed: {p:.2f}" for p in deflate]),
+        'binary_frame': encode_frames(rows),
+    }
+    formats = {'monitor_16': MONITOR_16, 'ecg_spo2_resp': ECG_SPO2_RESP, 'tekanan': TEKANAN,
+               'pressure_smoothed': PRESSURE_SMOOTHED}
+    return payloads, formats
+
+
+def _decode(payload, fmt, chunk):
+    parser = FrameDecoder() if fmt is None else ChunkParser(fmt)
+    count = 0
+    for i in range(0, len(payload), chunk):
+        out = parser.feed(payload[i:i + chunk])
+        count += len(out if fmt is None else out.values)
+    return count
+
+
+def bench_parsing(n_lines, repeat, chunk=4096):
+    payloads, formats = parsing_payloads(n_lines)
+    results = {}
+    for name, payload in payloads.items():
+        fmt = formats.get(name)
+        dt, count = best_of(lambda: _decode(payload, fmt, chunk), repeat)
+        results[name] = {'samples': count, 'bytes': len(payload), 'chunk_bytes': chunk,
+                         'samples_per_s': round(count / dt), 'mb_per_s': round(len(payload) / dt / 1e6, 2)}
+        print(f"  {name:<20} {count / dt:>12,.0f} sampel/s")
+    return results
+
+
+# --- Analisis NIBP ---
+def bench_analyze(lengths, repeat, batch=4):
+    from bp_analyzer import BPAnalyzer, StreamingBPAnalyzer
+
+    analyzer = BPAnalyzer()
+    results = []
+    for n in lengths:
+        # Durasi deflasi tetap 40 s, panjang rekaman = laju sampling yang berbeda
+        inflate, deflate = nibp_session(n_deflate=n, deflate_dt=40.0 / n, rng=np.random.default_rng(0))
+        pressure = np.concatenate((inflate, deflate))
+        dt, out = best_of(lambda: analyzer.analyze_bp(pressure), repeat)
+
+        # Streaming: batch sebesar SerialReader, lalu hasil akhir setelah sampel terakhir
+        stream = StreamingBPAnalyzer()
+        feeds = []
+        for i in range(0, len(pressure), batch):
+            t0 = time.perf_counter()
+            stream.feed(pressure[i:i + batch])
+            feeds.append(time.perf_counter() - t0)
+        dt_result, final = best_of(stream.result, repeat)
+        match = all(np.array_equal(a, b) for a, b in zip(out, final) if a is not None) and \
+            (out[0] is None) == (final[0] is None)
+        results.append({'samples': len(pressure), 'ms': round(dt * 1000.0, 4), 'valid': out[0] is not None,
+                        'stream_feed': stats_ms(feeds), 'stream_result_ms': round(dt_result * 1000.0, 4),
+                        'stream_match': match})
+        print(f"  {len(pressure):>7} sampel  batch {dt * 1000.0:>9.3f} ms | streaming feed p99 "
+              f"{results[-1]['stream_feed']['p99_ms']:.3f} ms, hasil {dt_result * 1000.0:.3f} ms, sama={match}")
+    return results
+
+
+def bench_bandpass(lengths, repeat, batch=4, duration=40.0):
+    from bp_analyzer import BPAnalyzer, StreamingBPAnalyzer, bandpass_sos
+
+    legacy = BPAnalyzer()
+    fs0 = lengths[0] / duration
+    dt_design, _ = best_of(lambda: bandpass_sos.__wrapped__(fs0), repeat)
+    bandpass_sos(fs0)
+    dt_cached, _ = best_of(lambda: bandpass_sos(fs0), repeat)
+    results = {'design_ms': round(dt_design * 1000.0, 4), 'design_cached_us': round(dt_cached * 1e6, 3),
+               'lengths': []}
+    print(f"  desain SOS {dt_design * 1000.0:.3f} ms, dari cache {dt_cached * 1e6:.2f} us")
+    for n in lengths:
+        # Durasi deflasi tetap, laju sampling berbeda; filter dirancang untuk fs tersebut
+        fs = n / duration
+        inflate, deflate = nibp_session(n_deflate=n, deflate_dt=1.0 / fs, rng=np.random.default_rng(0))
+        pressure = np.concatenate((inflate, deflate))
+        analyzer = BPAnalyzer(fs=fs)
+        dt_legacy, _ = best_of(lambda: legacy.analyze_bp(pressure), repeat)
+        dt_bandpass, out = best_of(lambda: analyzer.analyze_bp(pressure), repeat)
+
+        # Satu frame live = feed satu batch + estimates(); biayanya tidak boleh tumbuh dengan panjang rekaman
+        stream = StreamingBPAnalyzer(fs=fs)
+        feeds, frames = [], []
+        for i in range(0, len(pressure), batch):
+            t0 = time.perf_counter()
+            stream.feed(pressure[i:i + batch])
+            t1 = time.perf_counter()
+            stream.estimates()
+            feeds.append(t1 - t0)
+            frames.append(time.perf_counter() - t0)
+        dt_estimates, _ = best_of(stream.estimates, repeat)
+        # Filter kausal vs zero-phase: selisih terbesar MAP/sistolik/diastolik (mmHg)
+        final = stream.result()
+        delta = None
+        if out[2] is not None and final[2] is not None:
+            delta = round(float(np.max(np.abs(np.subtract(out[2:5], final[2:5])))), 2)
+        results['lengths'].append({'samples': len(pressure), 'fs': fs, 'legacy_ms': round(dt_legacy * 1000.0, 4),
+                                   'bandpass_ms': round(dt_bandpass * 1000.0, 4), 'valid': out[0] is not None,
+                                   'stream_feed': stats_ms(feeds), 'stream_frame': stats_ms(frames),
+                                   'stream_estimates_ms': round(dt_estimates * 1000.0, 4),
+                                   'stream_delta_mmhg': delta})
+        print(f"  {len(pressure):>7} sampel ({fs:g} Hz)  lama {dt_legacy * 1000.0:>8.3f} ms | band-pass "
+              f"{dt_bandpass * 1000.0:>8.3f} ms | streaming frame p99 "
+              f"{results['lengths'][-1]['stream_frame']['p99_ms']:.3f} ms, estimasi akhir "
+              f"{dt_estimates * 1000.0:.3f} ms, selisih vs offline {delta} mmHg")
+    return results
+
+
+# Batas hasil 'algorithms': dicetak dan ikut disimpan di JSON di samping angka MAE
+ALGORITHMS_NOTE = ("Sesi sintetis, bukan rekaman dengan pembacaan referensi. Model 'ratio' adalah envelope "
+                   "yang di-fit envelope_fit (rasio 0.55/0.85 firmware_ratio), jadi MAE rendah di sana dijamin "
+                   "konstruksinya; 'compliance' tidak diasumsikan algoritma mana pun. Akurasi klinis: "
+                   "nibp_batch --reference pada rekaman nyata.")
+
+
+def bench_algorithms(n_sessions, repeat, fs=12.5):
+    from bp_analyzer import ALGORITHMS, BPAnalyzer
+    from synthetic import ENVELOPES
+
+    results = {'note': ALGORITHMS_NOTE}
+    for envelope in ENVELOPES:
+        # Sesi deflasi firmware (12.5 Hz) dengan sistolik/diastolik/denyut acak yang diketahui;
+        # kurva compliance juga diacak per sesi supaya rasio sistolik/diastolik tidak tetap
+        sessions = []
+        for seed in range(n_sessions):
+            rng = np.random.default_rng(seed)
+            systolic, diastolic, hr = rng.uniform(100, 160), rng.uniform(55, 95), rng.uniform(55, 100)
+            compliance = rng.uniform(7, 13), rng.uniform(10, 20)
+            inflate, deflate = nibp_session(systolic, diastolic, hr=hr, rng=rng, envelope=envelope,
+                                            compliance=compliance)
+            sessions.append((np.concatenate((inflate, deflate)), systolic, diastolic))
+
+        print(f"  envelope {envelope}:")
+        results[envelope] = {}
+        for name in ALGORITHMS:
+            analyzer = BPAnalyzer(fs=fs, algorithm=name)
+            errors, times, failed = [], [], 0
+            for pressure, systolic, diastolic in sessions:
+                dt, out = best_of(lambda: analyzer.analyze_bp(pressure), repeat)
+                times.append(dt)
+                if out[0] is None:
+                    failed += 1
+                else:
+                    errors.append((out[3] - systolic, out[4] - diastolic))
+            errors = np.abs(np.asarray(errors)) if errors else np.full((1, 2), np.nan)
+            row = {'sessions': n_sessions, 'failed': failed,
+                   'mae_systolic': round(float(errors[:, 0].mean()), 2),
+                   'mae_diastolic': round(float(errors[:, 1].mean()), 2),
+                   'ms': round(float(np.mean(times)) * 1000.0, 4)}
+            results[envelope][name] = row
+            print(f"    {name:<15} gagal {failed:>3}/{n_sessions}  MAE sistolik {row['mae_systolic']:>6.2f} "
+                  f"diastolik {row['mae_diastolic']:>6.2f} mmHg  {row['ms']:.3f} ms")
+    print(f"  Catatan: {ALGORITHMS_NOTE}")
+    return results
+
+
+# --- Dekimasi ---
+def bench_decimation(n, repeat, pixels=1000):
+    from decimation import DECIMATION_MODES, decimate
+    from synthetic import ecg_wave
+    x = np.arange(n) / 1000.0
+    y = ecg_wave((x * 1.2) % 1.0)
+    results = {}
+    for mode in DECIMATION_MODES:
+        dt, (_, yd) = best_of(lambda: decimate(x, y, n // pixels, mode), repeat)
+        results[mode] = {'samples': n, 'points': len(yd), 'ms': round(dt * 1000.0, 3),
+                         'peak_kept': bool(np.isclose(np.nanmax(yd), y.max()))}
+        print(f"  {mode:<7} {n} -> {len(yd)} titik  {dt * 1000.0:>8.3f} ms")
+    return results
+
+
+# --- Rendering monitor ---
+def bench_waveform(channel_counts, buffer_sizes, frames):
+    app = qt_app()
+    ui = load_script('Update UI PM')
+    ui.LATENCY_JSON = None
+
+    class Monitor(ui.PatientMonitor):
+        def start_serial_thread(self):
+            pass  # data diisi langsung ke ring oleh benchmark
+
+    results = []
+    feed = monitor_rows(frames, noise=0.3, rng=np.random.default_rng(0)).astype(np.float32)
+    for buffer_size in buffer_sizes:
+        for n_channels in channel_counts:
+            w = Monitor(buffer_size=buffer_size)
+            w.scheduler.stop()
+            # PatientMonitor menggambar 5 kurva; kanal tambahan dibuat dengan create_plot yang sama
+            extra = []
+            for i in range(max(0, n_channels - 5)):
+                lead = w.ecg_leads[i % len(w.ecg_leads)]
+                container, trace, _ = w.create_plot(lead, "lime", w.signal_data[lead], (-1.5, 1.5))
+                w.layout().addWidget(container)
+                extra.append(trace)
+            app.processEvents()
+
+            durations = []
+            for k in range(frames):
+                # Satu sampel per tick 10 ms seperti stream 100 Hz
+                w.ring.write(feed[k:k + 1], time.time())
+                t0 = time.perf_counter()
+                w.update_waveform_display()
+                for trace in extra:
+                    trace.advance(w.index, 1)
+                    trace.render()
+                # Paint lewat event loop seperti timer GUI sungguhan (hanya area yang di-update)
+                app.processEvents()
+                durations.append(time.perf_counter() - t0)
+            entry = {'channels': n_channels, 'buffer_size': buffer_size,
+                     'window': [w.width(), w.height()], **stats_ms(durations)}
+            results.append(entry)
+            print(f"  {n_channels:>2} kanal, buffer {buffer_size:>5}: p50 {entry['p50_ms']:.2f} ms, "
+                  f"p99 {entry['p99_ms']:.2f} ms")
+            w.close()
+            w.deleteLater()
+            app.processEvents()
+    return results
+
+
+def _run_event_loop(app, seconds):
+    from PyQt5.QtCore import QEventLoop, QTimer
+    loop = QEventLoop()
+    QTimer.singleShot(int(seconds * 1000), loop.quit)
+    loop.exec_()
+
+
+def bench_idle(seconds, wake_repeats):
+    import threading
+
+    app = qt_app()
+    ui = load_script('Update UI PM')
+    ui.LATENCY_JSON = None
+
+    class Monitor(ui.PatientMonitor):
+        def start_serial_thread(self):
+            pass
+
+    w = Monitor()
+    feed = monitor_rows(100 * 60, noise=0.3, rng=np.random.default_rng(0)).astype(np.float32)
+    running = threading.Event()
+
+    def feeder():
+        # Stream 100 Hz dalam blok 20 ms, seperti thread reader serial (termasuk notify_data)
+        k = 0
+        while running.is_set():
+            w.ring.write(feed[k:k + 2], time.time())
+            w.notify_data()
+            k = (k + 2) % (len(feed) - 2)
+            time.sleep(0.02)
+
+    def measure(state):
+        frames0, cpu0, t0 = w.scheduler.frames, time.process_time(), time.perf_counter()
+        _run_event_loop(app, seconds)
+        wall = time.perf_counter() - t0
+        entry = {'backend': state, 'cpu_pct': round((time.process_time() - cpu0) / wall * 100.0, 2),
+                 'fps': round((w.scheduler.frames - frames0) / wall, 1)}
+        print(f"  {state:<6}: CPU {entry['cpu_pct']:.1f}%, {entry['fps']:.1f} frame/s")
+        return entry
+
+    results = []
+    running.set()
+    thread = threading.Thread(target=feeder, daemon=True)
+    thread.start()
+    _run_event_loop(app, 0.5)
+    results.append(measure('active'))
+    running.clear()
+    thread.join()
+    # Tunggu sampai monitor masuk idle (sinyal hilang > 1 s)
+    _run_event_loop(app, 1.5)
+    results.append(measure('idle'))
+
+    # Latensi bangun: data pertama setelah idle sampai kursor gelombang maju
+    wakes = []
+    for _ in range(wake_repeats):
+        _run_event_loop(app, 1.5)
+        index = w.index
+        t0 = time.perf_counter()
+        threading.Thread(target=lambda: (w.ring.write(feed[:2], time.time()), w.notify_data())).start()
+        while w.index == index and time.perf_counter() - t0 < 2.0:
+            app.processEvents()
+        wakes.append(time.perf_counter() - t0)
+    results.append({'backend': 'wake', **stats_ms(wakes)})
+    print(f"  bangun dari idle: p50 {results[-1]['p50_ms']:.2f} ms")
+    w.close()
+    w.deleteLater()
+    app.processEvents()
+    return results
+
+
+def bench_render_backend(buffer_sizes, frames, size=(1820, 960)):
+    from render_backend import RENDER_BACKENDS, opengl_status
+
+    app = qt_app()
+    ui = load_script('Update UI PM')
+    ui.LATENCY_JSON = None
+
+    class Monitor(ui.PatientMonitor):
+        def start_serial_thread(self):
+            pass
+
+    results = []
+    feed = monitor_rows(frames, noise=0.3, rng=np.random.default_rng(0)).astype(np.float32)
+    for backend in RENDER_BACKENDS:
+        if backend == 'opengl':
+            available, info = opengl_status()
+            print(f"  opengl: {info}")
+            if not available:
+                results.append({'backend': backend, 'available': False, 'info': info})
+                continue
+        ui.RENDER_BACKEND = backend
+        for buffer_size in buffer_sizes:
+            w = Monitor(buffer_size=buffer_size)
+            w.scheduler.stop()
+            # Ukuran layar PC bedside, bukan ukuran layar virtual offscreen
+            w.showNormal()
+            w.resize(*size)
+            app.processEvents()
+
+            durations = []
+            for k in range(frames):
+                # Satu frame 60 fps pada stream 100 Hz: ~2 sampel
+                w.ring.write(feed[2 * k % frames:2 * k % frames + 2], time.time())
+                t0 = time.perf_counter()
+                w.update_waveform_display()
+                app.processEvents()
+                durations.append(time.perf_counter() - t0)
+            entry = {'backend': backend, 'buffer_size': buffer_size, 'window': [w.width(), w.height()],
+                     **stats_ms(durations)}
+            results.append(entry)
+            print(f"  {backend:<6} buffer {buffer_size:>5}: p50 {entry['p50_ms']:.2f} ms, p99 {entry['p99_ms']:.2f} ms")
+            w.close()
+            w.deleteLater()
+            app.processEvents()
+    ui.RENDER_BACKEND = 'raster'
+    return results
+
+
+def bench_multilead(buffer_sizes, frames, n_leads=9):
+    import pyqtgraph as pg
+    from PyQt5.QtWidgets import QGridLayout, QWidget
+    from lead_grid import create_lead_grid_widget
+    from sweep_renderer import SweepTrace
+
+    app = qt_app()
+    feed = monitor_rows(frames, noise=0.3, rng=np.random.default_rng(0)).astype(np.float32)[:, :n_leads]
+    labels = [f"L{i + 1}" for i in range(n_leads)]
+    results = []
+    for buffer_size in buffer_sizes:
+        x = np.linspace(0, buffer_size / 100.0, buffer_size)
+        for layout in ('plots', 'grid'):
+            buffer = np.zeros((n_leads, buffer_size), dtype=np.float32)
+            w = QWidget()
+            w.resize(1280, 800)
+            grid_layout = QGridLayout(w)
+            if layout == 'plots':
+                traces = []
+                for i in range(n_leads):
+                    plot = pg.PlotWidget()
+                    plot.setYRange(-1.5, 1.5)
+                    traces.append(SweepTrace(plot, x, buffer[i], pg.mkPen('lime', width=2)))
+                    grid_layout.addWidget(plot, i // 3, i % 3)
+            else:
+                plot, grid = create_lead_grid_widget(buffer, range(n_leads), labels, x)
+                traces = [grid]
+                grid_layout.addWidget(plot)
+            w.show()
+            app.processEvents()
+
+            durations = []
+            cursor = 0
+            for k in range(frames):
+                t0 = time.perf_counter()
+                buffer[:, cursor] = feed[k]
+                cursor = (cursor + 1) % buffer_size
+                for trace in traces:
+                    trace.advance(cursor, 1)
+                    trace.render()
+                app.processEvents()
+                durations.append(time.perf_counter() - t0)
+            entry = {'backend': layout, 'channels': n_leads, 'buffer_size': buffer_size, **stats_ms(durations)}
+            results.append(entry)
+            print(f"  {layout:<6} {n_leads} lead, buffer {buffer_size:>5}: p50 {entry['p50_ms']:.2f} ms, "
+                  f"p99 {entry['p99_ms']:.2f} ms")
+            w.close()
+            w.deleteLater()
+            app.processEvents()
+    return results
+
+
+def bench_central(bed_counts, frames, budgets=(None, 8.0), fps=30):
+    from central_station import CentralStation, synthetic_sources
+
+    app = qt_app()
+    samples_per_frame = max(1, round(100 / fps))
+    results = []
+    for beds in bed_counts:
+        for budget in budgets:
+            sources = synthetic_sources(beds)
+            station = CentralStation(sources, fps=fps, render_budget_ms=budget)
+            station.resize(1600, 900)
+            station.show()
+            app.processEvents()
+
+            durations, rendered = [], []
+            for _ in range(frames):
+                # Sumber sintetis diisi sinkron (tanpa thread) supaya run bisa diulang
+                for source in sources:
+                    source.feed(samples_per_frame)
+                t0 = time.perf_counter()
+                station.update_waveforms()
+                app.processEvents()
+                durations.append(time.perf_counter() - t0)
+                rendered.append(station.rendered_tiles)
+            entry = {'backend': 'budget' if budget else 'all', 'beds': beds,
+                     'tiles_per_frame': round(float(np.mean(rendered)), 2), **stats_ms(durations)}
+            results.append(entry)
+            print(f"  {beds:>2} bed, {entry['backend']:<6}: p50 {entry['p50_ms']:.2f} ms, "
+                  f"p99 {entry['p99_ms']:.2f} ms, {entry['tiles_per_frame']:.1f} tile/frame")
+            station.close()
+            station.deleteLater()
+            app.processEvents()
+    return results
+
+
+# --- Redraw NIBP ---
+def bench_nibp_redraw(history_lengths, calls, batch=4, backends=('matplotlib', 'pyqtgraph')):
+    """update_data (tambah batch) dan satu frame refresh_live_plot per batch, per backend plot"""
+    app = qt_app()
+    nibp = load_script('NIBP System.py')
+    nibp.LATENCY_JSON = None
+    _, deflate = nibp_session(n_deflate=max(history_lengths) + calls * batch, rng=np.random.default_rng(0))
+    results = []
+    for backend in backends:
+        nibp.LIVE_PLOT_BACKEND = backend
+        g = nibp.NIBPGUI()
+        g.plot_timer.stop()
+        g.resize(1200, 800)
+        g.show()
+        app.processEvents()
+        g.log_file = io.StringIO()
+        g.csv_writer = csv.writer(io.StringIO())
+
+        for n in history_lengths:
+            g.times, g.raws, g.mmhgs = ['00:00:00'] * n, [0] * n, deflate[:n].tolist()
+            g.reset_plot()
+            g.live_plot.append(deflate[:n])
+            g.refresh_live_plot()
+            full_draws = g.live_plot.full_draws
+            update, frame = [], []
+            for k in range(calls):
+                mmhg = deflate[n + k * batch:n + (k + 1) * batch]
+                block = np.column_stack((np.floor(mmhg / 0.05825 + 1648), mmhg))
+                t0 = time.perf_counter()
+                g.update_data(np.full(len(block), time.time()), block)
+                t1 = time.perf_counter()
+                g.refresh_live_plot()
+                app.processEvents()
+                update.append(t1 - t0)
+                frame.append(time.perf_counter() - t1)
+            entry = {'history': n, 'backend': backend, 'batch': batch,
+                     'update_data': stats_ms(update), 'frame': stats_ms(frame),
+                     'full_draws': g.live_plot.full_draws - full_draws}
+            results.append(entry)
+            print(f"  {backend:<10} riwayat {n:>6}: update_data p50 {entry['update_data']['p50_ms']:.2f} ms, "
+                  f"frame p50 {entry['frame']['p50_ms']:.2f} ms")
+        g.close()
+        app.processEvents()
+    return results
+
+
+# --- Metadata dan perbandingan ---
+def git_info():
+    def run(*cmd):
+        try:
+            return subprocess.run(cmd, cwd=REPO_ROOT, capture_output=True, text=True, timeout=30).stdout.strip()
+        except (OSError, subprocess.SubprocessError):
+            return ''
+    return {'sha': run('git', 'rev-parse', 'HEAD') or None,
+            'dirty': bool(run('git', 'status', '--porcelain', '--untracked-files=no'))}
+
+
+def metadata():
+    import numpy
+    meta = {'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(), 'numpy': numpy.__version__,
+            'platform': platform.platform(), 'qt_platform': os.environ.get('QT_QPA_PLATFORM')}
+    meta['git'] = git_info()
+    return meta
+
+
+# Parameter yang menjadi identitas satu entri list hasil
+_PARAM_KEYS = ('backend', 'beds', 'channels', 'buffer_size', 'samples', 'history')
+
+
+def flatten(obj, prefix=''):
+    """Ratakan hasil jadi {'bagian/kunci/metrik': angka} untuk dibandingkan"""
+    out = {}
+    if isinstance(obj, dict):
+        for k, v in obj.items():
+            out.update(flatten(v, f"{prefix}/{k}" if prefix else k))
+    elif isinstance(obj, list) and all(isinstance(item, dict) for item in obj):
+        for item in obj:
+            key = ",".join(f"{k}={item[k]}" for k in _PARAM_KEYS if k in item)
+            out.update(flatten({k: v for k, v in item.items() if k not in _PARAM_KEYS}, f"{prefix}[{key}]"))
+    elif isinstance(obj, (int, float)) and not isinstance(obj, bool):
+        out[prefix] = obj
+    return out
+
+
+def compare(old, new, threshold=10.0):
+    """Cetak metrik yang berubah lebih dari threshold persen"""
+    a, b = flatten(old['results']), flatten(new['results'])
+    print(f"\nPerbandingan dengan {old['meta']['git'].get('sha', '?')[:10]} (perubahan > {threshold:.0f}%):")
+    changed = 0
+    for key in sorted(a.keys() & b.keys()):
+        if a[key] and abs(b[key] - a[key]) / abs(a[key]) * 100.0 > threshold:
+            changed += 1
+            print(f"  {key:<70} {a[key]:>12g} -> {b[key]:<12g} ({(b[key] - a[key]) / abs(a[key]) * 100.0:+.0f}%)")
+    if not changed:
+        print("  tidak ada")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark parsing, analisis NIBP dan rendering")
+    parser.add_argument('--only', nargs='+', choices=SECTIONS, default=list(SECTIONS))
+    parser.add_argument('--quick', action='store_true', help="ukuran kecil untuk smoke test CI")
+    parser.add_argument('--output', help="file JSON hasil (default benchmarks/results/<waktu>_<sha>.json)")
+    parser.add_argument('--compare', help="JSON hasil run sebelumnya")
+    args = parser.parse_args()
+
+    quick = args.quick
+    results = {}
+    if 'parsing' in args.only:
+        print("Parsing:")
+        results['parsing'] = bench_parsing(10000 if quick else 100000, 2 if quick else 5)
+    if 'analyze' in args.only:
+        print("BPAnalyzer.analyze_bp:")
+        lengths = (500, 2000) if quick else (500, 1000, 2000, 5000, 10000, 20000)
+        results['analyze'] = bench_analyze(lengths, 3 if quick else 10)
+    if 'bandpass' in args.only:
+        print("Band-pass osilasi:")
+        lengths = (500, 5000) if quick else (500, 5000, 20000, 100000)
+        results['bandpass'] = bench_bandpass(lengths, 3 if quick else 10)
+    if 'algorithms' in args.only:
+        print("Algoritma NIBP:")
+        results['algorithms'] = bench_algorithms(20 if quick else 100, 2 if quick else 5)
+    if 'decimation' in args.only:
+        print("Dekimasi:")
+        results['decimation'] = bench_decimation(100000 if quick else 1000000, 3 if quick else 10)
+    if 'waveform' in args.only:
+        print("update_waveform_display:")
+        results['waveform'] = bench_waveform((5, 11, 20), (500, 1000) if quick else (500, 1000, 2000, 5000, 10000),
+                                             50 if quick else 300)
+    if 'idle' in args.only:
+        print("Idle / hemat daya:")
+        results['idle'] = bench_idle(2.0 if quick else 10.0, 3 if quick else 10)
+    if 'render_backend' in args.only:
+        print("Backend render:")
+        results['render_backend'] = bench_render_backend((1000,) if quick else (1000, 5000), 50 if quick else 300)
+    if 'multilead' in args.only:
+        print("Multi-lead:")
+        results['multilead'] = bench_multilead((1000, 2000) if quick else (1000, 2000, 5000, 10000),
+                                               50 if quick else 300)
+    if 'central' in args.only:
+        print("Central station:")
+        results['central'] = bench_central((4, 16) if quick else (4, 8, 16), 50 if quick else 300)
+    if 'nibp_redraw' in args.only:
+        print("NIBPGUI.update_data:")
+        results['nibp_redraw'] = bench_nibp_redraw((250, 2000) if quick else (250, 1000, 4000, 10000),
+                                                   10 if quick else 40)
+
+    report = {'meta': metadata(), 'quick': quick, 'results': results}
+    path = args.output
+    if path is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        sha = (report['meta']['git']['sha'] or 'nogit')[:10]
+        path = os.path.join(RESULTS_DIR, f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{sha}.json")
+    with open(path, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nHasil disimpan ke {path}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(json.load(f), report)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,24 @@
+"""Import skrip GUI repo yang namanya bukan modul Python ("NIBP System.py", "Update UI PM")."""
+import importlib.machinery
+import importlib.util
+import os
+import sys
+
+REPO_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+_loaded = {}
+
+
+def load_script(filename, name=None):
+    """Muat skrip di root repo sebagai modul (sekali per proses)"""
+    if filename in _loaded:
+        return _loaded[filename]
+    name = name or os.path.splitext(filename)[0].lower().replace(' ', '_')
+    loader = importlib.machinery.SourceFileLoader(name, os.path.join(REPO_ROOT, filename))
+    spec = importlib.util.spec_from_loader(name, loader)
+    module = importlib.util.module_from_spec(spec)
+    loader.exec_module(module)
+    _loaded[filename] = module
+    return module
@@ -0,0 +1,554 @@
+"""Analisis tekanan darah osilometrik dari data manset (mmHg).
+
+    BPAnalyzer           batch: satu rekaman lengkap -> sistolik/diastolik/MAP
+    StreamingBPAnalyzer  inkremental: sampel dimasukkan per batch selama pengukuran,
+                         estimasi live dengan algoritma terpilih diperbarui per batch
+
+Tanpa `fs` puncak dicari pada tekanan manset yang di-smoothing (cara lama). Dengan
+`fs` deflasi lebih dulu di-detrend dan difilter band-pass (OSC_BAND) sehingga osilasi
+pulsa terpisah dari baseline manset: puncak dan ambang dihitung pada amplitudo
+osilasi, nilai tekanan dibaca dari baseline. Offline memakai sosfiltfilt (zero-phase),
+estimasi live memakai sosfilt dengan state yang dibawa antar batch. Koefisien SOS
+dirancang sekali per laju sampel (lru_cache).
+
+Versi streaming menyimpan state yang sama dengan langkah-langkah batch:
+maksimum berjalan (awal deflasi = argmax pertama), w-1 sampel terakhir untuk
+moving average, dan maksimum lokal yang sudah pasti (hanya ekor sejak plateau
+terakhir yang dipindai ulang tiap batch). Seleksi `distance` find_peaks
+memutuskan puncak sama tinggi lewat urutan np.argsort seluruh daftar puncak,
+jadi seleksi itu dijalankan ulang atas daftar kandidat (ratusan puncak, bukan
+ribuan sampel) setiap kali hasil diminta supaya identik dengan batch. Dengan `fs`
+kandidat yang sama dipelihara pada osilasi sosfilt kausal, jadi hasil live bisa
+sedikit berbeda dari analisis offline zero-phase.
+
+Algoritma sistolik/diastolik dipilih dari ALGORITHMS (nama -> fungsi(deflasi, fs)
+yang mengembalikan tuple 6 elemen analyze_bp); algoritma baru didaftarkan dengan
+@register_algorithm("nama"):
+
+    peak_index      cara Python awal: puncak valid ke-1 dan ke-19 dari belakang
+    firmware_ratio  port hitung_dan_tampilkan_hasil (Print_Hasil.ino): max |dp|, rasio 0.55/0.85
+    envelope_fit    amplitudo tiap denyut (band-pass) di-fit envelope Gauss asimetris, lalu rasio 0.55/0.85
+"""
+from functools import lru_cache
+
+import numpy as np
+from scipy.signal import butter, detrend, find_peaks, sosfilt, sosfilt_zi, sosfiltfilt
+
+_NO_RESULT = (None, None, None, None, None, None)
+
+# Laju sampel deflasi firmware (delay(80) di Deflasi.ino)
+DEFLATION_FS = 12.5
+# Pita osilasi pulsa: 30-240 bpm
+OSC_BAND = (0.5, 4.0)
+OSC_ORDER = 2
+# Jarak minimum antar denyut (240 bpm)
+MIN_BEAT_INTERVAL = 0.25
+# Rasio amplitudo osilasi terhadap maksimum di titik sistolik / diastolik (konvensi firmware)
+SYS_RATIO = 0.55
+DIA_RATIO = 0.85
+
+ALGORITHMS = {}
+
+
+def register_algorithm(name):
+    """Decorator: daftarkan fungsi(deflation_data, fs) -> tuple analyze_bp sebagai algoritma `name`"""
+    def decorator(fn):
+        ALGORITHMS[name] = fn
+        return fn
+    return decorator
+
+
+def _grow(buf, n, values):
+    """Tulis `values` setelah n elemen pertama `buf`, perbesar 2x kalau penuh; return buffer"""
+    end = n + len(values)
+    if end > len(buf):
+        grown = np.empty(max(end, 2 * len(buf), 1024))
+        grown[:n] = buf[:n]
+        buf = grown
+    buf[n:end] = values
+    return buf
+
+
+def _select_by_distance(peaks, heights, distance):
+    """Seleksi `distance` seperti scipy find_peaks: puncak tertinggi dulu, urutan np.argsort yang sama.
+
+    Puncak yang tidak punya tetangga sejauh < distance selalu lolos, jadi loop Python hanya
+    berjalan atas anggota kelompok puncak yang berdekatan (urutan tetap dari argsort global).
+    """
+    n = len(peaks)
+    keep = np.ones(n, dtype=bool)
+    close = np.diff(peaks) < distance
+    if not close.any():
+        return peaks
+    crowded = np.zeros(n, dtype=bool)
+    crowded[:-1] |= close
+    crowded[1:] |= close
+    order = np.argsort(heights)
+    # Operasi skalar pada list Python jauh lebih cepat daripada indeks numpy satu per satu
+    pos = peaks.tolist()
+    keep = keep.tolist()
+    for j in order[crowded[order]][::-1].tolist():
+        if not keep[j]:
+            continue
+        k = j - 1
+        while k >= 0 and pos[j] - pos[k] < distance:
+            keep[k] = False
+            k -= 1
+        k = j + 1
+        while k < n and pos[k] - pos[j] < distance:
+            keep[k] = False
+            k += 1
+    return peaks[np.array(keep)]
+
+
+@lru_cache(maxsize=None)
+def bandpass_sos(fs, band=OSC_BAND, order=OSC_ORDER):
+    """Koefisien SOS Butterworth band-pass untuk laju sampel fs (dirancang sekali; array dibagi, jangan diubah)"""
+    low, high = band
+    # Batas atas tetap di bawah Nyquist untuk laju sampel rendah
+    sos = butter(order, (low, min(high, 0.45 * fs)), btype='bandpass', fs=fs, output='sos')
+    return sos
+
+
+@lru_cache(maxsize=None)
+def _bandpass_zi(fs):
+    return sosfilt_zi(bandpass_sos(fs))
+
+
+def extract_oscillations(pressure, fs):
+    """(baseline, osilasi) dari tekanan deflasi: detrend linear + band-pass zero-phase"""
+    x = np.asarray(pressure, dtype=np.float64)
+    oscillation = sosfiltfilt(bandpass_sos(fs), detrend(x, type='linear'))
+    return x - oscillation, oscillation
+
+
+def _beat_distance(fs):
+    return max(1, int(fs * MIN_BEAT_INTERVAL))
+
+
+def _estimate(smoothed, peaks, amplitude=None):
+    """MAP, sistolik, diastolik dan puncak valid dari puncak osilasi; None kalau puncak valid < 20.
+
+    Tanpa `amplitude`, tinggi puncak diambil dari `smoothed` itu sendiri (cara lama)."""
+    if len(peaks) == 0:
+        return None
+    peak_values = smoothed[peaks] if amplitude is None else amplitude[peaks]
+
+    # Hitung MAP (Maximum Amplitude Point)
+    max_peak_index = peaks[np.argmax(peak_values)]
+    MAP_value = smoothed[max_peak_index]
+
+    # Filter puncak yang signifikan
+    threshold = 0.3 * np.max(peak_values)
+    valid_peaks = peaks[peak_values > threshold]
+
+    if len(valid_peaks) < 20:
+        return None
+
+    # Estimasi Sistolik dan Diastolik
+    systolic_value = smoothed[valid_peaks[1]] if len(valid_peaks) > 1 else MAP_value
+    diastolic_value = smoothed[valid_peaks[-19]] if len(valid_peaks) >= 20 else MAP_value
+    return MAP_value, systolic_value, diastolic_value, valid_peaks
+
+
+def _beats(deflation_data, fs):
+    """(baseline, osilasi, indeks puncak denyut) atau None kalau deflasi terlalu pendek untuk sosfiltfilt"""
+    if len(deflation_data) <= 3 * (2 * len(bandpass_sos(fs)) + 1):
+        return None
+    baseline, oscillation = extract_oscillations(deflation_data, fs)
+    peaks, _ = find_peaks(oscillation, height=0, distance=_beat_distance(fs))
+    return baseline, oscillation, peaks
+
+
+@register_algorithm('peak_index')
+def peak_index(deflation_data, fs=None):
+    """Cara awal analyze_bp: puncak pada moving average (tanpa fs) atau pada osilasi band-pass (dengan fs)"""
+    if fs:
+        beats = _beats(deflation_data, fs)
+        if beats is None:
+            return _NO_RESULT
+        # `smoothed` yang dikembalikan adalah baseline manset
+        smoothed, oscillation, peaks = beats
+        estimate = _estimate(smoothed, peaks, oscillation)
+    else:
+        # Apply smoothing filter
+        smoothed = _moving_average(deflation_data, w=5)
+
+        # Deteksi puncak osilasi
+        peaks, _ = find_peaks(smoothed, distance=5)
+        estimate = _estimate(smoothed, peaks)
+    if estimate is None:
+        return _NO_RESULT
+    MAP_value, systolic_value, diastolic_value, valid_peaks = estimate
+    return smoothed, peaks, MAP_value, systolic_value, diastolic_value, valid_peaks
+
+
+@register_algorithm('firmware_ratio')
+def firmware_ratio(deflation_data, fs=None):
+    """Port hitung_dan_tampilkan_hasil; fs tidak dipakai (firmware bekerja per sampel).
+
+    osilasi[i] = |p[i] - p[i-1]| (i >= 2), MAP di osilasi maksimum pada [10, n-10),
+    sistolik = sampel pertama ke kiri dengan osilasi < 0.55 maks, diastolik = pertama
+    ke kanan dengan osilasi < 0.85 maks. Firmware mencetak 0 kalau tidak ketemu; di
+    sini hasilnya kosong. `peaks` dan `valid_peaks` = indeks [sistolik, MAP, diastolik]."""
+    p = np.asarray(deflation_data, dtype=np.float64)
+    n = len(p)
+    if n <= 20:
+        return _NO_RESULT
+    oscillation = np.zeros(n)
+    oscillation[2:] = np.abs(np.diff(p)[1:])
+    # Maksimum pertama (perbandingan > di firmware); osilasi nol semua = tidak ada hasil
+    idx_map = 10 + int(np.argmax(oscillation[10:n - 10]))
+    max_osc = oscillation[idx_map]
+    if max_osc <= 0:
+        return _NO_RESULT
+
+    below_sys = np.flatnonzero(oscillation[1:idx_map + 1] < max_osc * SYS_RATIO)
+    below_dia = np.flatnonzero(oscillation[idx_map:] < max_osc * DIA_RATIO)
+    if len(below_sys) == 0 or len(below_dia) == 0:
+        return _NO_RESULT
+    idx_sys = 1 + below_sys[-1]
+    idx_dia = idx_map + below_dia[0]
+    points = np.array([idx_sys, idx_map, idx_dia])
+    return p, points, p[idx_map], p[idx_sys], p[idx_dia], points
+
+
+@register_algorithm('envelope_fit')
+def envelope_fit(deflation_data, fs=None):
+    """Envelope amplitudo denyut vs tekanan baseline di-fit, lalu sistolik/diastolik dari rasio 0.55/0.85.
+
+    MAP = puncak parabola yang di-fit ke ln(amplitudo) (denyut di atas 30% maksimum);
+    lebar envelope di sisi sistolik dan diastolik di-fit terpisah (least squares satu
+    parameter, Gauss asimetris), sehingga tidak bergantung pada urutan denyut."""
+    fs = fs or DEFLATION_FS
+    beats = _beats(deflation_data, fs)
+    if beats is None:
+        return _NO_RESULT
+    baseline, oscillation, peaks = beats
+    fit = _fit_envelope(baseline[peaks], oscillation[peaks])
+    if fit is None:
+        return _NO_RESULT
+    MAP_value, systolic_value, diastolic_value, valid = fit
+    return baseline, peaks, MAP_value, systolic_value, diastolic_value, peaks[valid]
+
+
+def _fit_envelope(pressure, amplitude):
+    """(MAP, sistolik, diastolik, mask denyut valid) dari tekanan baseline dan amplitudo tiap denyut, atau None"""
+    if len(amplitude) < 5:
+        return None
+    a_max = amplitude.max()
+    valid = amplitude > 0.3 * a_max
+    if np.count_nonzero(valid) < 5:
+        return None
+
+    # ln A = c2 P^2 + c1 P + c0, bobot A supaya denyut kecil (noise) tidak mendominasi
+    log_amp = np.log(amplitude[valid])
+    c2, c1, c0 = np.polyfit(pressure[valid], log_amp, 2, w=amplitude[valid])
+    if c2 < 0:
+        MAP_value = np.clip(-c1 / (2 * c2), pressure[valid].min(), pressure[valid].max())
+        log_peak = np.polyval((c2, c1, c0), MAP_value)
+    else:
+        MAP_value = pressure[np.argmax(amplitude)]
+        log_peak = np.log(a_max)
+
+    # ln(A/A_peak) = -k (P - MAP)^2 per sisi
+    dx = pressure[valid] - MAP_value
+    dy = np.minimum(log_amp - log_peak, 0.0)
+    limits = []
+    for side, ratio in ((dx > 0, SYS_RATIO), (dx < 0, DIA_RATIO)):
+        denom = np.sum(dx[side] ** 4)
+        k = -np.sum(dy[side] * dx[side] ** 2) / denom if denom > 0 else 0.0
+        if k <= 0:
+            return None
+        limits.append(np.sqrt(-np.log(ratio) / k))
+    return MAP_value, MAP_value + limits[0], MAP_value - limits[1], valid
+
+
+def _moving_average(x, w=5):
+    return np.convolve(x, np.ones(w)/w, mode='valid')
+
+
+class BPAnalyzer:
+    """`fs`: laju sampel deflasi (Hz) untuk tahap band-pass; None = cara lama (moving average).
+    `algorithm`: nama di ALGORITHMS"""
+
+    def __init__(self, fs=None, algorithm='peak_index'):
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"Algoritma NIBP tidak dikenal: {algorithm} (pilihan: {', '.join(ALGORITHMS)})")
+        self.fs = fs
+        self.algorithm = algorithm
+
+    def moving_average(self, x, w=5):
+        """Smoothing filter untuk mengurangi noise"""
+        return _moving_average(x, w)
+
+    def analyze_bp(self, pressure_data):
+        """Analisis tekanan darah dari data deflasi"""
+        try:
+            # Cari puncak inflasi (mulai deflasi)
+            peak_idx = np.argmax(pressure_data)
+            deflation_data = pressure_data[peak_idx:]
+            return ALGORITHMS[self.algorithm](deflation_data, self.fs)
+
+        except Exception as e:
+            print(f"Error dalam analisis: {e}")
+            return _NO_RESULT
+
+
+def _new_maxima(signal, lo):
+    """Maksimum lokal signal[lo:] yang sudah pasti (indeks absolut) dan indeks awal pemindaian berikutnya.
+
+    Maksimum (termasuk tengah plateau) yang sudah punya tetangga kanan lebih rendah sudah
+    pasti. Yang belum terdeteksi paling awal ada di plateau terakhir dan butuh satu sampel
+    di kirinya; sampel pertama irisan tidak pernah jadi puncak, jadi tidak ada duplikat."""
+    peaks = find_peaks(signal[lo:])[0] + lo
+    changes = np.flatnonzero(signal[lo + 1:] != signal[lo:-1])
+    plateau = lo + changes[-1] + 1 if len(changes) else lo
+    return peaks, max(plateau - 1, lo)
+
+
+def _find_below(values, start, stop, limit, reverse=False, block=256):
+    """Indeks pertama di values[start:stop] (dari belakang kalau reverse) yang < limit, atau None.
+
+    Dipindai per blok dari titik awal, jadi biayanya sebanding dengan jarak ke hasil."""
+    if reverse:
+        for hi in range(stop, start, -block):
+            lo = max(start, hi - block)
+            below = np.flatnonzero(values[lo:hi] < limit)
+            if len(below):
+                return lo + int(below[-1])
+    else:
+        for lo in range(start, stop, block):
+            below = np.flatnonzero(values[lo:min(stop, lo + block)] < limit)
+            if len(below):
+                return lo + int(below[0])
+    return None
+
+
+class StreamingBPAnalyzer:
+    """analyze_bp inkremental: `feed()` tiap batch SerialReader, `result()`/`estimates()` kapan saja.
+
+    Tiap feed hanya memproses sampel baru; `estimates()` bekerja pada daftar puncak, bukan
+    seluruh rekaman. Mode per algoritma:
+
+        peak_index tanpa fs        moving average, hasil identik dengan BPAnalyzer.analyze_bp
+        peak_index dengan fs,      osilasi dari sosfilt kausal (state dibawa antar batch);
+        envelope_fit               berbeda sedikit dari analisis offline (sosfiltfilt zero-phase)
+        firmware_ratio             |dp| per sampel seperti firmware, identik dengan batch
+
+    `matches_batch` menandai mode yang hasilnya identik dengan BPAnalyzer."""
+
+    MODES = {'peak_index': None, 'envelope_fit': 'beats', 'firmware_ratio': 'firmware'}
+
+    def __init__(self, w=5, distance=5, fs=None, algorithm='peak_index'):
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"Algoritma NIBP tidak dikenal: {algorithm} (pilihan: {', '.join(ALGORITHMS)})")
+        if algorithm not in self.MODES:
+            raise ValueError(f"Algoritma NIBP {algorithm} tidak punya versi streaming "
+                             f"(pilihan: {', '.join(self.MODES)})")
+        self.w = w
+        self.distance = distance
+        self.kernel = np.ones(w) / w
+        self.fs = fs
+        self.algorithm = algorithm
+        self.mode = self.MODES[algorithm] or ('beats' if fs else 'legacy')
+        # envelope_fit tanpa fs memakai laju deflasi firmware, sama dengan versi batch
+        self.beat_fs = fs or DEFLATION_FS
+        self.reset()
+
+    @property
+    def matches_batch(self):
+        return self.mode != 'beats'
+
+    def reset(self):
+        self.max_value = -np.inf
+        self.n_samples = 0
+        self._restart(0)
+
+    def _restart(self, start):
+        # Maksimum baru: deflasi (dan semua state turunannya) mulai lagi dari sampel ini
+        self.deflation_start = start
+        # legacy: w-1 sampel terakhir dan moving average
+        self.tail = np.empty(0)
+        self._smoothed = np.empty(1024 if self.mode == 'legacy' else 0)
+        self.n_smoothed = 0
+        # beats/firmware: deflasi mentah, osilasi kausal + state sosfilt (beats), |dp| (firmware)
+        self._raw = np.empty(0 if self.mode == 'legacy' else 1024)
+        self._oscillation = np.empty(0 if self.mode == 'legacy' else 1024)
+        self.n_raw = 0
+        self.zi = None
+        # Kandidat puncak (maksimum lokal yang sudah pasti); pemindaian berikutnya mulai dari scan_from
+        self.candidates = []
+        self.scan_from = 0
+        # firmware: osilasi maksimum pertama di [10, n-10) sejauh ini, titik sistolik/diastolik per MAP
+        self.fw_scanned = 10
+        self.fw_map = None
+        self.fw_max = -1.0
+        self.fw_sys = None
+        self.fw_dia = None
+        self.fw_dia_from = 0
+
+    @property
+    def smoothed(self):
+        return self._smoothed[:self.n_smoothed]
+
+    def feed(self, values):
+        """Tambahkan sampel tekanan (mmHg) berikutnya"""
+        x = np.asarray(values, dtype=np.float64)
+        if len(x) == 0:
+            return
+        # argmax pertama: hanya nilai yang lebih besar dari semua sebelumnya yang memulai ulang deflasi
+        before = np.maximum.accumulate(np.concatenate(([self.max_value], x[:-1])))
+        new_max = np.flatnonzero(x > before)
+        if len(new_max):
+            last = new_max[-1]
+            self.max_value = x[last]
+            self._restart(self.n_samples + last)
+            x = x[last:]
+        self.n_samples += len(values)
+
+        if self.mode == 'legacy':
+            # Moving average dengan w-1 sampel sebelumnya sebagai state filter
+            buf = np.concatenate((self.tail, x))
+            if len(buf) >= self.w:
+                self._append(np.convolve(buf, self.kernel, mode='valid'))
+                buf = buf[-(self.w - 1):]
+            self.tail = buf
+            self._resolve(self.smoothed)
+            return
+        if self.mode == 'beats':
+            self._filter(x)
+            self._raw = _grow(self._raw, self.n_raw, x)
+            self.n_raw += len(x)
+            self._resolve(self._oscillation[:self.n_raw], min_height=0.0)
+        else:
+            self._firmware_update(x)
+
+    def _filter(self, x):
+        sos = bandpass_sos(self.beat_fs)
+        if self.zi is None:
+            # Mulai dari keadaan tunak untuk sampel pertama: tanpa transien step di awal deflasi
+            self.zi = _bandpass_zi(self.beat_fs) * x[0]
+        oscillation, self.zi = sosfilt(sos, x, zi=self.zi)
+        self._oscillation = _grow(self._oscillation, self.n_raw, oscillation)
+
+    def _append(self, values):
+        self._smoothed = _grow(self._smoothed, self.n_smoothed, values)
+        self.n_smoothed += len(values)
+
+    def _resolve(self, signal, min_height=None):
+        peaks, self.scan_from = _new_maxima(signal, self.scan_from)
+        if min_height is not None:
+            # find_peaks(height=...) menyaring tinggi sebelum seleksi distance
+            peaks = peaks[signal[peaks] >= min_height]
+        self.candidates.extend(peaks.tolist())
+
+    def _firmware_update(self, x):
+        # osilasi[i] = |p[i] - p[i-1]| untuk i >= 2 (disimpan di buffer osilasi)
+        prev = self._raw[self.n_raw - 1:self.n_raw] if self.n_raw else x[:1]
+        dp = np.abs(np.diff(np.concatenate((prev, x))))
+        dp[:max(0, 2 - self.n_raw)] = 0.0
+        self._oscillation = _grow(self._oscillation, self.n_raw, dp)
+        self._raw = _grow(self._raw, self.n_raw, x)
+        self.n_raw += len(x)
+        # Argmax pertama di [10, n-10): hanya ujung baru yang dipindai
+        lo, hi = self.fw_scanned, self.n_raw - 10
+        if hi <= lo:
+            return
+        j = int(np.argmax(self._oscillation[lo:hi]))
+        if self._oscillation[lo + j] > self.fw_max:
+            self.fw_max, self.fw_map = float(self._oscillation[lo + j]), lo + j
+            self.fw_sys = None
+            self.fw_dia, self.fw_dia_from = None, self.fw_map
+        self.fw_scanned = hi
+
+    def _firmware_points(self):
+        """Indeks (sistolik, MAP, diastolik) seperti firmware_ratio, atau None"""
+        if self.n_raw <= 20 or self.fw_map is None or self.fw_max <= 0:
+            return None
+        dp = self._oscillation
+        if self.fw_sys is None:
+            # Sisi sistolik hanya bergantung pada sampel sebelum MAP: dihitung sekali per MAP
+            self.fw_sys = _find_below(dp, 1, self.fw_map + 1, self.fw_max * SYS_RATIO, reverse=True)
+        if self.fw_dia is None and self.fw_dia_from < self.n_raw:
+            # Sisi diastolik: hanya sampel baru sejak pemindaian terakhir
+            self.fw_dia = _find_below(dp, self.fw_dia_from, self.n_raw, self.fw_max * DIA_RATIO)
+            self.fw_dia_from = self.n_raw
+        if self.fw_sys is None or self.fw_dia is None:
+            return None
+        return self.fw_sys, self.fw_map, self.fw_dia
+
+    def peaks(self):
+        """Puncak osilasi sejauh ini: find_peaks(smoothed, distance=distance) tanpa fs,
+        find_peaks(osilasi, height=0, distance=denyut minimum) pada osilasi kausal dengan fs"""
+        candidates = np.asarray(self.candidates, dtype=np.intp)
+        if len(candidates) == 0 or self.mode == 'firmware':
+            return np.empty(0, dtype=np.intp)
+        if self.mode == 'beats':
+            return _select_by_distance(candidates, self._oscillation[candidates], _beat_distance(self.beat_fs))
+        return _select_by_distance(candidates, self.smoothed[candidates], self.distance)
+
+    def _peak_values(self, peaks):
+        """(tekanan, tinggi) di tiap puncak; mode beats: baseline = mentah - osilasi kausal"""
+        if self.mode == 'beats':
+            heights = self._oscillation[peaks]
+            return self._raw[peaks] - heights, heights
+        values = self.smoothed[peaks]
+        return values, values
+
+    def result(self):
+        """Tuple 6 elemen seperti BPAnalyzer.analyze_bp atas semua sampel yang sudah dimasukkan"""
+        if self.mode == 'firmware':
+            points = self._firmware_points()
+            if points is None:
+                return _NO_RESULT
+            p = self._raw[:self.n_raw].copy()
+            points = np.array(points)
+            return p, points, p[points[1]], p[points[0]], p[points[2]], points
+        peaks = self.peaks()
+        if self.mode == 'legacy':
+            if self.n_smoothed == 0:
+                return _NO_RESULT
+            signal = self.smoothed.copy()
+        else:
+            signal = self._raw[:self.n_raw] - self._oscillation[:self.n_raw]
+        values, heights = self._peak_values(peaks)
+        if self.algorithm == 'envelope_fit':
+            fit = _fit_envelope(values, heights)
+            if fit is None:
+                return _NO_RESULT
+            MAP_value, systolic_value, diastolic_value, valid = fit
+            return signal, peaks, MAP_value, systolic_value, diastolic_value, peaks[valid]
+        estimate = _estimate(values, np.arange(len(peaks)), heights)
+        if estimate is None:
+            return _NO_RESULT
+        MAP_value, systolic_value, diastolic_value, valid = estimate
+        return signal, peaks, MAP_value, systolic_value, diastolic_value, peaks[valid]
+
+    def estimates(self):
+        """Estimasi live {'systolic', 'diastolic', 'map'} dengan algoritma terpilih; None = belum bisa dihitung"""
+        out = {'systolic': None, 'diastolic': None, 'map': None}
+        if self.mode == 'firmware':
+            points = self._firmware_points()
+            if self.fw_map is not None and self.fw_max > 0:
+                out['map'] = float(self._raw[self.fw_map])
+            if points is not None:
+                out['systolic'], out['diastolic'] = float(self._raw[points[0]]), float(self._raw[points[2]])
+            return out
+        peaks = self.peaks()
+        if len(peaks) == 0:
+            return out
+        values, heights = self._peak_values(peaks)
+        if self.algorithm == 'envelope_fit':
+            fit = _fit_envelope(values, heights)
+            if fit is not None:
+                out['map'], out['systolic'], out['diastolic'] = (float(v) for v in fit[:3])
+            return out
+        # peak_index: nilai yang sudah bisa dihitung sebelum ada 20 puncak valid
+        out['map'] = float(values[np.argmax(heights)])
+        valid = values[heights > 0.3 * np.max(heights)]
+        if len(valid) > 1:
+            out['systolic'] = float(valid[1])
+        if len(valid) >= 20:
+            out['diastolic'] = float(valid[-19])
+        return out
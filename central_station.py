@@ -0,0 +1,331 @@
+"""Central station: banyak bed (8-16) dalam satu jendela.
+
+Tiap bed punya sumber data sendiri (port serial atau generator sintetis) yang
+menulis ke SPSCRingBuffer miliknya, dan satu tile kompak berisi dua gelombang
+(ECG II dan Pleth, mode sweep) plus angka vital.
+Semua bed serial dilayani satu SerialHub di satu thread; port yang putus
+dibuka ulang dengan backoff, tile-nya menampilkan "--" selama terputus.
+
+Rendering dianggarkan terpusat: setiap frame semua ring dikuras (murah), tile
+yang sedang difokus (klik untuk memilih) selalu digambar, sedangkan tile lain
+digambar bergiliran: 1/`background_divisor` dari tile itu per frame (jadi tiap
+tile di-refresh tiap `background_divisor` frame), dan berhenti lebih awal kalau
+waktu update frame sudah melewati `render_budget_ms`. Tile yang terlewat tetap
+mengumpulkan segmen kotor sehingga tidak ada data yang hilang dari layar, hanya
+refresh-nya yang lebih jarang. Dengan begitu waktu frame tetap terbatas walau
+jumlah bed bertambah.
+
+    python central_station.py --synthetic 16
+    python central_station.py --ports /dev/ttyACM0 /dev/ttyACM1 --baud 9600
+"""
+import argparse
+import sys
+import threading
+import time
+
+import numpy as np
+import pyqtgraph as pg
+from PyQt5.QtCore import pyqtSignal
+from PyQt5.QtWidgets import (QApplication, QFrame, QGridLayout, QHBoxLayout, QLabel, QVBoxLayout,
+                             QWidget)
+
+from frame_protocol import COL, MONITOR_COLUMNS
+from refresh_scheduler import RefreshScheduler, update_text
+from ring_buffer import SPSCRingBuffer
+from serial_hub import DeviceConfig, HubThread, SerialHub
+from sweep_renderer import SweepTrace
+from synthetic import monitor_rows
+
+BED_RING_CAPACITY = 4096
+# Gelombang per tile: (nama, kolom MONITOR_COLUMNS, warna, y_range; None = diperluas mengikuti data)
+TILE_WAVES = (('II', COL['II'], 'lime', (-1.5, 1.5)),
+              ('Pleth', COL['SpO2_W'], 'red', None))
+
+
+# --- Sumber data per bed ---
+class SerialBedSource:
+    """Satu bed serial yang dilayani SerialHub bersama; ring-nya milik device di hub"""
+
+    def __init__(self, runner, state):
+        self.runner = runner
+        self.state = state
+        self.ring = state.ring
+
+    # Hub melayani semua bed sekaligus: start/stop bed mana pun menjalankan/menghentikan hub
+    def start(self):
+        self.runner.start()
+
+    def stop(self):
+        self.runner.stop()
+
+
+def serial_sources(ports, baud=9600):
+    """Satu SerialHub (satu thread, reconnect dengan backoff) untuk semua port bed"""
+    configs = [DeviceConfig(f"bed{i + 1}", port, baud, fmt='monitor', capacity=BED_RING_CAPACITY)
+               for i, port in enumerate(ports)]
+    hub = SerialHub(configs)
+    runner = HubThread(hub)
+    return [SerialBedSource(runner, hub.devices[config.name]) for config in configs]
+
+
+class SyntheticBedSource:
+    """Generator monitor_rows real-time (untuk demo dan benchmark tanpa hardware)"""
+
+    def __init__(self, fs=100.0, seed=None, interval=0.02, **vitals):
+        self.fs = fs
+        self.interval = interval
+        self.vitals = vitals
+        self.rng = np.random.default_rng(seed)
+        self.ring = SPSCRingBuffer(len(MONITOR_COLUMNS), BED_RING_CAPACITY)
+        self.t = 0.0
+        self.running = False
+        self.thread = None
+
+    def feed(self, n):
+        """Tulis n sampel berikutnya ke ring (dipakai thread maupun benchmark)"""
+        rows = monitor_rows(n, self.fs, t0=self.t, noise=0.3, rng=self.rng, **self.vitals)
+        self.t += n / self.fs
+        self.ring.write(rows.astype(np.float32), time.time())
+
+    def _run(self):
+        start = time.monotonic()
+        sent = 0
+        while self.running:
+            due = int((time.monotonic() - start) * self.fs)
+            if due > sent:
+                self.feed(due - sent)
+                sent = due
+            time.sleep(self.interval)
+
+    def start(self):
+        self.running = True
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.running = False
+
+
+def synthetic_sources(n_beds, seed=0):
+    """N bed sintetis dengan HR/SpO2 berbeda supaya tile mudah dibedakan"""
+    rng = np.random.default_rng(seed)
+    return [SyntheticBedSource(seed=seed + i, hr=int(rng.integers(55, 120)), spo2=int(rng.integers(90, 100)),
+                               resp_rate=int(rng.integers(12, 24))) for i in range(n_beds)]
+
+
+# --- Tile satu bed ---
+class PatientTile(QFrame):
+    """Pane kompak: dua gelombang sweep + HR/SpO2/NIBP/RESP/TEMP"""
+    clicked = pyqtSignal()
+
+    def __init__(self, name, source, buffer_size=500, fs=100.0, parent=None):
+        super().__init__(parent)
+        self.name = name
+        self.source = source
+        self.buffer_size = buffer_size
+        self.index = 0
+        self.last = None
+        self.last_data_timestamp = 0
+        # Satu buffer channels x samples untuk semua gelombang tile (seperti signal_buffer PatientMonitor)
+        self.buffer = np.zeros((len(TILE_WAVES), buffer_size), dtype=np.float32)
+        self.columns = np.array([col for _, col, _, _ in TILE_WAVES])
+        x = np.linspace(0, buffer_size / fs, buffer_size)
+
+        layout = QHBoxLayout()
+        layout.setContentsMargins(4, 4, 4, 4)
+        waves = QVBoxLayout()
+        self.title = QLabel(name)
+        self.title.setStyleSheet("color: white; font-size: 12px; font-weight: bold;")
+        waves.addWidget(self.title)
+        self.plots, self.traces, self.y_limits = [], [], []
+        for i, (wave, _, color, y_range) in enumerate(TILE_WAVES):
+            plot = pg.PlotWidget()
+            plot.setBackground('black')
+            plot.hideAxis('bottom')
+            plot.hideAxis('left')
+            plot.setMouseEnabled(False, False)
+            plot.hideButtons()
+            if y_range is not None:
+                plot.setYRange(*y_range)
+            self.traces.append(SweepTrace(plot, x, self.buffer[i], pg.mkPen(color, width=1)))
+            # PlotWidget menelan mouse press, jadi klik di dalam plot diteruskan lewat scene-nya
+            plot.scene().sigMouseClicked.connect(lambda event: self.clicked.emit())
+            self.plots.append(plot)
+            self.y_limits.append(y_range)
+            waves.addWidget(plot)
+        layout.addLayout(waves, 3)
+
+        numerics = QVBoxLayout()
+        self.labels = {}
+        for key, color in (('HR', 'lime'), ('SpO2', 'red'), ('NIBP', 'orange'), ('RESP', 'yellow'), ('TEMP', 'cyan')):
+            label = QLabel(f"{key} --")
+            label.setStyleSheet(f"color: {color}; font-size: 13px;")
+            numerics.addWidget(label)
+            self.labels[key] = label
+        numerics.addStretch()
+        layout.addLayout(numerics, 1)
+        self.setLayout(layout)
+        self.set_focused(False)
+
+    def mousePressEvent(self, event):
+        self.clicked.emit()
+
+    def set_focused(self, focused):
+        border = "#00bfff" if focused else "#333"
+        self.setStyleSheet(f"PatientTile {{ background-color: black; border: 2px solid {border}; }}")
+
+    def pull(self):
+        """Kuras ring bed ke buffer tile dan tandai segmen kotor; return jumlah sampel"""
+        _, rows = self.source.ring.read()
+        n = len(rows)
+        if n == 0:
+            return 0
+        wave = rows[-self.buffer_size:, self.columns].T
+        m = wave.shape[1]
+        start = (self.index + n - m) % self.buffer_size
+        first = min(m, self.buffer_size - start)
+        self.buffer[:, start:start + first] = wave[:, :first]
+        self.buffer[:, :m - first] = wave[:, first:]
+        self.index = (self.index + n) % self.buffer_size
+        for i, trace in enumerate(self.traces):
+            trace.advance(self.index, n)
+            if self.y_limits[i] is None or wave[i].min() < self.y_limits[i][0] or wave[i].max() > self.y_limits[i][1]:
+                self._expand_y(i, wave[i])
+        self.last = rows[-1]
+        self.last_data_timestamp = time.time()
+        return n
+
+    def _expand_y(self, i, values):
+        # Rentang y hanya melebar (jarang), supaya setYRange tidak memicu redraw penuh tiap frame
+        lo, hi = float(values.min()), float(values.max())
+        if self.y_limits[i] is not None:
+            lo, hi = min(lo, self.y_limits[i][0]), max(hi, self.y_limits[i][1])
+        headroom = 0.15 * max(hi - lo, 1e-6)
+        self.y_limits[i] = (lo - headroom, hi + headroom)
+        self.plots[i].setYRange(*self.y_limits[i], padding=0)
+
+    def render(self):
+        return sum(trace.render() for trace in self.traces)
+
+    def update_numerics(self):
+        if self.last is None or time.time() - self.last_data_timestamp > 1.0:
+            for key, label in self.labels.items():
+                update_text(label, f"{key} --")
+            return
+        last = self.last
+        update_text(self.labels['HR'], f"HR {int(last[COL['PR']])}")
+        update_text(self.labels['SpO2'], f"SpO2 {int(last[COL['SpO2_N']])}%")
+        update_text(self.labels['NIBP'], f"NIBP {int(last[COL['SYS']])}/{int(last[COL['DIA']])}")
+        update_text(self.labels['RESP'], f"RESP {int(last[COL['RESP_N']])}")
+        update_text(self.labels['TEMP'], f"TEMP {round(float(last[COL['TEMP']]), 1)}°C")
+
+
+# --- Jendela central station ---
+class CentralStation(QWidget):
+    """Grid tile untuk N sumber; render dianggarkan per frame"""
+
+    def __init__(self, sources, names=None, cols=4, buffer_size=500, fps=30, render_budget_ms=8.0,
+                 background_divisor=3):
+        super().__init__()
+        self.setWindowTitle("Central Station")
+        self.setStyleSheet("background-color: black;")
+        self.sources = list(sources)
+        names = names or [f"Bed {i + 1}" for i in range(len(self.sources))]
+        # None = tanpa anggaran: semua tile digambar tiap frame
+        self.render_budget = None if render_budget_ms is None else render_budget_ms / 1000.0
+        self.background_divisor = background_divisor
+        self.frame = 0
+        self.next_tile = 0
+        self.rendered_tiles = 0
+
+        grid = QGridLayout()
+        grid.setSpacing(4)
+        self.tiles = []
+        for i, (name, source) in enumerate(zip(names, self.sources)):
+            tile = PatientTile(name, source, buffer_size)
+            tile.clicked.connect(lambda t=tile: self.set_focus(t))
+            grid.addWidget(tile, i // cols, i % cols)
+            self.tiles.append(tile)
+        self.setLayout(grid)
+        self.focus = None
+        if self.tiles:
+            self.set_focus(self.tiles[0])
+
+        self.scheduler = RefreshScheduler(fps, self)
+        self.scheduler.add('waveforms', self.update_waveforms)
+        self.scheduler.add('numerics', self.update_numerics, 1)
+
+    def start(self):
+        for source in self.sources:
+            source.start()
+        self.scheduler.start()
+
+    def set_focus(self, tile):
+        if self.focus is not None:
+            self.focus.set_focused(False)
+        self.focus = tile
+        tile.set_focused(True)
+
+    def update_waveforms(self):
+        t0 = time.perf_counter()
+        for tile in self.tiles:
+            tile.pull()
+        self.rendered_tiles = 0
+        if self.focus is not None:
+            self.focus.render()
+            self.rendered_tiles = 1
+
+        # Tile lain bergiliran: kuota per frame tetap (paint ikut terbatas), dan berhenti
+        # lebih awal kalau waktu update sudah melewati anggaran
+        others = [tile for tile in self.tiles if tile is not self.focus]
+        n = len(others)
+        quota = n if self.render_budget is None else -(-n // self.background_divisor)
+        done = 0
+        while done < quota:
+            if self.render_budget is not None and time.perf_counter() - t0 >= self.render_budget:
+                break
+            others[(self.next_tile + done) % n].render()
+            done += 1
+        self.rendered_tiles += done
+        self.next_tile = (self.next_tile + done) % n if n else 0
+        self.frame += 1
+
+    def update_numerics(self):
+        for tile in self.tiles:
+            tile.update_numerics()
+
+    def closeEvent(self, event):
+        self.scheduler.stop()
+        for source in self.sources:
+            source.stop()
+        super().closeEvent(event)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Central station multi-bed")
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument('--ports', nargs='+', help="port serial / URL per bed")
+    group.add_argument('--synthetic', type=int, metavar='N', help="N bed sintetis")
+    parser.add_argument('--baud', type=int, default=9600)
+    parser.add_argument('--cols', type=int, default=4)
+    parser.add_argument('--fps', type=int, default=30)
+    parser.add_argument('--budget-ms', type=float, default=8.0, help="anggaran render per frame (0 = tanpa batas)")
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    if args.synthetic is not None:
+        sources = synthetic_sources(args.synthetic)
+        names = None
+    else:
+        sources = serial_sources(args.ports, args.baud)
+        names = list(args.ports)
+    station = CentralStation(sources, names, cols=args.cols, fps=args.fps,
+                             render_budget_ms=args.budget_ms or None)
+    station.resize(1600, 900)
+    station.show()
+    station.start()
+    sys.exit(app.exec_())
+
+
+if __name__ == '__main__':
+    main()
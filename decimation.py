@@ -0,0 +1,125 @@
+"""Decimasi gelombang untuk tampilan: kurangi titik ke kira-kira jumlah pixel plot.
+
+    minmax_decimate  tiap bin (~1 pixel) diwakili titik minimum dan maksimumnya,
+                     berurutan waktu, sehingga spike QRS dan puncak pleth tetap terlihat
+    lttb             Largest-Triangle-Three-Buckets: satu titik per bucket, bentuk
+                     gelombang lebih halus, puncak sempit bisa sedikit terpotong
+
+Keduanya bekerja pada potongan array (mis. satu segmen SweepTrace) sehingga bisa
+dipakai inkremental: hanya segmen yang menerima sampel baru yang didekimasi ulang.
+NaN (celah erase bar) dipertahankan: bin yang seluruhnya NaN menghasilkan NaN.
+"""
+import numpy as np
+
+DECIMATION_MODES = ('minmax', 'lttb')
+
+
+def minmax_decimate(x, y, bin_size):
+    """Return (x, y) dengan 2 titik per bin `bin_size` sampel"""
+    n = len(y)
+    if bin_size <= 2 or n <= 2:
+        return x, y
+    n_bins = -(-n // bin_size)
+    padded = np.full(n_bins * bin_size, np.nan)
+    padded[:n] = y
+    padded = padded.reshape(n_bins, bin_size)
+    finite = np.isfinite(padded)
+    lo = np.where(finite, padded, np.inf).argmin(axis=1)
+    hi = np.where(finite, padded, -np.inf).argmax(axis=1)
+
+    # Urutkan min/max sesuai waktu supaya garis tidak berbalik arah
+    base = np.arange(n_bins) * bin_size
+    idx = np.column_stack((base + np.minimum(lo, hi), base + np.maximum(lo, hi))).ravel()
+    idx = np.minimum(idx, n - 1)
+    ys = y[idx].astype(np.float64)
+    ys[np.repeat(~finite.any(axis=1), 2)] = np.nan
+    return x[idx], ys
+
+
+def _buckets(v, w, m):
+    """Sampel tengah v[1:-1] sebagai matriks float32 (m x w); baris terakhir di-pad dengan nilai terakhir"""
+    out = np.empty(m * w, dtype=np.float32)
+    inner = v[1:-1]
+    out[:len(inner)] = inner
+    out[len(inner):] = inner[-1]
+    return out.reshape(m, w)
+
+
+def _lttb_select(X, Y, cx, cy, ax, ay, tail, area, tmp):
+    # Luas bertanda segitiga (anchor, kandidat, rata-rata bucket berikutnya) untuk semua bucket
+    # sekaligus, linear dalam (X, Y): p*Y + q*X + r. Buffer area/tmp dipakai ulang antar lintasan
+    p = (ax - cx).astype(np.float32)[:, None]
+    q = (cy - ay).astype(np.float32)[:, None]
+    r = (-(p[:, 0] * ay + q[:, 0] * ax)).astype(np.float32)[:, None]
+    np.multiply(Y, p, out=area)
+    np.multiply(X, q, out=tmp)
+    area += tmp
+    area += r
+    # Pad di bucket terakhir disamakan dengan kandidat pertama supaya tidak pernah menang
+    area[-1, tail:] = area[-1, 0]
+    # |luas| maksimum = maksimum atau minimum luas bertanda, tanpa lintasan abs tambahan
+    hi, lo = area.argmax(axis=1), area.argmin(axis=1)
+    rows = np.arange(len(area))
+    return np.where(area[rows, hi] >= -area[rows, lo], hi, lo)
+
+
+def lttb_indices(x, y, n_out):
+    """Indeks titik terpilih Largest-Triangle-Three-Buckets (titik pertama dan terakhir selalu ikut).
+
+    Bucket tengah berlebar tetap sehingga data cukup di-reshape menjadi matriks
+    (bucket x lebar); hasilnya paling banyak `n_out` titik. LTTB asli berurutan
+    (anchor tiap bucket = titik terpilih bucket sebelumnya); di sini semua bucket
+    dihitung sekaligus dalam dua lintasan: anchor rata-rata bucket sebelumnya, lalu
+    titik hasil lintasan pertama. Kriterianya sama, tetapi pilihan bisa berbeda dari
+    versi berurutan kalau luas kandidat hampir sama (sinyal noise)."""
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=np.float64)
+    yf = np.asarray(y, dtype=np.float64)
+    bad = ~np.isfinite(yf)
+    if bad.any():
+        yf = np.where(bad, 0.0, yf)
+    w = -(-(n - 2) // (n_out - 2))
+    m = -(-(n - 2) // w)
+    tail = (n - 2) - (m - 1) * w
+    # Relatif terhadap titik pertama supaya float32 tetap presisi untuk sumbu waktu panjang
+    x0, y0 = x[0], yf[0]
+    X, Y = _buckets(x - x0, w, m), _buckets(yf - y0, w, m)
+
+    # Rata-rata tiap bucket (pad tidak ikut dihitung)
+    counts = np.full(m, w)
+    counts[-1] = tail
+    sx, sy = X.sum(axis=1, dtype=np.float64), Y.sum(axis=1, dtype=np.float64)
+    sx[-1] -= (w - tail) * float(X[-1, -1])
+    sy[-1] -= (w - tail) * float(Y[-1, -1])
+    mx, my = sx / counts, sy / counts
+    # Titik ketiga segitiga: rata-rata bucket berikutnya, untuk bucket terakhir titik terakhir
+    cx, cy = np.append(mx[1:], x[-1] - x0), np.append(my[1:], yf[-1] - y0)
+
+    area, tmp = np.empty_like(X), np.empty_like(X)
+    base = 1 + np.arange(m) * w
+    # Lintasan 1: anchor = titik pertama untuk bucket 0, rata-rata bucket sebelumnya untuk sisanya
+    chosen = base + _lttb_select(X, Y, cx, cy, np.append(0.0, mx[:-1]), np.append(0.0, my[:-1]), tail, area, tmp)
+    # Lintasan 2: anchor = titik terpilih bucket sebelumnya
+    anchor = np.append(0, chosen[:-1])
+    chosen = base + _lttb_select(X, Y, cx, cy, x[anchor] - x0, yf[anchor] - y0, tail, area, tmp)
+    return np.concatenate(([0], chosen, [n - 1]))
+
+
+def lttb(x, y, n_out):
+    """Return (x, y) dengan paling banyak `n_out` titik"""
+    idx = lttb_indices(x, y, n_out)
+    return x[idx], y[idx]
+
+
+def decimate(x, y, bin_size, mode='minmax'):
+    """Dekimasi sesuai mode; bin_size = sampel per pixel"""
+    if bin_size <= 2:
+        return x, y
+    if mode == 'minmax':
+        return minmax_decimate(x, y, bin_size)
+    if mode == 'lttb':
+        # Jumlah titik setara min/max: 2 per pixel
+        return lttb(x, y, max(3, 2 * -(-len(y) // bin_size)))
+    raise ValueError(f"Mode dekimasi tidak dikenal: {mode} (pilihan: {', '.join(DECIMATION_MODES)})")
@@ -0,0 +1,274 @@
+"""Emulator firmware Arduino di port serial virtual (pty) untuk tes tanpa hardware.
+
+    NIBPEmulator     protokol NIBP (HSCDANN001BG2A5): tunggu START, stream
+                     "Tekanan: x mmHg" selama inflasi dan deflasi dengan osilasi,
+                     lalu blok hasil "=== HASIL NIBP ===" seperti Print_Hasil.ino
+                     (atau satu baris "HASIL: Sistolik=..., Diastolik=..., BPM=...")
+    MonitorEmulator  baris 16-field dari "All code PM. ino" di 100 Hz, atau frame biner
+
+Keduanya bisa berjalan lebih cepat dari real time (speed=50 -> 50x, speed=0 ->
+secepat mungkin) dengan noise dan korupsi baris yang bisa diatur, sehingga
+SerialReader dan PatientMonitor bisa di-load-test di port pty.
+
+Contoh:
+    python firmware_emulator.py nibp --speed 50
+    python firmware_emulator.py monitor --speed 5 --corruption 0.01 --binary
+"""
+import argparse
+import os
+import pty
+import select
+import threading
+import time
+import tty
+
+import numpy as np
+
+from frame_protocol import encode_frames
+from synthetic import monitor_rows, nibp_session
+
+
+class VirtualSerialPort:
+    """Pasangan pty: aplikasi membuka `port` seperti port serial biasa, emulator memakai sisi master"""
+
+    def __init__(self):
+        self.master, self.slave = pty.openpty()
+        # Mode raw: tanpa echo dan tanpa pemrosesan baris, seperti port USB-CDC
+        tty.setraw(self.slave)
+        self.port = os.ttyname(self.slave)
+        self._buffer = b''
+
+    def write(self, data):
+        view = memoryview(data)
+        while view:
+            n = os.write(self.master, view)
+            view = view[n:]
+
+    def readline(self, timeout=None):
+        """Baca satu baris perintah dari aplikasi, None kalau timeout"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while b'\n' not in self._buffer:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            ready, _, _ = select.select([self.master], [], [], remaining)
+            if not ready:
+                return None
+            try:
+                self._buffer += os.read(self.master, 1024)
+            except OSError:
+                return None
+        line, _, self._buffer = self._buffer.partition(b'\n')
+        return line.decode(errors='ignore').strip()
+
+    def close(self):
+        # Boleh dipanggil berulang: nomor fd yang sudah ditutup bisa dipakai ulang oleh file lain
+        fds, self.master, self.slave = (self.master, self.slave), None, None
+        for fd in fds:
+            if fd is None:
+                continue
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+
+class _EmulatorBase:
+    def __init__(self, speed=1.0, noise=0.3, corruption=0.0, seed=None):
+        self.speed = speed
+        self.noise = noise
+        self.corruption = corruption
+        self.rng = np.random.default_rng(seed)
+        self.serial = VirtualSerialPort()
+        self.lines_sent = 0
+        self.lines_corrupted = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def port(self):
+        return self.serial.port
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run_safe, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, close=True):
+        """Hentikan emulator; close=False membiarkan pty terbuka supaya data yang sudah terkirim masih bisa dibaca"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+        if close:
+            self.serial.close()
+
+    def _run_safe(self):
+        try:
+            self.run()
+        except OSError:
+            # Port ditutup saat emulator masih menulis
+            pass
+
+    def _sleep(self, seconds):
+        """Tunggu waktu firmware yang sudah diskalakan; False kalau emulator dihentikan"""
+        if self.speed > 0:
+            return not self._stop.wait(seconds / self.speed)
+        return not self._stop.is_set()
+
+    def _corrupt(self, data):
+        """Rusak satu baris: potong, sisipkan byte sampah, atau hilangkan newline"""
+        kind = self.rng.integers(3)
+        if kind == 0:
+            return data[:self.rng.integers(1, max(2, len(data) - 2))] + b'\r\n'
+        if kind == 1:
+            pos = self.rng.integers(len(data) - 2)
+            return data[:pos] + bytes([self.rng.integers(33, 127)]) + b'#' + data[pos + 1:]
+        return data[:-2]
+
+    def send_lines(self, lines):
+        """Kirim beberapa baris Serial.println() sekaligus"""
+        out = []
+        for line in lines:
+            data = line.encode() + b'\r\n'
+            if self.corruption and self.rng.random() < self.corruption:
+                data = self._corrupt(data)
+                self.lines_corrupted += 1
+            out.append(data)
+        self.lines_sent += len(out)
+        self.serial.write(b''.join(out))
+
+
+class NIBPEmulator(_EmulatorBase):
+    """Emulator protokol NIBP; satu pengukuran per perintah START"""
+
+    def __init__(self, systolic=120, diastolic=80, hr=72, result_style='block', session_kwargs=None, **kwargs):
+        super().__init__(**kwargs)
+        self.systolic = systolic
+        self.diastolic = diastolic
+        self.hr = hr
+        self.result_style = result_style
+        self.session_kwargs = session_kwargs or {}
+        self.measurements = 0
+
+    def run(self):
+        self.send_lines(["=== SISTEM NIBP - ARDUINO MEGA AKTIF ===",
+                         "Ketik START di Serial Monitor untuk memulai."])
+        while not self._stop.is_set():
+            cmd = self.serial.readline(timeout=0.2)
+            if cmd is None or cmd.upper() != "START":
+                continue
+            self.send_lines(["", "> Mulai pengukuran NIBP..."])
+            if self.measure():
+                self.measurements += 1
+
+    def measure(self):
+        kw = dict(systolic=self.systolic, diastolic=self.diastolic, hr=self.hr, noise=self.noise, rng=self.rng)
+        kw.update(self.session_kwargs)
+        inflate, deflate = nibp_session(**kw)
+        inflate_dt = kw.get('inflate_dt', 0.05)
+        deflate_dt = kw.get('deflate_dt', 0.08)
+
+        for p in inflate:
+            self.send_lines([f"Tekanan: {p:.2f} mmHg"])  # Serial.print(float) = 2 desimal
+            if not self._sleep(inflate_dt):
+                return False
+        self.send_lines(["> Tekanan target tercapai. Mulai deflasi..."])
+        for p in deflate:
+            self.send_lines([f"Tekanan: {p:.2f} mmHg"])
+            if not self._sleep(deflate_dt):
+                return False
+
+        map_value = self.diastolic + (self.systolic - self.diastolic) / 3.0
+        if self.result_style == 'inline':
+            self.send_lines([f"HASIL: Sistolik={self.systolic} mmHg, Diastolik={self.diastolic} mmHg, BPM={self.hr}"])
+        else:
+            self.send_lines(["", "=== HASIL NIBP ===",
+                             f"Sistolik  : {self.systolic:.1f} mmHg",
+                             f"Diastolik : {self.diastolic:.1f} mmHg",
+                             f"MAP       : {map_value:.1f} mmHg",
+                             "===================================",
+                             "Ketik START lagi untuk pengukuran baru."])
+        return True
+
+
+class MonitorEmulator(_EmulatorBase):
+    """Emulator "All code PM. ino": 16 field per baris (atau frame biner) di fs Hz"""
+
+    def __init__(self, fs=100.0, binary=False, hr=72, spo2=98, resp_rate=16, temp=36.6,
+                 nibp=(120, 80), tick=0.01, **kwargs):
+        super().__init__(**kwargs)
+        self.fs = fs
+        self.binary = binary
+        self.params = dict(hr=hr, spo2=spo2, resp_rate=resp_rate, temp=temp, nibp=nibp)
+        # Periode tulis (waktu dinding); sampel yang jatuh tempo dikirim per tick
+        self.tick = tick
+        self.samples_sent = 0
+
+    def run(self):
+        self.send_lines(["AFE44xx Inisiasi Selesai"])
+        start = time.monotonic()
+        while not self._stop.is_set():
+            if self.speed > 0:
+                elapsed = (time.monotonic() - start) * self.speed
+                due = int(elapsed * self.fs) - self.samples_sent
+            else:
+                due = int(self.fs)
+            if due > 0:
+                self.send_samples(due)
+            if self.speed > 0:
+                self._stop.wait(self.tick)
+
+    def send_samples(self, n):
+        rows = monitor_rows(n, fs=self.fs, t0=self.samples_sent / self.fs, noise=self.noise,
+                            rng=self.rng, **self.params)
+        if self.binary:
+            data = bytearray(encode_frames(rows, seq_start=self.samples_sent))
+            if self.corruption:
+                # Korupsi byte acak di frame; decoder harus menolaknya lewat CRC
+                n_bad = self.rng.binomial(n, self.corruption)
+                for pos in self.rng.integers(len(data), size=n_bad):
+                    data[pos] ^= 0xFF
+                self.lines_corrupted += n_bad
+            self.serial.write(bytes(data))
+            self.lines_sent += n
+        else:
+            self.send_lines([format_monitor_line(r) for r in rows])
+        self.samples_sent += n
+
+
+def format_monitor_line(r):
+    """Satu baris persis seperti String(...) di firmware"""
+    fields = [f"{v:.2f}" for v in r[:9]]
+    fields += [f"{int(r[9])}", f"{int(r[10])}", f"{r[11]:.2f}", f"{int(r[12])}",
+               f"{r[13]:.2f}", f"{r[14]:.2f}", f"{int(r[15])}\\{int(r[16])}"]
+    return ",".join(fields)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Emulator firmware NIBP / monitor di pty")
+    parser.add_argument('kind', choices=['nibp', 'monitor'])
+    parser.add_argument('--speed', type=float, default=1.0, help="kelipatan real time, 0 = secepat mungkin")
+    parser.add_argument('--noise', type=float, default=0.3)
+    parser.add_argument('--corruption', type=float, default=0.0, help="peluang baris rusak (0..1)")
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--binary', action='store_true', help="monitor: kirim frame biner")
+    parser.add_argument('--inline-result', action='store_true', help="nibp: hasil satu baris HASIL: ...")
+    args = parser.parse_args()
+
+    common = dict(speed=args.speed, noise=args.noise, corruption=args.corruption, seed=args.seed)
+    if args.kind == 'nibp':
+        emu = NIBPEmulator(result_style='inline' if args.inline_result else 'block', **common)
+    else:
+        emu = MonitorEmulator(binary=args.binary, **common)
+    emu.start()
+    print(f"Emulator {args.kind} siap di {emu.port} (Ctrl+C untuk berhenti)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        emu.stop()
+        print(f"Terkirim {emu.lines_sent} baris, {emu.lines_corrupted} rusak")
+
+
+if __name__ == '__main__':
+    main()
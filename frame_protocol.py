@@ -0,0 +1,241 @@
+"""Protokol frame biner untuk stream 16-field monitor pasien.
+
+Format teks lama (`I,II,III,V,V1..V5,PR,SpO2_N,SpO2_W,RESP_N,RESP_W,TEMP,sys\\dia`)
+butuh ~70 byte per sampel, terlalu besar untuk 100 Hz di 9600 baud. Frame biner
+ini 38 byte, little-endian, tanpa padding:
+
+    offset  tipe        isi
+    0       uint16      sync word 0x5AA5 (di kabel: A5 5A)
+    2       uint16      nomor urut (wrap di 65536)
+    4       int16[11]   I, II, III, V, V1..V5, Pleth, RESP  (raw / WAVE_SCALE)
+    26      uint16      PR / HR (bpm)
+    28      uint8       SpO2 (%)
+    29      uint8       RESP (rpm)
+    30      int16       TEMP (0.01 °C)
+    32      uint16      NIBP sistolik (mmHg)
+    34      uint16      NIBP diastolik (mmHg)
+    36      uint16      CRC-16/CCITT-FALSE atas byte 2..35
+
+Decoder mengubah satu chunk `ser.read()` menjadi array numpy sekaligus lewat
+`np.frombuffer` dengan structured dtype. Output-nya memakai layout kolom yang
+sama dengan parser teks (MONITOR_COLUMNS), jadi sisi GUI tidak perlu tahu
+format mana yang dipakai firmware.
+"""
+import binascii
+
+import numpy as np
+
+FRAME_SYNC = 0x5AA5
+FRAME_SYNC_BYTES = b'\xa5\x5a'
+
+# Urutan kanal gelombang di dalam frame
+WAVE_CHANNELS = ('I', 'II', 'III', 'V', 'V1', 'V2', 'V3', 'V4', 'V5', 'Pleth', 'RESP')
+
+# Nilai fisik = nilai int16 / WAVE_SCALE.
+# ECG & RESP dikirim dalam satuan 0.001, Pleth = RED_data >> 6 (22-bit -> 16-bit)
+WAVE_SCALE = np.array([1000.0] * 9 + [1.0 / 64.0, 1000.0], dtype=np.float32)
+
+# Layout kolom hasil decode (sama dengan format teks, NIBP dipecah dua kolom)
+MONITOR_COLUMNS = (
+    'I', 'II', 'III', 'V', 'V1', 'V2', 'V3', 'V4', 'V5',
+    'PR', 'SpO2_N', 'SpO2_W', 'RESP_N', 'RESP_W', 'TEMP', 'SYS', 'DIA'
+)
+COL = {name: i for i, name in enumerate(MONITOR_COLUMNS)}
+
+# Posisi kolom gelombang di MONITOR_COLUMNS, urut sesuai WAVE_CHANNELS
+WAVE_COLUMNS = np.array([COL[c] for c in ('I', 'II', 'III', 'V', 'V1', 'V2', 'V3', 'V4', 'V5')]
+                        + [COL['SpO2_W'], COL['RESP_W']])
+
+FRAME_DTYPE = np.dtype([
+    ('sync', '<u2'),
+    ('seq', '<u2'),
+    ('wave', '<i2', (len(WAVE_CHANNELS),)),
+    ('hr', '<u2'),
+    ('spo2', 'u1'),
+    ('resp', 'u1'),
+    ('temp', '<i2'),
+    ('sys', '<u2'),
+    ('dia', '<u2'),
+    ('crc', '<u2'),
+])
+FRAME_SIZE = FRAME_DTYPE.itemsize  # 38 byte
+_CRC_START = FRAME_DTYPE.fields['seq'][1]
+_CRC_END = FRAME_DTYPE.fields['crc'][1]
+
+
+# --- CRC-16/CCITT-FALSE (poly 0x1021, init 0xFFFF), table driven ---
+def _make_crc_table():
+    table = np.zeros(256, dtype=np.uint16)
+    for i in range(256):
+        crc = i << 8
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x1021) if crc & 0x8000 else (crc << 1)
+        table[i] = crc & 0xFFFF
+    return table
+
+CRC_TABLE = _make_crc_table()
+
+
+# Di bawah jumlah frame ini binascii.crc_hqx per frame lebih cepat dari loop vektor per kolom
+_CRC_VECTOR_MIN = 64
+
+
+def crc16_rows(data):
+    """CRC16 untuk setiap baris array uint8 (n_frame x n_byte), vektor per kolom byte"""
+    if data.shape[0] < _CRC_VECTOR_MIN:
+        return np.array([binascii.crc_hqx(row.tobytes(), 0xFFFF) for row in data], dtype=np.uint16)
+    crc = np.full(data.shape[0], 0xFFFF, dtype=np.uint16)
+    for col in range(data.shape[1]):
+        idx = ((crc >> 8) ^ data[:, col]) & 0xFF
+        crc = ((crc << 8) & 0xFFFF) ^ CRC_TABLE[idx]
+    return crc
+
+
+def crc16(payload):
+    """CRC16 untuk satu buffer bytes"""
+    return binascii.crc_hqx(bytes(payload), 0xFFFF)
+
+
+# --- Encoder (dipakai untuk tes / benchmark / emulator) ---
+def encode_frames(rows, seq_start=0):
+    """Ubah array (n x 17) dengan layout MONITOR_COLUMNS menjadi bytes frame biner"""
+    rows = np.asarray(rows, dtype=np.float64)
+    if rows.ndim == 1:
+        rows = rows[np.newaxis, :]
+    n = rows.shape[0]
+    frames = np.zeros(n, dtype=FRAME_DTYPE)
+    frames['sync'] = FRAME_SYNC
+    frames['seq'] = (seq_start + np.arange(n)) & 0xFFFF
+    wave = np.rint(rows[:, WAVE_COLUMNS] * WAVE_SCALE)
+    frames['wave'] = np.clip(wave, -32768, 32767).astype(np.int16)
+    frames['hr'] = np.clip(np.rint(rows[:, COL['PR']]), 0, 0xFFFF)
+    frames['spo2'] = np.clip(np.rint(rows[:, COL['SpO2_N']]), 0, 0xFF)
+    frames['resp'] = np.clip(np.rint(rows[:, COL['RESP_N']]), 0, 0xFF)
+    frames['temp'] = np.clip(np.rint(rows[:, COL['TEMP']] * 100), -32768, 32767)
+    frames['sys'] = np.clip(np.rint(rows[:, COL['SYS']]), 0, 0xFFFF)
+    frames['dia'] = np.clip(np.rint(rows[:, COL['DIA']]), 0, 0xFFFF)
+    raw = frames.view(np.uint8).reshape(n, FRAME_SIZE)
+    frames['crc'] = crc16_rows(raw[:, _CRC_START:_CRC_END])
+    return frames.tobytes()
+
+
+def frames_to_rows(frames):
+    """Structured array frame -> array float32 (n x 17) dengan layout MONITOR_COLUMNS"""
+    rows = np.empty((len(frames), len(MONITOR_COLUMNS)), dtype=np.float32)
+    rows[:, WAVE_COLUMNS] = frames['wave'] / WAVE_SCALE
+    rows[:, COL['PR']] = frames['hr']
+    rows[:, COL['SpO2_N']] = frames['spo2']
+    rows[:, COL['RESP_N']] = frames['resp']
+    rows[:, COL['TEMP']] = frames['temp'] / 100.0
+    rows[:, COL['SYS']] = frames['sys']
+    rows[:, COL['DIA']] = frames['dia']
+    return rows
+
+
+# --- Decoder ---
+class FrameDecoder:
+    """Decode stream byte menjadi frame, menyimpan sisa frame parsial untuk chunk berikutnya.
+
+    Counter:
+        frames      jumlah frame valid
+        crc_errors  kandidat sync dengan CRC salah (di luar frame valid: error link)
+        false_syncs byte A5 5A di dalam payload frame valid (bukan error link)
+        lost_frames frame yang hilang (lompatan nomor urut)
+        skipped     byte sampah yang dibuang
+    """
+
+    def __init__(self):
+        self.carry = b''
+        self.last_seq = None
+        self.frames = 0
+        self.crc_errors = 0
+        self.false_syncs = 0
+        self.lost_frames = 0
+        self.skipped = 0
+        self.locked = False
+
+    def feed(self, chunk):
+        """Decode satu chunk, return array float32 (n x 17)"""
+        data = self.carry + bytes(chunk)
+        if len(data) < FRAME_SIZE:
+            self.carry = data
+            return np.empty((0, len(MONITOR_COLUMNS)), dtype=np.float32)
+        frames, end = self._decode(data)
+
+        tail = data[end:]
+        if len(tail) >= FRAME_SIZE:
+            # Tidak ada frame lengkap yang valid di ekor ini, sisakan kemungkinan frame parsial saja
+            self.skipped += len(tail) - (FRAME_SIZE - 1)
+            tail = tail[-(FRAME_SIZE - 1):]
+        self.carry = tail
+
+        if len(frames):
+            self._count_lost(frames['seq'])
+            self.frames += len(frames)
+            self.locked = True
+        elif len(data) >= 4 * FRAME_SIZE:
+            # Sudah cukup banyak byte tanpa satupun frame: kemungkinan stream teks
+            self.locked = False
+        return frames_to_rows(frames)
+
+    def _decode(self, data):
+        n_bytes = len(data)
+        buf = np.frombuffer(data, dtype=np.uint8)
+
+        # Jalur cepat: chunk sudah rapi (mulai di sync dan kelipatan frame)
+        n_aligned = n_bytes // FRAME_SIZE
+        if n_aligned and data[:2] == FRAME_SYNC_BYTES:
+            frames = np.frombuffer(data, dtype=FRAME_DTYPE, count=n_aligned)
+            if np.all(frames['sync'] == FRAME_SYNC):
+                raw = buf[:n_aligned * FRAME_SIZE].reshape(n_aligned, FRAME_SIZE)
+                if np.all(crc16_rows(raw[:, _CRC_START:_CRC_END]) == frames['crc']):
+                    return frames, n_aligned * FRAME_SIZE
+
+        # Jalur umum: cari semua sync word, ambil kandidat yang lengkap
+        if n_bytes < FRAME_SIZE:
+            return np.zeros(0, dtype=FRAME_DTYPE), 0
+        starts = np.flatnonzero((buf[:-1] == 0xA5) & (buf[1:] == 0x5A))
+        starts = starts[starts + FRAME_SIZE <= n_bytes]
+        if len(starts) == 0:
+            return np.zeros(0, dtype=FRAME_DTYPE), 0
+
+        windows = np.lib.stride_tricks.sliding_window_view(buf, FRAME_SIZE)[starts]
+        frames = np.ascontiguousarray(windows).view(FRAME_DTYPE)[:, 0]
+        ok = crc16_rows(windows[:, _CRC_START:_CRC_END]) == frames['crc']
+        keep = ok.copy()
+        # Buang frame yang tumpang tindih (sync palsu di dalam payload yang kebetulan lolos CRC)
+        valid = np.flatnonzero(ok)
+        if len(valid) > 1 and np.any(np.diff(starts[valid]) < FRAME_SIZE):
+            next_free = 0
+            for i in valid:
+                if starts[i] >= next_free:
+                    next_free = starts[i] + FRAME_SIZE
+                else:
+                    keep[i] = False
+
+        accepted = starts[keep]
+        if len(accepted) < len(starts):
+            # Kandidat yang ditolak di dalam frame valid hanyalah byte payload yang kebetulan A5 5A;
+            # sisanya frame rusak di kabel
+            rejected = starts[~keep]
+            inside = np.zeros(len(rejected), dtype=bool)
+            if len(accepted):
+                owner = np.searchsorted(accepted, rejected, side='right') - 1
+                inside = (owner >= 0) & (rejected < accepted[np.maximum(owner, 0)] + FRAME_SIZE)
+            self.false_syncs += int(np.count_nonzero(inside))
+            self.crc_errors += int(np.count_nonzero(~inside))
+        if len(accepted) == 0:
+            return frames[:0], 0
+        frames = frames[keep]
+
+        self.skipped += int(accepted[0]) + int(np.sum(np.diff(accepted) - FRAME_SIZE))
+        return frames, int(accepted[-1]) + FRAME_SIZE
+
+    def _count_lost(self, seq):
+        seq = seq.astype(np.int64)
+        if self.last_seq is not None:
+            seq = np.concatenate(([self.last_seq], seq))
+        gaps = (np.diff(seq) - 1) % 65536
+        gaps[gaps > 32767] = 0  # duplikat / urutan mundur, bukan frame hilang
+        self.lost_frames += int(np.sum(gaps))
+        self.last_seq = int(seq[-1])
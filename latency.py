@@ -0,0 +1,152 @@
+"""Instrumentasi latensi end-to-end dari `ser.read` sampai frame digambar.
+
+Setiap batch membawa timestamp saat byte-nya keluar dari `ser.read` (t_read,
+sama dengan timestamp yang sudah dikirim lewat ring buffer / sinyal Qt).
+Setiap tahap mencatat `sekarang - t_read` ke histogramnya sendiri:
+
+    parse    setelah parser/decoder selesai (thread reader)
+    deliver  batch sampai di thread GUI (ring di-drain / sinyal Qt diterima)
+    buffer   batch selesai ditulis ke buffer tampilan
+    paint    frame yang memuat batch itu digambar
+
+Histogram memakai bucket logaritmik ala HdrHistogram: presisi relatif tetap
+(~3% dengan sub_bits=5) dari 1 us sampai berjam-jam, memori tetap, dan
+merekam satu nilai cukup O(1). Semua method aman dipanggil dari beberapa thread.
+"""
+import json
+import os
+import threading
+import time
+
+import numpy as np
+
+STAGES = ('parse', 'deliver', 'buffer', 'paint')
+
+
+class LatencyHistogram:
+    """Histogram latensi (mikrodetik) dengan bucket log-linear"""
+
+    def __init__(self, sub_bits=5, max_bits=36):
+        self.sub_bits = sub_bits
+        self.sub = 1 << sub_bits
+        # Nilai < 2*sub disimpan linear (resolusi 1 us), sisanya sub bucket per oktaf
+        self.max_value = (1 << max_bits) - 1
+        self.counts = np.zeros((max_bits - sub_bits + 1) * self.sub, dtype=np.int64)
+        self.count = 0
+        self.max = 0
+        self.total = 0
+
+    def _index(self, us):
+        exp = np.maximum(np.floor(np.log2(np.maximum(us, 1))).astype(np.int64) - self.sub_bits, 0)
+        return np.where(exp == 0, us, (exp + 1) * self.sub + (us >> exp) - self.sub)
+
+    def _upper(self, idx):
+        """Nilai tertinggi (us) yang masuk bucket idx"""
+        if idx < 2 * self.sub:
+            return idx
+        exp = idx // self.sub - 1
+        mantissa = idx % self.sub + self.sub
+        return ((mantissa + 1) << exp) - 1
+
+    def record(self, seconds):
+        us = np.clip(np.round(np.atleast_1d(seconds) * 1e6), 0, self.max_value).astype(np.int64)
+        if not len(us):
+            return
+        np.add.at(self.counts, self._index(us), 1)
+        self.count += len(us)
+        self.total += int(us.sum())
+        self.max = max(self.max, int(us.max()))
+
+    def percentile(self, q):
+        """Persentil q (0..100) dalam milidetik"""
+        if not self.count:
+            return 0.0
+        rank = max(1, int(np.ceil(q / 100.0 * self.count)))
+        idx = int(np.searchsorted(np.cumsum(self.counts), rank))
+        return min(self._upper(idx), self.max) / 1000.0
+
+    def summary(self):
+        return {
+            'count': self.count,
+            'mean_ms': round(self.total / self.count / 1000.0, 3) if self.count else 0.0,
+            'p50_ms': round(self.percentile(50), 3),
+            'p99_ms': round(self.percentile(99), 3),
+            'max_ms': round(self.max / 1000.0, 3),
+        }
+
+    def reset(self):
+        self.counts[:] = 0
+        self.count = self.max = self.total = 0
+
+
+class LatencyTracker:
+    """Histogram per tahap, dump JSON berkala"""
+
+    def __init__(self, stages=STAGES, dump_path=None, dump_interval=5.0):
+        self.histograms = {stage: LatencyHistogram() for stage in stages}
+        self.dump_path = dump_path
+        self.dump_interval = dump_interval
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._started = time.time()
+        self._last_dump = time.monotonic()
+
+    def record(self, stage, origins, now=None):
+        """Catat latensi tahap untuk tiap batch. `origins` = t_read skalar atau per sampel"""
+        origins = np.unique(np.atleast_1d(origins))
+        if not len(origins):
+            return
+        if now is None:
+            now = time.time()
+        with self._lock:
+            self.histograms[stage].record(now - origins)
+
+    def defer(self, stage, origins):
+        """Tandai batch yang tahapnya baru selesai nanti (mis. saat paint berikutnya)"""
+        origins = np.atleast_1d(origins)
+        if not len(origins):
+            return
+        with self._lock:
+            self._pending.setdefault(stage, []).append(np.unique(origins))
+
+    def complete(self, stage, now=None):
+        """Catat semua batch yang ditunda untuk tahap ini"""
+        with self._lock:
+            pending = self._pending.pop(stage, None)
+        if pending:
+            self.record(stage, np.concatenate(pending), now)
+
+    def summary(self):
+        with self._lock:
+            return {stage: h.summary() for stage, h in self.histograms.items()}
+
+    def format_text(self):
+        """Tabel ringkas untuk overlay debug"""
+        lines = [f"{'tahap':<8}{'n':>8}{'p50':>9}{'p99':>9}{'max':>9}  (ms)"]
+        for stage, s in self.summary().items():
+            lines.append(f"{stage:<8}{s['count']:>8}{s['p50_ms']:>9.2f}{s['p99_ms']:>9.2f}{s['max_ms']:>9.2f}")
+        return "\n".join(lines)
+
+    def dump(self, path=None):
+        path = path or self.dump_path
+        if not path:
+            return
+        data = {'started': self._started, 'updated': time.time(), 'stages': self.summary()}
+        # Tulis ke file sementara lalu rename supaya pembaca tidak melihat file setengah jadi
+        tmp = f"{path}.tmp"
+        with open(tmp, 'w') as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp, path)
+
+    def maybe_dump(self):
+        """Dipanggil sering dari timer; dump hanya tiap dump_interval detik"""
+        now = time.monotonic()
+        if self.dump_path and now - self._last_dump >= self.dump_interval:
+            self._last_dump = now
+            self.dump()
+
+    def reset(self):
+        with self._lock:
+            for h in self.histograms.values():
+                h.reset()
+            self._pending.clear()
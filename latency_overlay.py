@@ -0,0 +1,38 @@
+"""Overlay debug latensi di atas jendela GUI (tampil/sembunyi dengan F3)."""
+from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtGui import QKeySequence
+from PyQt5.QtWidgets import QLabel, QShortcut
+
+
+class LatencyOverlay(QLabel):
+    """Label semi-transparan di pojok kiri atas yang menampilkan p50/p99/max per tahap"""
+
+    def __init__(self, parent, tracker, key=Qt.Key_F3, interval_ms=500, extra_sources=()):
+        super().__init__(parent)
+        self.tracker = tracker
+        # Callable tambahan yang mengembalikan teks (mis. laporan RefreshScheduler)
+        self.extra_sources = list(extra_sources)
+        self.setStyleSheet("background-color: rgba(0, 0, 0, 180); color: #0f0; "
+                           "font-family: monospace; font-size: 12px; padding: 6px;")
+        self.setAttribute(Qt.WA_TransparentForMouseEvents)
+        self.hide()
+
+        self.shortcut = QShortcut(QKeySequence(key), parent)
+        self.shortcut.activated.connect(self.toggle)
+
+        # Timer tetap jalan saat overlay tersembunyi supaya dump JSON tetap berkala
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.refresh)
+        self.timer.start(interval_ms)
+
+    def toggle(self):
+        self.setVisible(not self.isVisible())
+        self.refresh()
+
+    def refresh(self):
+        self.tracker.maybe_dump()
+        if self.isVisible():
+            self.setText("\n\n".join([self.tracker.format_text()] + [source() for source in self.extra_sources]))
+            self.adjustSize()
+            self.move(8, 8)
+            self.raise_()
@@ -0,0 +1,175 @@
+"""Tampilan full-disclosure multi-lead: semua lead EKG dalam satu GraphicsObject.
+
+Sembilan PlotWidget dengan setData per frame terlalu berat untuk 60 fps. LeadGridItem
+menggambar seluruh grid (mis. 3x3 lead) sebagai satu item di satu ViewBox, langsung
+dari baris-baris `signal_buffer` (channel-major, lihat `Update UI PM`).
+
+Sumbu waktu dipecah menjadi segmen seperti SweepTrace. Untuk tiap kolom grid dan
+tiap segmen ada satu QPainterPath gabungan yang berisi potongan semua lead di kolom
+itu; antar lead dan di celah erase bar diputus lewat array `connect`. Saat kursor
+maju hanya path segmen yang kotor yang dibangun ulang, dan hanya persegi panjang
+segmen itu yang di-update sehingga repaint tetap kecil walau jumlah lead bertambah.
+"""
+import numpy as np
+import pyqtgraph as pg
+from PyQt5.QtCore import QRectF
+from PyQt5.QtGui import QPainterPath
+from PyQt5.QtWidgets import QGraphicsItem
+
+from decimation import decimate
+from sweep_renderer import dirty_segments
+
+
+class LeadGridItem(pg.GraphicsObject):
+    """Grid `cols` kolom berisi lead-lead dari satu buffer bersama, digambar dalam mode sweep"""
+
+    # Jarak antar sel relatif terhadap lebar/tinggi sel
+    COL_PAD = 0.05
+    ROW_PAD = 0.1
+
+    def __init__(self, buffer, channels, labels, x, y_range=(-1.5, 1.5), cols=3, pen=None,
+                 segment_len=None, gap=None, decimation='minmax'):
+        super().__init__()
+        self.buffer = buffer
+        self.channels = list(channels)
+        self.x = np.asarray(x, dtype=np.float64) - x[0]
+        self.n = len(x)
+        self.cols = cols
+        self.rows = -(-len(self.channels) // cols)
+        self.y_min, self.y_max = y_range
+        self.pen = pg.mkPen(pen if pen is not None else 'lime', width=1.5)
+        self.segment_len = max(64, -(-self.n // 64)) if segment_len is None else segment_len
+        self.gap = max(2, self.n // 100) if gap is None else gap
+        self.n_segments = -(-self.n // self.segment_len)
+        self.cursor = 0
+        self.decimation = decimation
+        self.bin_size = 1
+
+        self.cell_w = self.x[-1]
+        self.cell_h = self.y_max - self.y_min
+        self.step_x = self.cell_w * (1 + self.COL_PAD)
+        self.step_y = self.cell_h * (1 + self.ROW_PAD)
+        self._bounds = QRectF(0, 0, self.cols * self.step_x, self.rows * self.step_y)
+
+        # paths[c][k]: lead-lead kolom c pada segmen k
+        self.paths = [[QPainterPath() for _ in range(self.n_segments)] for _ in range(self.cols)]
+        self.rects = [[self._segment_rect(c, k) for k in range(self.n_segments)] for c in range(self.cols)]
+        self._dirty = set(range(self.n_segments))
+        # exposedRect dipakai untuk melewati path di luar area yang di-repaint
+        self.setFlag(QGraphicsItem.ItemUsesExtendedStyleOption)
+
+        for i, label in enumerate(labels):
+            r, c = divmod(i, self.cols)
+            text = pg.TextItem(label, color=self.pen.color(), anchor=(0, 0))
+            text.setParentItem(self)
+            text.setPos(c * self.step_x, (self.rows - r) * self.step_y - self.cell_h * self.ROW_PAD)
+
+    def _segment_rect(self, c, k):
+        start = k * self.segment_len
+        end = min(start + self.segment_len, self.n - 1)
+        # Sedikit lebih lebar dari segmen supaya tebal pen ikut terhapus
+        pad = 2 * (self.x[1] - self.x[0]) if self.n > 1 else 0.0
+        left = c * self.step_x + self.x[start] - pad
+        return QRectF(left, 0, self.x[end] - self.x[start] + 2 * pad, self.rows * self.step_y)
+
+    def boundingRect(self):
+        return self._bounds
+
+    def set_pixel_width(self, width):
+        """Ukuran bin dekimasi dari lebar ViewBox (pixel) dibagi jumlah kolom"""
+        bin_size = int(self.n * self.cols // max(width, 1)) if self.decimation else 1
+        if bin_size != self.bin_size:
+            self.bin_size = bin_size
+            self.invalidate()
+
+    def set_buffer(self, buffer):
+        self.buffer = buffer
+        self.invalidate()
+
+    def invalidate(self):
+        self._dirty = set(range(self.n_segments))
+
+    def advance(self, cursor, n_new):
+        """Kursor tulis pindah ke `cursor` setelah `n_new` sampel baru"""
+        old = self.cursor
+        self.cursor = cursor
+        if n_new <= 0:
+            return
+        dirty = dirty_segments(old, cursor, n_new, self.n, self.gap, self.segment_len)
+        if dirty is None:
+            self.invalidate()
+        else:
+            self._dirty.update(dirty)
+
+    def _build_path(self, c, k, gap_idx):
+        start = k * self.segment_len
+        end = min(start + self.segment_len + 1, self.n)
+        hole = gap_idx[(gap_idx >= start) & (gap_idx < end)] - start
+        xs, ys, conns = [], [], []
+        for r in range(self.rows):
+            i = r * self.cols + c
+            if i >= len(self.channels):
+                break
+            x = self.x[start:end]
+            y = self.buffer[self.channels[i], start:end].astype(np.float64)
+            y[hole] = np.nan
+            if self.bin_size > 2:
+                # Titik ujung mentah tetap ada supaya segmen menyambung dengan tetangganya
+                xd, yd = decimate(x[1:-1], y[1:-1], self.bin_size, self.decimation)
+                x = np.concatenate((x[:1], xd, x[-1:]))
+                y = np.concatenate((y[:1], yd, y[-1:]))
+            finite = np.isfinite(y)
+            # connect[j] = 1: titik j disambung ke j+1; putus di NaN dan di akhir tiap lead
+            conn = finite.copy()
+            conn[:-1] &= finite[1:]
+            conn[-1] = False
+            xs.append(x + c * self.step_x)
+            ys.append(np.clip(np.where(finite, y, self.y_min), self.y_min, self.y_max)
+                      - self.y_min + (self.rows - 1 - r) * self.step_y)
+            conns.append(conn)
+        if not xs:
+            return QPainterPath()
+        return pg.arrayToQPath(np.concatenate(xs), np.concatenate(ys),
+                               connect=np.concatenate(conns).astype(np.int32), finiteCheck=False)
+
+    def render(self):
+        """Bangun ulang path segmen kotor dan minta repaint area segmen itu saja"""
+        if not self._dirty:
+            return 0
+        gap_idx = (self.cursor + np.arange(self.gap)) % self.n
+        for k in self._dirty:
+            for c in range(self.cols):
+                self.paths[c][k] = self._build_path(c, k, gap_idx)
+                self.update(self.rects[c][k])
+        count = len(self._dirty)
+        self._dirty = set()
+        return count
+
+    def paint(self, p, option, widget=None):
+        exposed = option.exposedRect
+        p.setPen(self.pen)
+        for c in range(self.cols):
+            for rect, path in zip(self.rects[c], self.paths[c]):
+                if rect.intersects(exposed):
+                    p.drawPath(path)
+
+
+def create_lead_grid_widget(buffer, channels, labels, x, y_range=(-1.5, 1.5), cols=3, color='lime',
+                            decimation='minmax'):
+    """PlotWidget tanpa sumbu berisi satu LeadGridItem; return (widget, item)"""
+    plot = pg.PlotWidget()
+    plot.setBackground('black')
+    plot.hideAxis('bottom')
+    plot.hideAxis('left')
+    plot.setMouseEnabled(False, False)
+    plot.hideButtons()
+    grid = LeadGridItem(buffer, channels, labels, x, y_range, cols, color, decimation=decimation)
+    plot.addItem(grid)
+    bounds = grid.boundingRect()
+    plot.setXRange(bounds.left(), bounds.right(), padding=0.01)
+    plot.setYRange(bounds.top(), bounds.bottom(), padding=0.01)
+    if decimation:
+        view = plot.getViewBox()
+        view.sigResized.connect(lambda vb: grid.set_pixel_width(vb.width()))
+        grid.set_pixel_width(view.width())
+    return plot, grid
@@ -0,0 +1,204 @@
+"""Parser chunk untuk format baris ASCII lama dari Arduino.
+
+Daripada `ser.readline().decode().strip()` lalu `split`/`float` per sampel,
+parser ini mengambil semua byte yang sudah ada di `in_waiting`, memecah semua
+baris lengkap sekaligus dan mengubahnya menjadi array 2-D float dengan satu
+panggilan numpy. Baris parsial disimpan untuk chunk berikutnya, baris rusak
+dihitung (bukan raise).
+
+Format yang didukung:
+    TEKANAN        "Tekanan: 123.45 mmHg"               (NIBP System.py)
+    ECG_SPO2_RESP  "ECG:0.12,SpO2:0.98,RESP:0.50"       (PYTHONCODE.py)
+    PRESSURE_SMOOTHED "Pressure (mmHg): 123.4 | Smoothed: 120.1"  (Serial_Pythoncode.py)
+    MONITOR_16     "I,II,...,TEMP,sys\\dia"              (Update UI PM, NIBP dipecah jadi 2 kolom)
+
+MonitorStreamParser membungkus MONITOR_16 dan FrameDecoder: firmware monitor
+bisa mengirim teks atau frame biner, dipilih otomatis dari sync word.
+
+parse_nibp_result membaca hasil akhir firmware NIBP, baik satu baris
+"HASIL: Sistolik=120 mmHg, Diastolik=80 mmHg, BPM=72" maupun blok
+"=== HASIL NIBP ===" dari Print_Hasil.ino ("Sistolik  : 120.0 mmHg", ...);
+nibp_result_lines memotong baris hasil yang sudah lengkap.
+"""
+import io
+import re
+from collections import namedtuple
+
+import numpy as np
+
+from frame_protocol import MONITOR_COLUMNS, FRAME_SYNC_BYTES, FrameDecoder
+
+# values: array (n x n_fields), other: list (jumlah_sampel_sebelumnya, teks) untuk baris non-data
+ParsedChunk = namedtuple('ParsedChunk', ['values', 'other'])
+
+
+class LineFormat:
+    """Deskripsi satu format baris: prefix penanda, pola yang dibuang, jumlah kolom.
+
+    `anchored`: prefix harus di awal baris (setelah spasi), seperti `line.startswith` di
+    skrip asal; selain itu cukup muncul di mana saja di baris (`prefix in line`).
+    """
+
+    def __init__(self, name, n_fields, prefix=None, strip_pattern=None, separators=b'', anchored=False):
+        self.name = name
+        self.n_fields = n_fields
+        self.prefix = prefix
+        self.anchored = anchored
+        self.strip_re = re.compile(strip_pattern) if strip_pattern else None
+        # Separator tambahan yang diganti menjadi koma sebelum split
+        self.separators = separators
+
+
+TEKANAN = LineFormat('tekanan', 1, prefix=b'Tekanan:', strip_pattern=rb'Tekanan:|mmHg')
+# read_serial PYTHONCODE.py memakai line.startswith("ECG:"), dua format lain `in`
+ECG_SPO2_RESP = LineFormat('ecg_spo2_resp', 3, prefix=b'ECG:', strip_pattern=rb'[^,:\n]*:', anchored=True)
+PRESSURE_SMOOTHED = LineFormat('pressure_smoothed', 2, prefix=b'Pressure (mmHg):',
+                               strip_pattern=rb'Pressure \(mmHg\):|Smoothed:', separators=b'|')
+MONITOR_16 = LineFormat('monitor_16', len(MONITOR_COLUMNS), separators=b'\\')
+
+
+class ChunkParser:
+    """Parser stateful untuk satu stream serial.
+
+    Counter:
+        lines      jumlah baris data yang berhasil di-parse
+        malformed  baris data yang rusak (jumlah kolom salah / bukan angka)
+    """
+
+    # Baris tanpa newline yang lebih panjang dari ini dianggap sampah
+    MAX_LINE = 4096
+
+    def __init__(self, fmt, dtype=np.float64):
+        self.fmt = fmt
+        self.dtype = dtype
+        self.carry = b''
+        self.lines = 0
+        self.malformed = 0
+        self._sep_table = bytes.maketrans(fmt.separators, b',' * len(fmt.separators))
+
+    def read_from(self, ser):
+        """Ambil semua byte yang tersedia di port (minimal 1, blocking sampai timeout)"""
+        return self.feed(ser.read(max(1, ser.in_waiting)))
+
+    def feed(self, chunk):
+        data = self.carry + bytes(chunk)
+        cut = data.rfind(b'\n')
+        if cut < 0:
+            if len(data) > self.MAX_LINE:
+                self.malformed += 1
+                data = b''
+            self.carry = data
+            return self._empty()
+        self.carry = data[cut + 1:]
+
+        fmt = self.fmt
+        lines = data[:cut].replace(b'\r', b'').split(b'\n')
+        other = []
+        if fmt.prefix is not None:
+            matched = []
+            for line in lines:
+                if line.lstrip().startswith(fmt.prefix) if fmt.anchored else fmt.prefix in line:
+                    matched.append(line)
+                elif line.strip():
+                    other.append((len(matched), line.decode(errors='ignore').strip()))
+        else:
+            matched = [line for line in lines if line.strip()]
+        if not matched:
+            return ParsedChunk(self._empty().values, other)
+
+        # Semua transformasi teks dilakukan sekali untuk seluruh blok
+        text = b'\n'.join(matched)
+        if fmt.strip_re is not None:
+            text = fmt.strip_re.sub(b'', text)
+        if fmt.separators:
+            text = text.translate(self._sep_table)
+        rows = text.split(b'\n')
+
+        want = fmt.n_fields - 1
+        ok = [row.count(b',') == want for row in rows]
+        good = [row for row, k in zip(rows, ok) if k]
+        try:
+            values = self._convert(good)
+        except ValueError:
+            # Jalur lambat (jarang): cari baris dengan token bukan angka satu per satu
+            ok = [k and self._row_ok(row) for row, k in zip(rows, ok)]
+            good = [row for row, k in zip(rows, ok) if k]
+            values = self._convert(good)
+
+        n_bad = len(rows) - len(good)
+        if n_bad:
+            self.malformed += n_bad
+            # Indeks baris 'other' harus menunjuk ke jumlah sampel valid sebelumnya
+            if other:
+                valid_before = np.cumsum([0] + ok)
+                other = [(int(valid_before[i]), line) for i, line in other]
+        self.lines += len(values)
+        return ParsedChunk(values, other)
+
+    def _convert(self, rows):
+        if not rows:
+            return self._empty().values
+        # Parser C numpy (np.loadtxt) jauh lebih cepat dari float() per token
+        return np.loadtxt(io.BytesIO(b'\n'.join(rows)), delimiter=',', ndmin=2, comments=None, dtype=self.dtype)
+
+    def _row_ok(self, row):
+        try:
+            np.loadtxt(io.BytesIO(row), delimiter=',', ndmin=2, comments=None, dtype=self.dtype)
+            return True
+        except ValueError:
+            return False
+
+    def _empty(self):
+        return ParsedChunk(np.empty((0, self.fmt.n_fields), dtype=self.dtype), [])
+
+
+class MonitorStreamParser:
+    """Stream monitor 16-field: teks MONITOR_16 atau frame biner, dideteksi otomatis"""
+
+    def __init__(self):
+        self.decoder = FrameDecoder()
+        self.parser = ChunkParser(MONITOR_16)
+
+    def feed(self, chunk):
+        """Return array (n x 17) layout MONITOR_COLUMNS"""
+        if not self.decoder.locked:
+            carry = self.parser.carry
+            if carry.endswith(FRAME_SYNC_BYTES[:1]) and bytes(chunk[:1]) == FRAME_SYNC_BYTES[1:]:
+                # Sync word terpotong di batas chunk: byte pertamanya sudah masuk sisa baris teks
+                self.parser.carry = b''
+                chunk = carry + bytes(chunk)
+        if self.decoder.locked or FRAME_SYNC_BYTES in chunk:
+            # Firmware mengirim frame biner
+            return self.decoder.feed(chunk)
+        # Baris yang tidak valid hanya dihitung di parser.malformed
+        return self.parser.feed(chunk).values
+
+    @property
+    def malformed(self):
+        return self.parser.malformed + self.decoder.crc_errors
+
+
+_RESULT_FIELD = re.compile(r"(Sistolik|Diastolik|BPM)\s*[=:]\s*(-?\d+(?:\.\d+)?)")
+
+
+def parse_nibp_result(text):
+    """(sistolik, diastolik, bpm) dari baris/blok hasil NIBP; bpm None kalau tidak ada, None kalau bukan hasil"""
+    fields = {}
+    for name, value in _RESULT_FIELD.findall(text):
+        fields.setdefault(name, float(value))
+    if 'Sistolik' not in fields or 'Diastolik' not in fields:
+        return None
+    return fields['Sistolik'], fields['Diastolik'], fields.get('BPM')
+
+
+def nibp_result_lines(lines):
+    """Baris hasil NIBP yang sudah lengkap (mulai dari baris "HASIL"), None kalau belum.
+
+    Baris inline sudah lengkap sendiri; blok Print_Hasil.ino berakhir di garis "====" penutup.
+    """
+    if not lines:
+        return None
+    if parse_nibp_result(lines[0]) is not None:
+        return lines[:1]
+    end = next((k for k, line in enumerate(lines[1:], 1) if line and not line.strip('=')), None)
+    return None if end is None else lines[:end + 1]
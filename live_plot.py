@@ -0,0 +1,246 @@
+"""Plot tekanan live yang digambar ulang dengan frame rate tetap, terpisah dari laju sampel.
+
+`append()` hanya menyalin sampel ke buffer numpy; `redraw()` dipanggil timer
+(mis. 30 fps) dan hanya menggambar kalau ada data baru.
+
+    BlitLinePlot       matplotlib: background (axes, grid, label, legend) di-cache,
+                       tiap frame hanya artist garis yang digambar lalu di-blit.
+                       Draw penuh hanya saat data keluar dari batas sumbu atau canvas di-resize.
+                       Garis didekimasi min/max ke lebar axes dalam pixel; bin yang sudah
+                       penuh di-cache, jadi biaya frame tidak tumbuh dengan panjang rekaman.
+    PyqtgraphLinePlot  API yang sama dengan pyqtgraph (auto-range dimatikan,
+                       batas sumbu diatur dengan aturan yang sama, downsampling 'peak' bawaan)
+"""
+import numpy as np
+import matplotlib.pyplot as plt
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+
+from decimation import minmax_decimate
+
+
+class _LineBuffer:
+    """Buffer sampel yang tumbuh (kapasitas digandakan), plus min/max berjalan.
+    `x` (indeks sampel) ikut tumbuh bersama `y`, tidak dibuat ulang tiap frame"""
+
+    def __init__(self, capacity=4096):
+        self.y = np.zeros(capacity)
+        self.x = np.arange(capacity, dtype=np.float64)
+        self.n = 0
+        self.ymin = np.inf
+        self.ymax = -np.inf
+
+    def append(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        if not len(values):
+            return
+        need = self.n + len(values)
+        if need > len(self.y):
+            grown = np.zeros(max(need, 2 * len(self.y)))
+            grown[:self.n] = self.y[:self.n]
+            self.y = grown
+            self.x = np.arange(len(grown), dtype=np.float64)
+        self.y[self.n:need] = values
+        self.n = need
+        self.ymin = min(self.ymin, float(values.min()))
+        self.ymax = max(self.ymax, float(values.max()))
+
+    def clear(self):
+        self.n = 0
+        self.ymin, self.ymax = np.inf, -np.inf
+
+
+class _DecimatedLine:
+    """minmax_decimate inkremental: bin penuh dihitung sekali, bin terakhir (belum penuh) apa adanya"""
+
+    def __init__(self):
+        self.x = np.zeros(1024)
+        self.y = np.zeros(1024)
+        self.reset(1)
+
+    def reset(self, bin_size):
+        self.bin_size = bin_size
+        self.m = 0     # titik hasil dekimasi di cache
+        self.done = 0  # sampel yang sudah masuk bin penuh
+
+    def update(self, buf):
+        """Return (x, y) yang digambar untuk buffer `buf`"""
+        n, b = buf.n, self.bin_size
+        if n < self.done:
+            self.reset(b)
+        full = n // b * b if b > 2 else n
+        if full > self.done:
+            xs, ys = minmax_decimate(buf.x[self.done:full], buf.y[self.done:full], b)
+            need = self.m + len(ys)
+            if need > len(self.y):
+                size = max(need, 2 * len(self.y))
+                self.x = np.concatenate((self.x[:self.m], np.zeros(size - self.m)))
+                self.y = np.concatenate((self.y[:self.m], np.zeros(size - self.m)))
+            self.x[self.m:need] = xs
+            self.y[self.m:need] = ys
+            self.m = need
+            self.done = full
+        if full == n:
+            return self.x[:self.m], self.y[:self.m]
+        return (np.concatenate((self.x[:self.m], buf.x[full:n])),
+                np.concatenate((self.y[:self.m], buf.y[full:n])))
+
+
+def _expanded_limits(buf, xlim, ylim):
+    """Batas sumbu baru kalau data keluar dari batas sekarang, selain itu None"""
+    if buf.n <= xlim[1] and ylim[0] <= buf.ymin and buf.ymax <= ylim[1]:
+        return None
+    # Ruang kosong supaya autoscale jarang terjadi: x dua kali lipat, y +15%
+    x_hi = max(xlim[1], 1.0)
+    while x_hi < buf.n:
+        x_hi *= 2
+    span = max(buf.ymax - buf.ymin, 10.0)
+    y_lo = ylim[0] if buf.ymin >= ylim[0] else buf.ymin - 0.15 * span
+    y_hi = ylim[1] if buf.ymax <= ylim[1] else buf.ymax + 0.15 * span
+    return (0, x_hi), (y_lo, y_hi)
+
+
+class BlitLinePlot:
+    """Garis tekanan matplotlib dengan blitting"""
+
+    def __init__(self, title="Grafik Tekanan Real-time", xlabel="Sample", ylabel="mmHg",
+                 label="Tekanan (mmHg)", xlim=(0, 500), ylim=(0, 50)):
+        self.canvas = FigureCanvas(plt.Figure(figsize=(10, 4)))
+        self.widget = self.canvas
+        self.ax = self.canvas.figure.subplots()
+        self.labels = (title, xlabel, ylabel, label)
+        self.initial_limits = (xlim, ylim)
+        self.buffer = _LineBuffer()
+        self.decimated = _DecimatedLine()
+        self.background = None
+        self.dirty = False
+        self.full_draws = 0
+        self._setup_axes()
+        # Setiap draw penuh (termasuk resize) mengambil ulang background
+        self.canvas.mpl_connect('draw_event', self._on_draw)
+
+    def _setup_axes(self):
+        title, xlabel, ylabel, label = self.labels
+        self.ax.clear()
+        self.ax.set_title(title)
+        self.ax.set_xlabel(xlabel)
+        self.ax.set_ylabel(ylabel)
+        self.ax.grid(True)
+        # animated: garis tidak ikut draw penuh, hanya digambar saat blit
+        self.line, = self.ax.plot([], [], label=label, animated=True)
+        self.ax.legend()
+        self.ax.set_xlim(*self.initial_limits[0])
+        self.ax.set_ylim(*self.initial_limits[1])
+
+    def _on_draw(self, event):
+        self.background = self.canvas.copy_from_bbox(self.ax.bbox)
+        # Batas x atau ukuran canvas berubah: lebar bin (sampel per pixel) dihitung ulang
+        x_lo, x_hi = self.ax.get_xlim()
+        bin_size = max(1, int((x_hi - x_lo) / max(self.ax.bbox.width, 1.0)))
+        if bin_size != self.decimated.bin_size:
+            self.decimated.reset(bin_size)
+        self._draw_line()
+
+    def _draw_line(self):
+        self.line.set_data(*self.decimated.update(self.buffer))
+        self.ax.draw_artist(self.line)
+
+    def append(self, values):
+        self.buffer.append(values)
+        self.dirty = True
+
+    def reset(self):
+        self.buffer.clear()
+        self.decimated.reset(self.decimated.bin_size)
+        self._setup_axes()
+        self.full_draws += 1
+        self.canvas.draw()
+        self.dirty = False
+
+    def data(self):
+        return self.buffer.y[:self.buffer.n]
+
+    def redraw(self):
+        """Dipanggil timer frame; return True kalau ada yang digambar"""
+        if not self.dirty:
+            return False
+        self.dirty = False
+        limits = _expanded_limits(self.buffer, self.ax.get_xlim(), self.ax.get_ylim())
+        if limits is not None or self.background is None:
+            if limits is not None:
+                self.ax.set_xlim(*limits[0])
+                self.ax.set_ylim(*limits[1])
+            # Draw penuh; _on_draw menyimpan background dan menggambar garis
+            self.full_draws += 1
+            self.canvas.draw()
+            self.canvas.blit(self.ax.bbox)
+            return True
+        self.canvas.restore_region(self.background)
+        self._draw_line()
+        self.canvas.blit(self.ax.bbox)
+        return True
+
+
+class PyqtgraphLinePlot:
+    """Garis tekanan pyqtgraph dengan API yang sama dengan BlitLinePlot"""
+
+    def __init__(self, title="Grafik Tekanan Real-time", xlabel="Sample", ylabel="mmHg",
+                 label="Tekanan (mmHg)", xlim=(0, 500), ylim=(0, 50)):
+        # pyqtgraph opsional untuk NIBPGUI, jadi baru di-import kalau backend ini dipilih
+        import pyqtgraph as pg
+        self.widget = pg.PlotWidget(title=title)
+        self.widget.setBackground('w')
+        self.widget.setLabel('bottom', xlabel)
+        self.widget.setLabel('left', ylabel)
+        self.widget.showGrid(x=True, y=True)
+        self.widget.addLegend()
+        self.widget.disableAutoRange()
+        self.curve = self.widget.plot([], [], pen=pg.mkPen('#1f77b4', width=1.5), name=label)
+        # Min/max per pixel seperti BlitLinePlot, hanya bagian yang terlihat
+        self.curve.setDownsampling(auto=True, method='peak')
+        self.curve.setClipToView(True)
+        self.initial_limits = (xlim, ylim)
+        self.buffer = _LineBuffer()
+        self.dirty = False
+        self.full_draws = 0
+        self.reset()
+
+    def _set_limits(self, xlim, ylim):
+        self.widget.setXRange(*xlim, padding=0)
+        self.widget.setYRange(*ylim, padding=0)
+        self.limits = (xlim, ylim)
+
+    def append(self, values):
+        self.buffer.append(values)
+        self.dirty = True
+
+    def reset(self):
+        self.buffer.clear()
+        self.curve.setData([], [])
+        self._set_limits(*self.initial_limits)
+        self.dirty = False
+
+    def data(self):
+        return self.buffer.y[:self.buffer.n]
+
+    def redraw(self):
+        if not self.dirty:
+            return False
+        self.dirty = False
+        limits = _expanded_limits(self.buffer, *self.limits)
+        if limits is not None:
+            self.full_draws += 1
+            self._set_limits(*limits)
+        n = self.buffer.n
+        self.curve.setData(self.buffer.x[:n], self.buffer.y[:n])
+        return True
+
+
+LIVE_PLOT_BACKENDS = {'matplotlib': BlitLinePlot, 'pyqtgraph': PyqtgraphLinePlot}
+
+
+def create_live_plot(backend='matplotlib', **kwargs):
+    try:
+        cls = LIVE_PLOT_BACKENDS[backend]
+    except KeyError:
+        raise ValueError(f"Backend plot tidak dikenal: {backend} (pilihan: {', '.join(LIVE_PLOT_BACKENDS)})")
+    return cls(**kwargs)
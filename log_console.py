@@ -0,0 +1,49 @@
+"""Konsol log ringan: baris dikumpulkan di ring terbatas lalu ditulis ke widget per frame.
+
+QTextEdit.append per sampel menyimpan semua baris sebagai rich text dan makin
+lambat seiring log bertambah. LogConsole memakai QPlainTextEdit dengan
+maximumBlockCount (baris lama otomatis dibuang) dan menampung baris baru di
+deque berukuran sama; timer frame menulis semuanya dengan satu appendPlainText.
+"""
+from collections import deque
+
+from PyQt5.QtCore import QTimer
+from PyQt5.QtWidgets import QPlainTextEdit
+
+
+class LogConsole(QPlainTextEdit):
+    """Pengganti QTextEdit read-only untuk log; `append()` kompatibel"""
+
+    def __init__(self, max_lines=2000, flush_interval_ms=33, parent=None):
+        super().__init__(parent)
+        self.setReadOnly(True)
+        self.setMaximumBlockCount(max_lines)
+        self.pending = deque(maxlen=max_lines)
+        self.flush_timer = QTimer(self)
+        self.flush_timer.timeout.connect(self.flush)
+        self.flush_timer.start(flush_interval_ms)
+
+    def append(self, text):
+        self.pending.append(text)
+
+    def append_lines(self, lines):
+        self.pending.extend(lines)
+
+    def flush(self):
+        """Tulis semua baris yang tertunda sekaligus; dipanggil timer tiap frame"""
+        if not self.pending:
+            return
+        text = "\n".join(self.pending)
+        self.pending.clear()
+        self.appendPlainText(text)
+        # Ikuti baris terakhir
+        bar = self.verticalScrollBar()
+        bar.setValue(bar.maximum())
+
+    def clear(self):
+        self.pending.clear()
+        super().clear()
+
+    def toPlainText(self):
+        self.flush()
+        return super().toPlainText()
@@ -0,0 +1,295 @@
+"""Analisis NIBP batch tanpa GUI: ribuan rekaman nibp_data_*.csv sekaligus.
+
+Input berupa direktori (dicari rekursif dengan --pattern), glob, atau file.
+Setiap file dianalisis dengan BPAnalyzer.analyze_bp di process pool; hasil
+ditulis ke ringkasan begitu selesai (CSV per baris, atau JSON dengan daftar
+`results` yang ditulis bertahap lalu `failures` dan `summary` di akhir).
+Plot per file (opsional) dirender di worker dengan backend Agg. --fs memakai
+tahap detrend + band-pass BPAnalyzer (laju sampel deflasi dalam Hz).
+
+--algorithms menjalankan beberapa algoritma bp_analyzer.ALGORITHMS pada rekaman
+yang sama (file dibaca sekali per worker, satu baris per file per algoritma).
+Dengan --reference (CSV file,systolic,diastolic[,map], file dicocokkan lewat nama)
+setiap baris diberi selisih terhadap referensi dan ringkasan berisi MAE serta
+waktu rata-rata per algoritma.
+
+    python nibp_batch.py data/ -o hasil.csv
+    python nibp_batch.py "arsip/2025-*/nibp_data_*.csv" -o hasil.json --plots plots/ --workers 8
+    python nibp_batch.py data/ --fs 12.5 --algorithms all --reference referensi.csv -o banding.json
+
+Status per file:
+    ok         sistolik/diastolik/MAP berhasil dihitung
+    no_result  analyze_bp tidak menemukan >= 20 puncak valid
+    error      file tidak bisa dibaca / format tidak dikenal, atau analisis/plot
+               algoritma itu gagal (pesan di kolom error)
+"""
+import argparse
+import csv
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from bp_analyzer import ALGORITHMS, BPAnalyzer
+from nibp_io import load_pressure
+
+SUMMARY_FIELDS = ('file', 'algorithm', 'status', 'samples', 'systolic', 'diastolic', 'map', 'peaks',
+                  'valid_peaks', 'seconds', 'plot', 'error', 'err_systolic', 'err_diastolic', 'err_map')
+
+_analyzers = {}
+
+
+def expand_inputs(inputs, pattern='nibp_data_*.csv'):
+    """Direktori, glob dan file -> daftar path unik terurut"""
+    paths = []
+    for item in inputs:
+        if os.path.isdir(item):
+            paths.extend(glob.glob(os.path.join(item, '**', pattern), recursive=True))
+        elif glob.has_magic(item):
+            paths.extend(glob.glob(item, recursive=True))
+        else:
+            paths.append(item)
+    return sorted(set(os.path.normpath(p) for p in paths))
+
+
+def load_reference(path):
+    """CSV referensi -> {nama file: {'systolic', 'diastolic', 'map'}}"""
+    df = pd.read_csv(path)
+    missing = {'file', 'systolic', 'diastolic'} - set(df.columns)
+    if missing:
+        raise ValueError(f"kolom referensi tidak ada: {', '.join(sorted(missing))}")
+    reference = {}
+    for row in df.itertuples(index=False):
+        reference[os.path.basename(row.file)] = {'systolic': row.systolic, 'diastolic': row.diastolic,
+                                                 'map': getattr(row, 'map', None)}
+    return reference
+
+
+def render_plot(path, smoothed, peaks, MAP, systolic, diastolic, plot_dir, suffix=''):
+    """Simpan grafik seperti Filter & Detect NIBP.py ke plot_dir/<nama><suffix>.png"""
+    # Figure + canvas Agg langsung: tanpa pyplot, aman dipakai di proses worker tanpa display
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(12, 6))
+    FigureCanvasAgg(fig)
+    ax = fig.subplots()
+    ax.plot(smoothed, label='Tekanan (smoothed)', color='blue')
+    ax.plot(peaks, smoothed[peaks], "rx", label="Puncak Osilasi")
+    ax.axhline(y=MAP, color='green', linestyle='--', label=f'MAP ~ {MAP:.1f} mmHg')
+    ax.axhline(y=systolic, color='red', linestyle='--', label=f'Sistolik ~ {systolic:.1f} mmHg')
+    ax.axhline(y=diastolic, color='purple', linestyle='--', label=f'Diastolik ~ {diastolic:.1f} mmHg')
+    ax.set_title(f"Analisis Tekanan Darah (Deflasi) - {os.path.basename(path)}")
+    ax.set_xlabel("Sample Index")
+    ax.set_ylabel("Tekanan (mmHg)")
+    ax.legend()
+    ax.grid(True)
+    out = os.path.join(plot_dir, os.path.splitext(os.path.basename(path))[0] + suffix + '.png')
+    fig.savefig(out, dpi=80)
+    return out
+
+
+def _analyzer(fs, algorithm):
+    key = (fs, algorithm)
+    if key not in _analyzers:
+        _analyzers[key] = BPAnalyzer(fs=fs, algorithm=algorithm)
+    return _analyzers[key]
+
+
+def analyze_file(path, plot_dir=None, fs=None, algorithms=('peak_index',), expected=None):
+    """Dijalankan di worker; return satu baris ringkasan (dict SUMMARY_FIELDS) per algoritma.
+
+    `expected` = baris referensi file ini (dict systolic/diastolic/map) atau None.
+    Exception di satu algoritma (analisis atau plot) hanya membuat baris itu 'error'.
+    `seconds` berisi waktu analyze_bp algoritma itu saja (tanpa baca file dan plot)."""
+    rows = []
+    for algorithm in algorithms:
+        row = dict.fromkeys(SUMMARY_FIELDS)
+        row.update(file=path, algorithm=algorithm)
+        rows.append(row)
+    try:
+        pressure = load_pressure(path)
+    except (OSError, ValueError, pd.errors.ParserError) as e:
+        for row in rows:
+            row.update(status='error', error=str(e))
+        return rows
+
+    for row in rows:
+        row['samples'] = len(pressure)
+        try:
+            _analyze_row(row, path, pressure, plot_dir, fs, expected, suffix=len(rows) > 1)
+        except Exception as e:
+            row.update(status='error', error=f"{type(e).__name__}: {e}")
+    return rows
+
+
+def _analyze_row(row, path, pressure, plot_dir, fs, expected, suffix):
+    t0 = time.perf_counter()
+    smoothed, peaks, MAP, systolic, diastolic, valid_peaks = _analyzer(fs, row['algorithm']).analyze_bp(pressure)
+    row['seconds'] = round(time.perf_counter() - t0, 5)
+    if smoothed is None:
+        row['status'] = 'no_result'
+        return
+    row.update(status='ok', systolic=round(float(systolic), 2), diastolic=round(float(diastolic), 2),
+               map=round(float(MAP), 2), peaks=len(peaks), valid_peaks=len(valid_peaks))
+    if expected:
+        for key in ('systolic', 'diastolic', 'map'):
+            if expected[key] is not None and not pd.isna(expected[key]):
+                row['err_' + key] = round(row[key] - float(expected[key]), 2)
+    if plot_dir:
+        row['plot'] = render_plot(path, smoothed, peaks, MAP, systolic, diastolic, plot_dir,
+                                  f"_{row['algorithm']}" if suffix else '')
+
+
+def _analyze_args(args):
+    return analyze_file(*args)
+
+
+def run_batch(paths, workers=None, plot_dir=None, chunksize=None, fs=None, algorithms=('peak_index',),
+              reference=None):
+    """Generator daftar baris ringkasan per file (urutan sama dengan paths)"""
+    # Tiap task hanya membawa baris referensi file itu, bukan seluruh dict referensi
+    reference = reference or {}
+    tasks = [(p, plot_dir, fs, algorithms, reference.get(os.path.basename(p))) for p in paths]
+    if workers == 1:
+        yield from map(_analyze_args, tasks)
+        return
+    workers = workers or os.cpu_count() or 1
+    # Potongan besar mengurangi overhead IPC; tetap cukup kecil supaya semua worker kebagian
+    chunksize = chunksize or max(1, min(64, len(paths) // (workers * 4)))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(_analyze_args, tasks, chunksize=chunksize)
+
+
+# --- Ringkasan ---
+class CsvSummary:
+    def __init__(self, path):
+        self.file = open(path, 'w', newline='')
+        self.writer = csv.DictWriter(self.file, fieldnames=SUMMARY_FIELDS)
+        self.writer.writeheader()
+
+    def write(self, row):
+        self.writer.writerow(row)
+
+    def close(self, failures, summary):
+        self.file.close()
+
+
+class JsonSummary:
+    """{"results": [...], "failures": [...], "summary": {...}}; results ditulis bertahap"""
+
+    def __init__(self, path):
+        self.file = open(path, 'w')
+        self.file.write('{"results": [\n')
+        self.count = 0
+
+    def write(self, row):
+        self.file.write((',\n' if self.count else '') + json.dumps(row))
+        self.count += 1
+
+    def close(self, failures, summary):
+        self.file.write('\n],\n"failures": ' + json.dumps(failures, indent=2))
+        self.file.write(',\n"summary": ' + json.dumps(summary, indent=2) + '\n}\n')
+        self.file.close()
+
+
+class AlgorithmStats:
+    """Jumlah status, waktu dan MAE terhadap referensi per algoritma"""
+
+    def __init__(self):
+        self.counts = {'ok': 0, 'no_result': 0, 'error': 0}
+        self.seconds = []
+        self.errors = {'systolic': [], 'diastolic': [], 'map': []}
+
+    def add(self, row):
+        self.counts[row['status']] += 1
+        if row['status'] != 'error':
+            self.seconds.append(row['seconds'])
+        for key, values in self.errors.items():
+            if row['err_' + key] is not None:
+                values.append(abs(row['err_' + key]))
+
+    def summary(self):
+        out = dict(self.counts)
+        out['mean_ms'] = round(float(np.mean(self.seconds)) * 1000.0, 3) if self.seconds else None
+        for key, values in self.errors.items():
+            out['mae_' + key] = round(float(np.mean(values)), 2) if values else None
+        out['n_reference'] = len(self.errors['systolic'])
+        return out
+
+
+def open_summary(path):
+    if path.lower().endswith('.json'):
+        return JsonSummary(path)
+    return CsvSummary(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Analisis NIBP batch untuk banyak rekaman CSV")
+    parser.add_argument('inputs', nargs='+', help="direktori, glob, atau file CSV")
+    parser.add_argument('-o', '--output', default='nibp_batch_summary.csv', help="ringkasan .csv atau .json")
+    parser.add_argument('--pattern', default='nibp_data_*.csv', help="pola file untuk input direktori")
+    parser.add_argument('--workers', type=int, default=None, help="jumlah proses (default: jumlah CPU, 1 = tanpa pool)")
+    parser.add_argument('--plots', metavar='DIR', help="simpan grafik per file ke direktori ini")
+    parser.add_argument('--fs', type=float, default=None,
+                        help="laju sampel deflasi (Hz) untuk analisis band-pass (default: moving average lama)")
+    parser.add_argument('--algorithms', nargs='+', default=['peak_index'], metavar='NAMA',
+                        help=f"algoritma yang dibandingkan: {', '.join(ALGORITHMS)} atau all")
+    parser.add_argument('--reference', help="CSV file,systolic,diastolic[,map] untuk menghitung error")
+    args = parser.parse_args()
+
+    algorithms = list(ALGORITHMS) if args.algorithms == ['all'] else args.algorithms
+    unknown = [a for a in algorithms if a not in ALGORITHMS]
+    if unknown:
+        parser.error(f"algoritma tidak dikenal: {', '.join(unknown)} (pilihan: {', '.join(ALGORITHMS)}, all)")
+    paths = expand_inputs(args.inputs, args.pattern)
+    if not paths:
+        parser.error("tidak ada file yang cocok")
+    if args.plots:
+        os.makedirs(args.plots, exist_ok=True)
+    reference = load_reference(args.reference) if args.reference else None
+
+    summary_file = open_summary(args.output)
+    stats = {a: AlgorithmStats() for a in algorithms}
+    failures = []
+    t0 = time.perf_counter()
+    batches = run_batch(paths, args.workers, args.plots, fs=args.fs, algorithms=algorithms, reference=reference)
+    for i, rows in enumerate(batches, 1):
+        for row in rows:
+            summary_file.write(row)
+            stats[row['algorithm']].add(row)
+            if row['status'] != 'ok':
+                failures.append({'file': row['file'], 'algorithm': row['algorithm'], 'status': row['status'],
+                                 'error': row['error']})
+        if i % 100 == 0 or i == len(paths):
+            elapsed = time.perf_counter() - t0
+            print(f"\r{i}/{len(paths)} file, {i / elapsed:.1f} file/s", end='', file=sys.stderr)
+    elapsed = time.perf_counter() - t0
+    print(file=sys.stderr)
+
+    summary = {'files': len(paths), 'seconds': round(elapsed, 3), 'files_per_s': round(len(paths) / elapsed, 2),
+               'workers': args.workers or os.cpu_count(), 'fs': args.fs,
+               'algorithms': {a: s.summary() for a, s in stats.items()}}
+    summary_file.close(failures, summary)
+
+    print(f"{len(paths)} file dalam {elapsed:.2f} s ({summary['files_per_s']:.1f} file/s)")
+    for algorithm, result in summary['algorithms'].items():
+        line = (f"  {algorithm:<15} {result['ok']} ok, {result['no_result']} tanpa hasil, {result['error']} error, "
+                f"rata-rata {result['mean_ms']} ms")
+        if result['n_reference']:
+            line += (f" | MAE sistolik {result['mae_systolic']} diastolik {result['mae_diastolic']} "
+                     f"MAP {result['mae_map']} mmHg ({result['n_reference']} referensi)")
+        print(line)
+    for failure in failures:
+        print(f"  [{failure['status']}] {failure['algorithm']} {failure['file']}"
+              + (f": {failure['error']}" if failure['error'] else ""))
+    print(f"Ringkasan: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
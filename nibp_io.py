@@ -0,0 +1,25 @@
+"""Baca kolom tekanan dari rekaman CSV NIBP (dipakai nibp_batch dan analysis_jobs).
+
+    nibp_data_*.csv     Time,RAW,mmHg                              (NIBPGUI.start_serial)
+    pressure_log_*.csv  Timestamp,Pressure_mmHg,Smoothed_mmHg      (Serial_Pythoncode.py)
+"""
+import numpy as np
+import pandas as pd
+
+# Kolom tekanan yang dikenali, urut prioritas (sama dengan replay_source.RECORDING_FORMATS)
+PRESSURE_COLUMNS = ('mmHg', 'Pressure_mmHg')
+
+
+def pressure_column(header):
+    """Nama kolom tekanan di header CSV; ValueError kalau tidak ada satu pun"""
+    column = next((c for c in PRESSURE_COLUMNS if c in header), None)
+    if column is None:
+        accepted = ' atau '.join(f"'{c}'" for c in PRESSURE_COLUMNS)
+        raise ValueError(f"File CSV harus memiliki kolom {accepted} (kolom: {', '.join(map(str, header))})")
+    return column
+
+
+def load_pressure(path):
+    """Kolom tekanan (mmHg) dari nibp_data_*.csv atau pressure_log_*.csv"""
+    column = pressure_column(pd.read_csv(path, nrows=0).columns)
+    return pd.read_csv(path, usecols=[column])[column].to_numpy(dtype=np.float64)
@@ -0,0 +1,100 @@
+"""Penjadwal refresh GUI: satu timer frame, tiap elemen tampilan punya laju sendiri.
+
+Gelombang digambar tiap frame, angka vital cukup 1-2 Hz dan jam 1 Hz; daripada
+semua dijalankan oleh satu QTimer 10 ms, setiap elemen didaftarkan dengan
+`add(nama, callback, rate_hz)` dan hanya dipanggil kalau periodenya sudah lewat.
+Waktu eksekusi tiap elemen dicatat sehingga `report()` bisa menunjukkan berapa
+persen budget frame yang dipakai masing-masing.
+
+`update_text(label, teks)` memanggil setText hanya kalau teksnya berubah.
+"""
+import time
+
+from PyQt5.QtCore import QTimer
+
+
+def update_text(label, text):
+    """setText hanya kalau teks berbeda dari yang terakhir ditampilkan; return True kalau berubah"""
+    if getattr(label, '_shown_text', None) == text:
+        return False
+    label.setText(text)
+    label._shown_text = text
+    return True
+
+
+class _Task:
+    def __init__(self, name, callback, rate_hz):
+        self.name = name
+        self.callback = callback
+        self.period = 0.0 if rate_hz is None else 1.0 / rate_hz
+        self.rate_hz = rate_hz
+        self.next_due = 0.0
+        self.calls = 0
+        self.total = 0.0
+        self.max = 0.0
+
+
+class RefreshScheduler:
+    """Timer frame tunggal yang menjalankan elemen sesuai lajunya masing-masing"""
+
+    def __init__(self, fps=60, parent=None):
+        self.fps = fps
+        self.budget = 1.0 / fps
+        self.tasks = []
+        self.frames = 0
+        self.timer = QTimer(parent)
+        self.timer.timeout.connect(self.tick)
+
+    def add(self, name, callback, rate_hz=None):
+        """Daftarkan elemen; rate_hz None = setiap frame"""
+        self.tasks.append(_Task(name, callback, rate_hz))
+
+    def start(self):
+        self.timer.start(int(round(1000 / self.fps)))
+
+    def stop(self):
+        self.timer.stop()
+
+    def set_fps(self, fps):
+        """Ganti laju frame (mis. mode hemat daya); timer yang sedang jalan langsung pakai interval baru"""
+        self.fps = fps
+        self.budget = 1.0 / fps
+        if self.timer.isActive():
+            self.timer.start(int(round(1000 / fps)))
+
+    def tick(self):
+        now = time.monotonic()
+        self.frames += 1
+        for task in self.tasks:
+            if now < task.next_due:
+                continue
+            # Jadwal berikutnya dari waktu sekarang: frame yang terlambat tidak menumpuk panggilan
+            task.next_due = now + task.period
+            t0 = time.perf_counter()
+            task.callback()
+            dt = time.perf_counter() - t0
+            task.calls += 1
+            task.total += dt
+            task.max = max(task.max, dt)
+
+    def report(self):
+        """Per elemen: laju, jumlah panggilan, rata-rata/max ms, dan % budget frame rata-rata"""
+        frames = max(self.frames, 1)
+        return {t.name: {
+            'rate_hz': t.rate_hz or self.fps,
+            'calls': t.calls,
+            'mean_ms': round(t.total / t.calls * 1000.0, 3) if t.calls else 0.0,
+            'max_ms': round(t.max * 1000.0, 3),
+            'budget_pct': round(t.total / frames / self.budget * 100.0, 2),
+        } for t in self.tasks}
+
+    def format_text(self):
+        lines = [f"{'elemen':<10}{'Hz':>6}{'mean':>9}{'max':>9}{'budget':>9}"]
+        for name, r in self.report().items():
+            lines.append(f"{name:<10}{r['rate_hz']:>6g}{r['mean_ms']:>9.2f}{r['max_ms']:>9.2f}{r['budget_pct']:>8.1f}%")
+        return "\n".join(lines)
+
+    def reset_stats(self):
+        self.frames = 0
+        for task in self.tasks:
+            task.calls, task.total, task.max = 0, 0.0, 0.0
@@ -0,0 +1,76 @@
+"""Backend render untuk PlotWidget gelombang: raster (QPainter) atau OpenGL, dengan fallback.
+
+pyqtgraph >= 0.13 menggambar PlotCurveItem langsung dengan OpenGL (shader + VBO
+lewat QtOpenGL, tanpa PyOpenGL) kalau viewport GraphicsView-nya QOpenGLWidget.
+Rasterisasi garis pindah dari CPU ke GPU.
+
+Belum terukur: perbandingan OpenGL vs raster belum pernah dijalankan di mesin
+dengan GL (di mesin build context GL tidak bisa dibuat), jadi tidak ada angka
+yang menunjukkan OpenGL lebih cepat, termasuk di layar 1820x960 PC bedside.
+Karena itu default tetap 'raster' (useOpenGL mati); 'opengl' baru layak jadi
+default setelah bagian render_backend di benchmarks/run_benchmarks.py
+menunjukkan hasilnya di perangkat target.
+
+Ketersediaan OpenGL dicek sekali per proses: context harus bisa dibuat dan
+di-makeCurrent pada QOffscreenSurface. Kalau gagal (tanpa driver, platform
+offscreen, remote desktop, ...) plot tetap raster dan alasannya dicetak sekali.
+
+Untuk pengujian tanpa GPU, pakai Mesa software rendering (llvmpipe):
+
+    LIBGL_ALWAYS_SOFTWARE=1 python "Update UI PM"
+    LIBGL_ALWAYS_SOFTWARE=1 xvfb-run -s "-screen 0 1920x1080x24" \\
+        python benchmarks/run_benchmarks.py --only render_backend
+"""
+from PyQt5.QtGui import QOffscreenSurface, QOpenGLContext
+
+RENDER_BACKENDS = ('raster', 'opengl')
+# Jalur GL PlotCurveItem butuh minimal OpenGL 2.0 / OpenGL ES 2.0
+_MIN_GL_VERSION = (2, 0)
+_GL_RENDERER = 0x1F01
+
+_gl_status = None
+_fallback_reported = False
+
+
+def opengl_status():
+    """(tersedia, keterangan); keterangan berisi renderer GL atau alasan gagal. Butuh QApplication"""
+    global _gl_status
+    if _gl_status is not None:
+        return _gl_status
+    context = QOpenGLContext()
+    if not context.create():
+        _gl_status = (False, "QOpenGLContext tidak bisa dibuat")
+        return _gl_status
+    surface = QOffscreenSurface()
+    surface.setFormat(context.format())
+    surface.create()
+    if not context.makeCurrent(surface):
+        _gl_status = (False, "makeCurrent gagal")
+        return _gl_status
+    version = context.format().version()
+    try:
+        renderer = context.functions().glGetString(_GL_RENDERER) or "?"
+    except (AttributeError, TypeError):
+        renderer = "?"
+    context.doneCurrent()
+    if version < _MIN_GL_VERSION:
+        _gl_status = (False, f"OpenGL {version[0]}.{version[1]} terlalu lama ({renderer})")
+    else:
+        _gl_status = (True, f"OpenGL {version[0]}.{version[1]} {'ES ' if context.isOpenGLES() else ''}({renderer})")
+    return _gl_status
+
+
+def apply_render_backend(view, backend='raster'):
+    """Pasang backend pada GraphicsView/PlotWidget; return backend yang benar-benar aktif"""
+    global _fallback_reported
+    if backend not in RENDER_BACKENDS:
+        raise ValueError(f"Backend render tidak dikenal: {backend} (pilihan: {', '.join(RENDER_BACKENDS)})")
+    if backend == 'opengl':
+        available, info = opengl_status()
+        if available:
+            view.useOpenGL(True)
+            return 'opengl'
+        if not _fallback_reported:
+            print(f"OpenGL tidak tersedia ({info}), kembali ke raster")
+            _fallback_reported = True
+    return 'raster'
@@ -0,0 +1,174 @@
+"""Putar ulang rekaman CSV ke jalur sinyal yang sama dengan SerialReader.
+
+Format yang dikenali (dari header):
+    nibp_data_*.csv     Time,RAW,mmHg                              (NIBPGUI.start_serial)
+    pressure_log_*.csv  Timestamp,Pressure_mmHg,Smoothed_mmHg      (Serial_Pythoncode.py)
+
+Timestamp di kedua file hanya beresolusi detik (%H:%M:%S), jadi sampel yang
+jatuh di detik yang sama disebar merata di dalam detik itu. Kecepatan putar:
+1.0 = real time, N = N kali lebih cepat, 0 = secepat mungkin (untuk mengukur
+kapan GUI/analyzer mulai tertinggal).
+
+Contoh (tanpa GUI):
+    python replay_source.py nibp_data_20250101_101500.csv --speed 0
+"""
+import argparse
+import os
+import re
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from synthetic import RAW_ZERO, MMHG_PER_COUNT
+
+# Kolom (waktu, raw, mmHg) per format; raw None = dihitung dari mmHg seperti SerialReader
+RECORDING_FORMATS = (
+    ('Time', 'RAW', 'mmHg'),
+    ('Timestamp', None, 'Pressure_mmHg'),
+)
+
+
+class Recording:
+    """Satu rekaman: offset waktu (detik dari sampel pertama) dan blok (n x 2) [raw, mmHg]"""
+
+    def __init__(self, path, offsets, block, start):
+        self.path = path
+        self.offsets = offsets
+        self.block = block
+        self.start = start  # timestamp epoch sampel pertama
+
+    def __len__(self):
+        return len(self.block)
+
+    @property
+    def duration(self):
+        return float(self.offsets[-1]) if len(self.offsets) else 0.0
+
+
+def _spread_seconds(seconds):
+    """Detik (resolusi 1 s, boleh lewat tengah malam) -> offset monoton dengan sampel disebar per detik"""
+    seconds = np.asarray(seconds, dtype=np.float64)
+    # Lewat tengah malam: tambah 24 jam setiap kali waktu mundur
+    wraps = np.concatenate(([0], np.cumsum(np.diff(seconds) < 0)))
+    seconds = seconds + wraps * 86400.0
+    _, first, inverse, counts = np.unique(seconds, return_index=True, return_inverse=True, return_counts=True)
+    rank = np.arange(len(seconds)) - first[inverse]
+    offsets = seconds + rank / counts[inverse]
+    return offsets - offsets[0] if len(offsets) else offsets
+
+
+def load_recording(path):
+    """Baca nibp_data_*.csv atau pressure_log_*.csv, return Recording"""
+    df = pd.read_csv(path)
+    for time_col, raw_col, mmhg_col in RECORDING_FORMATS:
+        if time_col in df.columns and mmhg_col in df.columns:
+            break
+    else:
+        raise ValueError(f"Format CSV tidak dikenal: {os.path.basename(path)} (kolom: {', '.join(df.columns)})")
+
+    mmhgs = df[mmhg_col].to_numpy(dtype=np.float64)
+    if raw_col is not None and raw_col in df.columns:
+        raws = df[raw_col].to_numpy(dtype=np.float64)
+    else:
+        raws = np.floor((mmhgs / MMHG_PER_COUNT) + RAW_ZERO)
+    seconds = pd.to_timedelta(df[time_col].astype(str)).dt.total_seconds().to_numpy()
+    offsets = _spread_seconds(seconds)
+
+    # Tanggal dari nama file (..._YYYYmmdd_HHMMSS.csv), selain itu hari ini
+    match = re.search(r'(\d{8})_\d{6}', os.path.basename(path))
+    day = datetime.strptime(match.group(1), '%Y%m%d') if match else datetime.now()
+    day = day.replace(hour=0, minute=0, second=0, microsecond=0)
+    start = day.timestamp() + (seconds[0] if len(seconds) else 0.0)
+    return Recording(path, offsets, np.column_stack((raws, mmhgs)), start)
+
+
+def replay_batches(recording, speed=1.0, interval=0.05, max_samples=4096, running=lambda: True):
+    """Yield (timestamps, blok) sesuai jadwal rekaman.
+
+    speed > 0: tiap `interval` detik dinding, lepas semua sampel yang sudah jatuh tempo.
+    speed = 0: lepas blok `max_samples` tanpa jeda. Timestamp = waktu asli rekaman.
+    """
+    offsets, block = recording.offsets, recording.block
+    n = len(block)
+    i = 0
+    t0 = time.monotonic()
+    while i < n and running():
+        if speed > 0:
+            due = (time.monotonic() - t0) * speed
+            j = int(np.searchsorted(offsets, due, side='right'))
+            j = min(j, i + max_samples)
+            if j == i:
+                # Tidur sampai sampel berikutnya, paling lama satu interval
+                wait = (offsets[i] - due) / speed
+                time.sleep(min(max(wait, 0.0), interval))
+                continue
+        else:
+            j = min(n, i + max_samples)
+        yield recording.start + offsets[i:j], block[i:j]
+        i = j
+        if speed > 0 and i < n:
+            time.sleep(interval)
+
+
+class ReplayReader(QThread):
+    """Pengganti SerialReader: sinyal dan isi sama, sumbernya file CSV"""
+    data_received = pyqtSignal(object, object)
+    done = pyqtSignal(str)
+
+    def __init__(self, path, speed=1.0, batch_interval_ms=50):
+        super().__init__()
+        self.path = path
+        self.speed = speed
+        self.batch_interval_ms = batch_interval_ms
+        self.running = False
+        # Keterlambatan terbesar thread terhadap jadwal rekaman (detik rekaman)
+        self.max_lag = 0.0
+
+    def run(self):
+        try:
+            recording = load_recording(self.path)
+        except Exception as e:
+            self.done.emit(f"Gagal membaca rekaman: {e}")
+            return
+
+        self.running = True
+        t_start = time.monotonic()
+        sent = 0
+        for times, block in replay_batches(recording, self.speed, self.batch_interval_ms / 1000.0,
+                                           running=lambda: self.running):
+            if self.speed > 0:
+                lag = (time.monotonic() - t_start) * self.speed - (times[-1] - recording.start)
+                self.max_lag = max(self.max_lag, lag)
+            self.data_received.emit(times, block)
+            sent += len(block)
+
+        elapsed = time.monotonic() - t_start
+        rate = sent / elapsed if elapsed > 0 else float('inf')
+        self.done.emit(f"Replay selesai: {sent}/{len(recording)} sampel dari "
+                       f"{os.path.basename(self.path)} dalam {elapsed:.2f} s ({rate:.0f} sampel/s)")
+
+    def stop(self):
+        self.running = False
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Putar ulang rekaman NIBP tanpa GUI dan ukur throughput")
+    parser.add_argument('path')
+    parser.add_argument('--speed', type=float, default=0.0, help="kelipatan real time, 0 = secepat mungkin")
+    args = parser.parse_args()
+
+    recording = load_recording(args.path)
+    t0 = time.monotonic()
+    batches = sent = 0
+    for _, block in replay_batches(recording, args.speed):
+        batches += 1
+        sent += len(block)
+    elapsed = time.monotonic() - t0
+    print(f"{sent} sampel ({recording.duration:.1f} s rekaman) dalam {batches} batch, {elapsed:.3f} s")
+
+
+if __name__ == '__main__':
+    main()
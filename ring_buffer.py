@@ -0,0 +1,114 @@
+"""Ring buffer single-producer/single-consumer untuk sampel multi-kanal.
+
+Thread serial (producer) menulis blok sampel langsung ke array yang sudah
+dialokasikan; timer display (consumer) mengambil semua sampel baru setiap
+frame. Posisi tulis dan baca adalah counter monoton terpisah (int64) sehingga
+kedua sisi tidak pernah berebut satu kursor. Tidak ada lock: hanya producer
+yang menulis `write_pos`, hanya consumer yang menulis `read_pos`, dan
+`write_pos` baru dipublikasikan setelah data selesai disalin (per potongan
+`guard` sampel, sehingga blok besar tidak bisa merobek data yang sedang dibaca).
+
+Counter:
+    overruns   sampel yang tertimpa sebelum sempat dibaca (consumer terlalu lambat)
+    underruns  pembacaan yang tidak menemukan sampel baru (producer terlambat)
+"""
+import numpy as np
+
+# Slot header
+_WRITE, _READ, _OVERRUN, _UNDERRUN = range(4)
+HEADER_SLOTS = 4
+
+
+class SPSCRingBuffer:
+    """Ring buffer (capacity x n_channels) float32 dengan timestamp per sampel"""
+
+    def __init__(self, n_channels, capacity, dtype=np.float32, header=None, data=None, times=None):
+        self.n_channels = n_channels
+        self.capacity = capacity
+        # header/data/times bisa diberikan dari luar (mis. shared memory)
+        self.header = np.zeros(HEADER_SLOTS, dtype=np.int64) if header is None else header
+        self.data = np.zeros((capacity, n_channels), dtype=dtype) if data is None else data
+        self.times = np.zeros(capacity, dtype=np.float64) if times is None else times
+        # Sampel tertua sebanyak `guard` dianggap tidak aman dibaca karena bisa sedang
+        # ditimpa oleh write yang belum dipublikasikan
+        self.guard = capacity // 8
+
+    # --- Producer ---
+    def write(self, rows, t=0.0):
+        """Tulis blok (n x n_channels). `t` boleh skalar atau array per sampel.
+
+        Blok dipecah per `guard` sampel dan tiap potongan langsung dipublikasikan, jadi
+        bagian yang sedang ditimpa tidak pernah lebih dari `guard` (batas deteksi di read).
+        """
+        n = len(rows)
+        if n == 0:
+            return
+        w = int(self.header[_WRITE])
+        step = max(1, self.guard)
+        for i in range(0, n, step):
+            chunk = rows[i:i + step]
+            self._copy(w + i, chunk, t[i:i + step] if np.ndim(t) else t)
+            self.header[_WRITE] = w + i + len(chunk)
+
+    def _copy(self, pos, rows, t):
+        cap = self.capacity
+        m = len(rows)
+        start = pos % cap
+        first = min(m, cap - start)
+        self.data[start:start + first] = rows[:first]
+        self.data[:m - first] = rows[first:]
+        if np.ndim(t):
+            self.times[start:start + first] = t[:first]
+            self.times[:m - first] = t[first:]
+        else:
+            self.times[start:start + first] = t
+            self.times[:m - first] = t
+
+    # --- Consumer ---
+    def read(self, max_rows=None):
+        """Ambil semua sampel baru, return (times, rows) berupa salinan"""
+        cap = self.capacity
+        w = int(self.header[_WRITE])
+        r = int(self.header[_READ])
+        avail = w - r
+        if avail <= 0:
+            self.header[_UNDERRUN] += 1
+            return self.times[:0].copy(), self.data[:0].copy()
+        safe = cap - self.guard
+        if avail > safe:
+            self.header[_OVERRUN] += avail - safe
+            r = w - safe
+            avail = safe
+        if max_rows is not None and avail > max_rows:
+            avail = max_rows
+        end = r + avail
+
+        idx = np.arange(r, end) % cap
+        rows = self.data[idx]
+        times = self.times[idx]
+
+        # Producer bisa saja menimpa bagian tertua selama kita menyalin
+        w_after = int(self.header[_WRITE])
+        torn = w_after + self.guard - cap - r
+        if torn > 0:
+            torn = min(torn, avail)
+            self.header[_OVERRUN] += torn
+            rows, times = rows[torn:], times[torn:]
+
+        self.header[_READ] = end
+        return times, rows
+
+    def available(self):
+        return max(0, min(int(self.header[_WRITE] - self.header[_READ]), self.capacity - self.guard))
+
+    @property
+    def overruns(self):
+        return int(self.header[_OVERRUN])
+
+    @property
+    def underruns(self):
+        return int(self.header[_UNDERRUN])
+
+    @property
+    def write_pos(self):
+        return int(self.header[_WRITE])
@@ -0,0 +1,49 @@
+"""Pengumpul sampel di thread reader sebelum dikirim ke GUI.
+
+Satu sinyal Qt per sampel berarti satu event antar-thread per sampel. Batcher
+ini mengumpulkan blok dari parser/decoder lalu melepasnya paling sering setiap
+`interval_ms` sebagai satu array (n_sampel x n_kanal) plus timestamp per sampel.
+"""
+import time
+
+import numpy as np
+
+
+class SampleBatcher:
+    """Kumpulkan blok sampel dan lepaskan sebagai satu batch per interval"""
+
+    def __init__(self, n_channels, interval_ms=50, max_samples=4096, dtype=np.float64):
+        self.n_channels = n_channels
+        self.interval = interval_ms / 1000.0
+        self.max_samples = max_samples
+        self.dtype = dtype
+        self._blocks = []
+        self._times = []
+        self._pending = 0
+        self._last_emit = time.monotonic()
+
+    def add(self, block, t=None):
+        """Tambah blok (n x n_kanal); semua sampel dalam satu read diberi timestamp yang sama"""
+        if len(block) == 0:
+            return
+        if t is None:
+            t = time.time()
+        self._blocks.append(block)
+        self._times.append(np.full(len(block), t))
+        self._pending += len(block)
+
+    def pop(self, force=False):
+        """Return (timestamps, block) jika sudah waktunya kirim, selain itu None"""
+        if not self._pending:
+            return None
+        now = time.monotonic()
+        if not force and self._pending < self.max_samples and now - self._last_emit < self.interval:
+            return None
+        if len(self._blocks) == 1:
+            block, times = self._blocks[0], self._times[0]
+        else:
+            block = np.concatenate(self._blocks)
+            times = np.concatenate(self._times)
+        self._blocks, self._times, self._pending = [], [], 0
+        self._last_emit = now
+        return times, np.asarray(block, dtype=self.dtype)
@@ -0,0 +1,242 @@
+"""Hub serial asyncio: satu host melayani banyak Arduino bedside sekaligus.
+
+Setiap device dibuka lewat `serial.serial_for_url` (path device, `loop://`,
+`socket://`, ...), di-parse dengan format baris yang sudah ada dan sampelnya
+dirutekan ke ring buffer per device. Kalau port hilang (USB dicabut, Arduino
+reset), hub menunggu dengan backoff eksponensial lalu membuka ulang port,
+bukan berhenti seperti `read_serial` lama.
+
+HubThread menjalankan hub di satu thread latar untuk aplikasi Qt (central_station):
+satu event loop melayani semua port, GUI cukup menguras ring per device.
+
+Contoh:
+    python serial_hub.py bed1=/dev/ttyACM0 bed2=/dev/ttyACM1:ecg nibp=COM14:tekanan@115200
+"""
+import argparse
+import asyncio
+import threading
+import time
+
+import serial
+
+from frame_protocol import MONITOR_COLUMNS
+from line_parser import ChunkParser, MonitorStreamParser, ECG_SPO2_RESP, PRESSURE_SMOOTHED, TEKANAN
+from ring_buffer import SPSCRingBuffer
+
+# Nama format -> (jumlah kanal, pembuat parser). Semua parser punya feed(chunk) -> array (n x kanal)
+FORMATS = {
+    'monitor': (len(MONITOR_COLUMNS), MonitorStreamParser),
+    'ecg': (ECG_SPO2_RESP.n_fields, lambda: _ValuesOnly(ECG_SPO2_RESP)),
+    'tekanan': (TEKANAN.n_fields, lambda: _ValuesOnly(TEKANAN)),
+    'pressure': (PRESSURE_SMOOTHED.n_fields, lambda: _ValuesOnly(PRESSURE_SMOOTHED)),
+}
+
+
+class _ValuesOnly:
+    """ChunkParser yang hanya mengembalikan array nilai"""
+
+    def __init__(self, fmt):
+        self.parser = ChunkParser(fmt)
+
+    def feed(self, chunk):
+        return self.parser.feed(chunk).values
+
+    @property
+    def malformed(self):
+        return self.parser.malformed
+
+
+class DeviceConfig:
+    def __init__(self, name, url, baud=9600, fmt='monitor', capacity=4096):
+        if fmt not in FORMATS:
+            raise ValueError(f"Format tidak dikenal: {fmt} (pilihan: {', '.join(FORMATS)})")
+        self.name = name
+        self.url = url
+        self.baud = baud
+        self.fmt = fmt
+        self.capacity = capacity
+
+    @classmethod
+    def parse(cls, spec):
+        """Parse 'nama=url[:format][@baud]' dari command line"""
+        name, _, rest = spec.partition('=')
+        if not rest:
+            raise ValueError(f"Spesifikasi device harus 'nama=url[:format][@baud]': {spec}")
+        rest, _, baud = rest.partition('@')
+        url, fmt = rest, 'monitor'
+        head, sep, tail = rest.rpartition(':')
+        if sep and tail in FORMATS:
+            url, fmt = head, tail
+        return cls(name, url, int(baud) if baud else 9600, fmt)
+
+
+class DeviceState:
+    """Status runtime satu device"""
+
+    def __init__(self, config):
+        self.config = config
+        n_channels, _ = FORMATS[config.fmt]
+        self.ring = SPSCRingBuffer(n_channels, config.capacity)
+        self.connected = False
+        self.connects = 0
+        self.samples = 0
+        self.malformed = 0
+        self.last_error = None
+
+
+class SerialHub:
+    """Buka N port serial secara konkuren di satu event loop"""
+
+    def __init__(self, devices, min_backoff=0.5, max_backoff=10.0, poll_interval=0.01):
+        self.devices = {d.name: DeviceState(d) for d in devices}
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+        # Dipakai untuk port tanpa file descriptor (mis. loop://)
+        self.poll_interval = poll_interval
+        self._stopping = False
+        self._events = set()
+
+    def ring(self, name):
+        return self.devices[name].ring
+
+    async def run(self):
+        await asyncio.gather(*(self._run_device(state) for state in self.devices.values()))
+
+    def stop(self):
+        self._stopping = True
+        # Bangunkan semua reader yang sedang menunggu data
+        for event in self._events:
+            event.set()
+
+    async def _run_device(self, state):
+        cfg = state.config
+        backoff = self.min_backoff
+        while not self._stopping:
+            try:
+                ser = serial.serial_for_url(cfg.url, cfg.baud, timeout=0)
+            except (serial.SerialException, OSError, ValueError) as e:
+                state.last_error = str(e)
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, self.max_backoff)
+                continue
+
+            state.connected = True
+            state.connects += 1
+            backoff = self.min_backoff
+            try:
+                await self._read_loop(state, ser)
+            except (serial.SerialException, OSError) as e:
+                state.last_error = str(e)
+            finally:
+                state.connected = False
+                ser.close()
+            if not self._stopping:
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, self.max_backoff)
+
+    async def _read_loop(self, state, ser):
+        loop = asyncio.get_running_loop()
+        parser = FORMATS[state.config.fmt][1]()
+        try:
+            fd = ser.fileno()
+        except (AttributeError, NotImplementedError, OSError, ValueError):
+            fd = None
+
+        readable = asyncio.Event()
+        self._events.add(readable)
+        if fd is not None:
+            loop.add_reader(fd, readable.set)
+        try:
+            while not self._stopping:
+                if fd is not None:
+                    await readable.wait()
+                    readable.clear()
+                    if self._stopping:
+                        break
+                    # Non-blocking; port yang hilang membuat read raise SerialException
+                    chunk = ser.read(max(1, ser.in_waiting))
+                else:
+                    chunk = ser.read(ser.in_waiting)
+                    if not chunk:
+                        await asyncio.sleep(self.poll_interval)
+                        continue
+                rows = parser.feed(chunk)
+                state.ring.write(rows, time.time())
+                state.samples += len(rows)
+                state.malformed = parser.malformed
+        finally:
+            self._events.discard(readable)
+            if fd is not None:
+                loop.remove_reader(fd)
+
+
+
+class HubThread:
+    """SerialHub di thread latar dengan event loop sendiri; start/stop aman dipanggil berulang"""
+
+    def __init__(self, hub):
+        self.hub = hub
+        self.loop = None
+        self.thread = None
+
+    def start(self):
+        if self.thread is not None:
+            return
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.loop.run_until_complete(self.hub.run())
+        finally:
+            self.loop.close()
+
+    def stop(self, timeout=None):
+        """Hentikan hub dari thread lain; tunggu thread selesai kalau `timeout` diberikan"""
+        if self.thread is None:
+            return
+        try:
+            self.loop.call_soon_threadsafe(self.hub.stop)
+        except RuntimeError:
+            # Loop sudah ditutup: hub sudah berhenti
+            pass
+        if timeout is not None:
+            self.thread.join(timeout)
+
+
+async def _print_stats(hub, interval):
+    while True:
+        await asyncio.sleep(interval)
+        for name, state in hub.devices.items():
+            status = "OK" if state.connected else f"putus ({state.last_error})"
+            print(f"{name:<10} {status:<40} sampel={state.samples} rusak={state.malformed} "
+                  f"overrun={state.ring.overruns} koneksi={state.connects}")
+            # Konsumen contoh: kosongkan ring supaya tidak overrun
+            state.ring.read()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hub serial asyncio untuk banyak device bedside")
+    parser.add_argument('devices', nargs='+', help="nama=url[:monitor|ecg|tekanan|pressure][@baud]")
+    parser.add_argument('--stats-interval', type=float, default=1.0)
+    args = parser.parse_args()
+
+    hub = SerialHub([DeviceConfig.parse(spec) for spec in args.devices])
+
+    async def run():
+        stats = asyncio.create_task(_print_stats(hub, args.stats_interval))
+        try:
+            await hub.run()
+        finally:
+            stats.cancel()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
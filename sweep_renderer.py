@@ -0,0 +1,117 @@
+"""Renderer sweep untuk gelombang bedside: hanya segmen yang berubah yang digambar ulang.
+
+Buffer gelombang ditulis melingkar dari kursor (seperti layar monitor sungguhan).
+Daripada `setData(x, seluruh_buffer)` tiap frame, satu trace dipecah menjadi
+beberapa PlotCurveItem pendek (`segment_len` sampel, saling menyambung di
+titik ujung). Tiap frame hanya segmen antara kursor lama dan kursor baru yang
+di-setData, dan karena GraphicsView pyqtgraph memakai MinimalViewportUpdate,
+hanya area segmen itu yang di-repaint. Biaya per frame bergantung pada jumlah
+sampel baru dan `segment_len`, bukan pada `buffer_size`.
+
+Erase bar (dulu InfiniteLine hitam) dibuat dengan celah NaN sepanjang `gap`
+sampel di depan kursor; kurva digambar dengan connect='finite' sehingga
+celah itu benar-benar kosong.
+
+Kalau buffer lebih banyak dari pixel plot, tiap segmen yang digambar ulang
+didekimasi (min/max per pixel atau LTTB, lihat decimation.py) sesuai lebar
+ViewBox saat ini; ukuran bin dihitung ulang saat plot di-resize.
+"""
+import numpy as np
+import pyqtgraph as pg
+
+from decimation import decimate
+
+
+def dirty_segments(old, cursor, n_new, n, gap, segment_len):
+    """Segmen yang berubah saat kursor maju dari `old` ke `cursor`; None = semua segmen"""
+    span = min(n, n_new) + gap
+    if n_new >= n or span >= n:
+        return None
+    # Indeks yang berubah: sampel baru + erase bar lama dan baru
+    idx = (old + np.arange(span + 1)) % n
+    segments = idx // segment_len
+    # Titik awal segmen juga titik akhir segmen sebelumnya
+    joints = segments[(idx % segment_len == 0) & (idx > 0)] - 1
+    return set(segments.tolist()) | set(joints.tolist())
+
+
+class SweepTrace:
+    """Satu gelombang sweep di sebuah PlotWidget/PlotItem"""
+
+    def __init__(self, plot, x, data, pen, segment_len=None, gap=None, decimation='minmax'):
+        self.plot = plot
+        self.x = x
+        self.data = data
+        self.n = len(x)
+        # Paling banyak ~64 segmen per trace supaya jumlah item scene tetap kecil untuk buffer besar
+        self.segment_len = max(64, -(-self.n // 64)) if segment_len is None else segment_len
+        # Default lebar erase bar ~1% jendela, mirip InfiniteLine lebar 9 px sebelumnya
+        self.gap = max(2, self.n // 100) if gap is None else gap
+        self.cursor = 0
+
+        # Sumbu x tetap: tanpa auto-range, setData tidak memicu perhitungan ulang batas view
+        plot.setXRange(x[0], x[-1], padding=0)
+        self.curves = []
+        for start in range(0, self.n, self.segment_len):
+            curve = pg.PlotCurveItem(pen=pen, connect='finite')
+            plot.addItem(curve)
+            self.curves.append(curve)
+        self._dirty = set(range(len(self.curves)))
+
+        # Sampel per pixel; <= 2 berarti tanpa dekimasi
+        self.decimation = decimation
+        self.bin_size = 1
+        if decimation:
+            view = plot.getViewBox()
+            view.sigResized.connect(lambda vb: self.set_pixel_width(vb.width()))
+            self.set_pixel_width(view.width())
+
+    def set_pixel_width(self, width):
+        """Hitung ulang ukuran bin dekimasi dari lebar plot (pixel)"""
+        bin_size = int(self.n // max(width, 1)) if self.decimation else 1
+        if bin_size != self.bin_size:
+            self.bin_size = bin_size
+            self.invalidate()
+
+    def set_source(self, data):
+        """Ganti array sumber (mis. ganti lead); seluruh trace digambar ulang"""
+        self.data = data
+        self.invalidate()
+
+    def invalidate(self):
+        self._dirty = set(range(len(self.curves)))
+
+    def advance(self, cursor, n_new):
+        """Kursor tulis pindah ke `cursor` setelah `n_new` sampel baru"""
+        old = self.cursor
+        self.cursor = cursor
+        if n_new <= 0:
+            return
+        dirty = dirty_segments(old, cursor, n_new, self.n, self.gap, self.segment_len)
+        if dirty is None:
+            self.invalidate()
+        else:
+            self._dirty.update(dirty)
+
+    def render(self):
+        """setData hanya untuk segmen kotor; return jumlah segmen yang digambar"""
+        if not self._dirty:
+            return 0
+        L = self.segment_len
+        gap_idx = (self.cursor + np.arange(self.gap)) % self.n
+        for k in self._dirty:
+            start = k * L
+            end = min(start + L + 1, self.n)
+            y = self.data[start:end].astype(np.float64)
+            hole = gap_idx[(gap_idx >= start) & (gap_idx < end)] - start
+            y[hole] = np.nan
+            x = self.x[start:end]
+            if self.bin_size > 2:
+                # Titik ujung mentah tetap ada supaya segmen menyambung dengan tetangganya
+                xd, yd = decimate(x[1:-1], y[1:-1], self.bin_size, self.decimation)
+                x = np.concatenate((x[:1], xd, x[-1:]))
+                y = np.concatenate((y[:1], yd, y[-1:]))
+            self.curves[k].setData(x, y)
+        count = len(self._dirty)
+        self._dirty = set()
+        return count
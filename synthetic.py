@@ -0,0 +1,143 @@
+"""Generator sinyal sintetis untuk emulator firmware dan benchmark (tanpa hardware).
+
+    monitor_rows   baris 16-field monitor (layout MONITOR_COLUMNS): ECG 9 lead, pleth, resp, numerik
+    nibp_session   tekanan manset satu pengukuran NIBP: inflasi lalu deflasi dengan osilasi
+
+Amplitudo osilasi NIBP punya dua model (ENVELOPES):
+    ratio       Gaussian asimetris yang turun ke 0.55/0.85 di sistolik/diastolik. Ini persis
+                model yang di-fit envelope_fit dan konvensi firmware_ratio, jadi akurasi
+                algoritma itu pada model ini sudah dijamin oleh konstruksinya.
+    compliance  selisih volume arteri V(sistolik - Pc) - V(diastolik - Pc) dengan kurva
+                compliance eksponensial (kolaps) / logaritmik (distensi). Rasio di
+                sistolik/diastolik ikut bergantung pada tekanan nadi dan kurva, tidak
+                diasumsikan algoritma mana pun.
+Keduanya tetap sintetis; akurasi klinis hanya bisa dinilai dari rekaman dengan
+pembacaan referensi (nibp_batch --reference).
+"""
+import numpy as np
+
+from frame_protocol import COL, MONITOR_COLUMNS
+
+# Kalibrasi sensor HSCDANN001BG2A5 seperti di firmware: 1648 = 0 mmHg, 0.05825 mmHg/count
+RAW_ZERO = 1648
+MMHG_PER_COUNT = 0.05825
+
+# Skala relatif tiap lead terhadap lead II (kasar, cukup untuk tampilan)
+_LEAD_GAIN = {'I': 0.6, 'II': 1.0, 'III': 0.4, 'V': 0.8,
+              'V1': -0.5, 'V2': 0.3, 'V3': 0.9, 'V4': 1.2, 'V5': 1.0}
+
+# Gelombang PQRST: (posisi dalam siklus, lebar, amplitudo mV)
+_PQRST = ((0.16, 0.025, 0.12), (0.235, 0.008, -0.15), (0.25, 0.01, 1.2),
+          (0.27, 0.01, -0.25), (0.52, 0.04, 0.3))
+
+
+def ecg_wave(phase):
+    """ECG sintetis dari fase siklus jantung (0..1)"""
+    y = np.zeros_like(phase)
+    for center, width, amp in _PQRST:
+        y += amp * np.exp(-0.5 * ((phase - center) / width) ** 2)
+    return y
+
+
+def monitor_rows(n, fs=100.0, hr=72, spo2=98, resp_rate=16, temp=36.6, nibp=(120, 80),
+                 t0=0.0, noise=0.0, rng=None):
+    """Array (n x 17) layout MONITOR_COLUMNS, format angka seperti firmware"""
+    if rng is None:
+        rng = np.random.default_rng()
+    t = t0 + np.arange(n) / fs
+    phase = (t * hr / 60.0) % 1.0
+    ecg = ecg_wave(phase)
+    rows = np.zeros((n, len(MONITOR_COLUMNS)))
+    for lead, gain in _LEAD_GAIN.items():
+        rows[:, COL[lead]] = gain * ecg
+    if noise:
+        rows[:, :9] += rng.normal(0, noise * 0.05, (n, 9))
+    rows[:, :9] = np.round(rows[:, :9], 2)
+
+    # Pleth mengikuti denyut dengan jeda ~0.2 siklus, dalam count RED_data AFE44xx
+    pleth_phase = (phase - 0.2) % 1.0
+    pleth = np.exp(-0.5 * ((pleth_phase - 0.25) / 0.12) ** 2) + 0.35 * np.exp(-0.5 * ((pleth_phase - 0.55) / 0.08) ** 2)
+    rows[:, COL['SpO2_W']] = np.round(150000 + 40000 * pleth)
+    rows[:, COL['RESP_W']] = np.round(0.5 + 0.5 * np.sin(2 * np.pi * resp_rate / 60.0 * t), 2)
+
+    rows[:, COL['PR']] = hr
+    rows[:, COL['SpO2_N']] = spo2
+    rows[:, COL['RESP_N']] = resp_rate
+    rows[:, COL['TEMP']] = temp
+    rows[:, COL['SYS']], rows[:, COL['DIA']] = nibp
+    return rows
+
+
+def oscillation_envelope(pressure, systolic, diastolic, map_value, amp=3.0,
+                         sys_ratio=0.55, dia_ratio=0.85):
+    """Amplitudo osilasi vs tekanan manset: puncak di MAP, turun ke sys_ratio di sistolik
+    dan dia_ratio di diastolik (konvensi rasio firmware)"""
+    w_sys = (systolic - map_value) / np.sqrt(-np.log(sys_ratio))
+    w_dia = (map_value - diastolic) / np.sqrt(-np.log(dia_ratio))
+    width = np.where(pressure >= map_value, w_sys, w_dia)
+    return amp * np.exp(-((pressure - map_value) / width) ** 2)
+
+
+def arterial_volume(transmural, k_collapse=10.0, k_distend=15.0):
+    """Volume arteri relatif vs tekanan transmural (mmHg): eksponensial saat kolaps,
+    logaritmik saat distensi, kemiringan 1 di 0"""
+    x = np.asarray(transmural, dtype=np.float64)
+    collapse = k_collapse * np.expm1(np.minimum(x, 0.0) / k_collapse)
+    distend = k_distend * np.log1p(np.maximum(x, 0.0) / k_distend)
+    return np.where(x < 0, collapse, distend)
+
+
+def compliance_envelope(pressure, systolic, diastolic, amp=3.0, k_collapse=10.0, k_distend=15.0):
+    """Amplitudo osilasi = perubahan volume arteri dari diastolik ke sistolik pada tekanan
+    manset `pressure`, diskalakan supaya puncaknya `amp`"""
+    def swing(pc):
+        return (arterial_volume(systolic - pc, k_collapse, k_distend)
+                - arterial_volume(diastolic - pc, k_collapse, k_distend))
+    # Puncak selalu di antara diastolik - k_collapse dan sistolik
+    grid = np.linspace(diastolic - 3 * k_collapse, systolic, 512)
+    return amp * swing(np.asarray(pressure, dtype=np.float64)) / swing(grid).max()
+
+
+ENVELOPES = ('ratio', 'compliance')
+
+
+def quantize_mmhg(mmhg):
+    """Kuantisasi ke resolusi sensor seperti bacaTekanan()"""
+    raw = np.floor(np.asarray(mmhg) / MMHG_PER_COUNT + RAW_ZERO)
+    return np.maximum((raw - RAW_ZERO) * MMHG_PER_COUNT, 0.0)
+
+
+def nibp_session(systolic=120, diastolic=80, map_value=None, hr=72, target=160.0,
+                 inflate_rate=25.0, inflate_dt=0.05, deflate_rate=3.0, deflate_dt=0.08,
+                 n_deflate=500, amp=3.0, noise=0.3, rng=None, envelope='ratio', compliance=(10.0, 15.0)):
+    """Tekanan manset satu pengukuran.
+
+    Return (inflate, deflate): array mmHg terkuantisasi. Inflasi berhenti di sampel
+    pertama >= target (seperti inflasi()), deflasi n_deflate sampel tiap deflate_dt.
+    Default deflasi (3 mmHg/s, 40 s) lebih panjang dari MAX_DATA firmware supaya
+    BPAnalyzer.analyze_bp mendapat >= 20 puncak valid. `envelope` memilih model
+    amplitudo osilasi (ENVELOPES); `compliance` = (k_collapse, k_distend) model compliance.
+    """
+    if envelope not in ENVELOPES:
+        raise ValueError(f"Model envelope tidak dikenal: {envelope} (pilihan: {', '.join(ENVELOPES)})")
+    if rng is None:
+        rng = np.random.default_rng()
+    if map_value is None:
+        map_value = diastolic + (systolic - diastolic) / 3.0
+
+    n_inflate = int(np.ceil(target / (inflate_rate * inflate_dt))) + 1
+    inflate = np.minimum(np.arange(n_inflate) * inflate_rate * inflate_dt, target + 1.0)
+    inflate = quantize_mmhg(inflate + rng.normal(0, noise, n_inflate))
+    hit = np.flatnonzero(inflate >= target)
+    inflate = inflate[:hit[0] + 1] if len(hit) else inflate
+
+    t = np.arange(n_deflate) * deflate_dt
+    baseline = inflate[-1] - deflate_rate * t
+    beat_phase = (t * hr / 60.0) % 1.0
+    pulse = np.maximum(np.sin(2 * np.pi * beat_phase), 0.0) ** 2
+    if envelope == 'ratio':
+        osc = oscillation_envelope(baseline, systolic, diastolic, map_value, amp) * pulse
+    else:
+        osc = compliance_envelope(baseline, systolic, diastolic, amp, *compliance) * pulse
+    deflate = quantize_mmhg(baseline + osc + rng.normal(0, noise, n_deflate))
+    return inflate, deflate
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Modul repo ada di root (bukan package), sama seperti benchmarks/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
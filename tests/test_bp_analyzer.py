@@ -0,0 +1,81 @@
+"""StreamingBPAnalyzer vs BPAnalyzer: mode yang mengaku identik (matches_batch) harus identik."""
+import numpy as np
+import pytest
+from scipy.signal import find_peaks
+
+from bp_analyzer import DEFLATION_FS, BPAnalyzer, StreamingBPAnalyzer, _select_by_distance
+from synthetic import nibp_session
+
+
+def session(seed, **kwargs):
+    rng = np.random.default_rng(seed)
+    inflate, deflate = nibp_session(rng.uniform(100, 160), rng.uniform(55, 95), hr=rng.uniform(55, 100),
+                                    rng=rng, **kwargs)
+    return np.concatenate((inflate, deflate))
+
+
+def feed_batches(analyzer, pressure, seed):
+    # Batch acak seperti SerialReader (1..40 sampel per emit)
+    rng = np.random.default_rng(seed)
+    i = 0
+    while i < len(pressure):
+        n = int(rng.integers(1, 40))
+        analyzer.feed(pressure[i:i + n])
+        i += n
+
+
+def assert_same_result(stream, batch):
+    assert len(stream) == len(batch) == 6
+    for got, want in zip(stream, batch):
+        if want is None:
+            assert got is None
+        else:
+            np.testing.assert_array_equal(got, want)
+
+
+def test_select_by_distance_matches_find_peaks():
+    rng = np.random.default_rng(0)
+    for _ in range(500):
+        # Nilai dibulatkan supaya banyak puncak sama tinggi (urutan argsort ikut menentukan)
+        x = np.round(rng.normal(size=int(rng.integers(3, 300))) * rng.choice([1, 3, 20]))
+        peaks, _ = find_peaks(x)
+        distance = int(rng.integers(1, 12))
+        np.testing.assert_array_equal(_select_by_distance(peaks, x[peaks], distance),
+                                      find_peaks(x, distance=distance)[0])
+
+
+@pytest.mark.parametrize('algorithm, fs', [
+    ('peak_index', None),
+    ('firmware_ratio', None),
+    ('firmware_ratio', DEFLATION_FS),
+])
+@pytest.mark.parametrize('envelope', ['ratio', 'compliance'])
+def test_streaming_matches_batch(algorithm, fs, envelope):
+    for seed in range(5):
+        pressure = session(seed, envelope=envelope)
+        stream = StreamingBPAnalyzer(fs=fs, algorithm=algorithm)
+        assert stream.matches_batch
+        feed_batches(stream, pressure, seed)
+        batch = BPAnalyzer(fs=fs, algorithm=algorithm).analyze_bp(pressure)
+        assert batch[2] is not None
+        assert_same_result(stream.result(), batch)
+
+
+def test_streaming_restarts_on_new_maximum():
+    # Inflasi kedua lebih tinggi: deflasi dihitung ulang dari maksimum baru seperti argmax batch
+    first, second = session(1), session(2) + 5.0
+    pressure = np.concatenate((first, second))
+    stream = StreamingBPAnalyzer()
+    feed_batches(stream, pressure, 3)
+    assert_same_result(stream.result(), BPAnalyzer().analyze_bp(pressure))
+
+
+@pytest.mark.parametrize('algorithm, fs', [('peak_index', DEFLATION_FS), ('envelope_fit', None)])
+def test_causal_modes_do_not_claim_batch_equivalence(algorithm, fs):
+    stream = StreamingBPAnalyzer(fs=fs, algorithm=algorithm)
+    assert not stream.matches_batch
+    pressure = session(0)
+    feed_batches(stream, pressure, 0)
+    # Ada estimasi, tapi tidak dijanjikan sama dengan offline: MAP (puncak tertinggi) bisa jatuh
+    # di denyut lain pada osilasi kausal, jadi NIBPGUI menandai hasil ini sementara
+    assert stream.result()[2] is not None
@@ -0,0 +1,185 @@
+"""Round trip firmware_emulator lewat pty: emulator di sisi master, pyserial di sisi slave."""
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+import pytest
+import serial
+
+from firmware_emulator import MonitorEmulator, NIBPEmulator, VirtualSerialPort
+from frame_protocol import MONITOR_COLUMNS
+from line_parser import MonitorStreamParser, parse_nibp_result
+from synthetic import nibp_session
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'benchmarks'))
+from script_loader import load_script  # noqa: E402
+
+nibp_system = load_script('NIBP System.py')
+
+
+def read_for(ser, seconds, feed):
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        feed(ser.read(max(1, ser.in_waiting)))
+
+
+def run_serial_reader(port, timeout=10.0):
+    """Jalankan SerialReader (NIBP System.py) di thread ini sampai `done`; return (mmHg, pesan, detik)"""
+    reader = nibp_system.SerialReader(port=port, connect_delay=0)
+    blocks, messages = [], []
+    reader.data_received.connect(lambda times, block: blocks.append(block))
+    reader.done.connect(messages.append)
+    # Pengaman kalau baris HASIL tidak pernah datang
+    guard = threading.Timer(timeout, reader.stop)
+    guard.start()
+    t0 = time.monotonic()
+    try:
+        reader.run()
+    finally:
+        guard.cancel()
+    elapsed = time.monotonic() - t0
+    assert len(messages) == 1, "SerialReader berhenti tanpa hasil"
+    mmhgs = np.concatenate([b[:, 1] for b in blocks]) if blocks else np.empty(0)
+    return mmhgs, messages[0], elapsed
+
+
+@pytest.mark.parametrize('style', ['block', 'inline'])
+def test_nibp_start_stream_and_result(style):
+    emu = NIBPEmulator(systolic=130, diastolic=85, hr=70, result_style=style, speed=0, seed=3)
+    try:
+        emu.start()
+        # SerialReader mengirim START sendiri lalu membaca sampai hasil lengkap
+        mmhgs, message, _ = run_serial_reader(emu.port)
+    finally:
+        emu.stop()
+
+    # Sampel sebelum baris HASIL = seluruh sesi inflasi + deflasi (Serial.print 2 desimal)
+    inflate, deflate = nibp_session(systolic=130, diastolic=85, hr=70, noise=emu.noise, rng=np.random.default_rng(3))
+    expected = np.concatenate((inflate, deflate))
+    np.testing.assert_allclose(mmhgs, expected, atol=0.005)
+    assert emu.measurements == 1
+
+    if style == 'inline':
+        assert message.startswith("HASIL:")
+        assert parse_nibp_result(message) == (130.0, 85.0, 70.0)
+    else:
+        # Seluruh blok Print_Hasil.ino, bukan hanya baris judulnya
+        lines = message.split("\n")
+        assert lines[0] == "=== HASIL NIBP ==="
+        assert lines[-1].startswith("=====")
+        assert any(line.startswith("MAP") for line in lines)
+        assert parse_nibp_result(message) == (130.0, 85.0, None)
+
+
+def test_nibp_block_split_across_reads():
+    # Blok hasil datang per baris dengan jeda; SerialReader menunggu garis penutup
+    port = VirtualSerialPort()
+    block = ["", "=== HASIL NIBP ===", "Sistolik  : 118.0 mmHg", "Diastolik : 76.0 mmHg",
+             "MAP       : 90.0 mmHg", "==================================="]
+
+    def firmware():
+        # Tunggu SerialReader membuka port (pyserial mengosongkan buffer input saat open)
+        time.sleep(0.2)
+        port.write(b"Tekanan: 101.25 mmHg\r\nTekanan: 100.50 mmHg\r\n")
+        for line in block:
+            time.sleep(0.05)
+            port.write(line.encode() + b"\r\n")
+
+    writer = threading.Thread(target=firmware)
+    try:
+        writer.start()
+        mmhgs, message, _ = run_serial_reader(port.port)
+        writer.join()
+    finally:
+        port.close()
+    np.testing.assert_allclose(mmhgs, [101.25, 100.50])
+    assert message == "\n".join(block[1:])
+    assert parse_nibp_result(message) == (118.0, 76.0, None)
+
+
+def test_nibp_speed_factor():
+    speed = 100.0
+    inflate, deflate = nibp_session(rng=np.random.default_rng(0))
+    # Waktu firmware: delay per sampel inflasi (50 ms) dan deflasi (80 ms)
+    expected = (len(inflate) * 0.05 + len(deflate) * 0.08) / speed
+    emu = NIBPEmulator(speed=speed, seed=0)
+    try:
+        emu.start()
+        mmhgs, _, elapsed = run_serial_reader(emu.port)
+    finally:
+        emu.stop()
+    assert len(mmhgs) == len(inflate) + len(deflate)
+    assert expected * 0.95 <= elapsed < expected * 1.5 + 0.2
+
+
+def run_monitor(seconds=0.5, speed=10.0, **kwargs):
+    """Jalankan MonitorEmulator, baca dengan MonitorStreamParser; return (emulator, parser, rows, detik)"""
+    emu = MonitorEmulator(speed=speed, noise=0.0, seed=1, **kwargs)
+    parser = MonitorStreamParser()
+    rows = []
+    try:
+        # Port dibuka sebelum emulator mulai: pyserial mengosongkan buffer input saat open
+        with serial.Serial(emu.port, timeout=0.01) as ser:
+            emu.start()
+            t0 = time.monotonic()
+            read_for(ser, seconds, lambda chunk: rows.append(parser.feed(chunk)))
+            emu.stop(close=False)
+            elapsed = time.monotonic() - t0
+            # Kuras sisa data yang sudah terkirim sebelum emulator berhenti
+            read_for(ser, 0.1, lambda chunk: rows.append(parser.feed(chunk)))
+    finally:
+        emu.stop()
+    rows = np.concatenate(rows) if rows else np.empty((0, len(MONITOR_COLUMNS)))
+    return emu, parser, rows, elapsed
+
+
+def test_monitor_text_round_trip():
+    emu, parser, rows, _ = run_monitor()
+    assert emu.samples_sent > 0
+    assert len(rows) == emu.samples_sent
+    # Hanya baris "AFE44xx Inisiasi Selesai" yang bukan data
+    assert parser.malformed == 1
+    assert rows.shape[1] == len(MONITOR_COLUMNS)
+    np.testing.assert_array_equal(rows[:, MONITOR_COLUMNS.index('SYS')], 120)
+
+
+def test_monitor_text_corruption():
+    emu, parser, rows, _ = run_monitor(corruption=0.05)
+    assert emu.lines_corrupted > 0
+    # Baris rusak dibuang dan dihitung; baris tanpa newline ikut merusak baris berikutnya.
+    # Baris yang terpotong di digit terakhir kadang masih valid, jadi tidak ada batas bawah malformed yang pasti
+    lost = emu.samples_sent - len(rows)
+    assert 0 < lost <= 2 * emu.lines_corrupted
+    assert 1 < parser.malformed <= emu.lines_corrupted + 1
+    assert np.all(np.isfinite(rows))
+
+
+def test_monitor_binary_round_trip():
+    emu, parser, rows, _ = run_monitor(binary=True)
+    assert len(rows) == emu.samples_sent
+    assert parser.decoder.crc_errors == 0
+    assert parser.decoder.lost_frames == 0
+
+
+def test_monitor_binary_corruption():
+    emu, parser, rows, _ = run_monitor(binary=True, corruption=0.05)
+    assert emu.lines_corrupted > 0
+    decoder = parser.decoder
+    # Tiap frame rusak ditolak CRC (atau hilang saat resync), tidak pernah lolos sebagai sampel
+    lost = emu.samples_sent - len(rows)
+    assert 0 < lost <= emu.lines_corrupted
+    assert 0 < decoder.crc_errors <= emu.lines_corrupted
+    # Lompatan nomor urut hanya terlihat di antara frame yang diterima: frame rusak sebelum
+    # frame valid pertama atau sesudah yang terakhir tidak terhitung
+    assert 0 < decoder.lost_frames <= lost
+    np.testing.assert_array_equal(rows[:, MONITOR_COLUMNS.index('SYS')], 120)
+
+
+def test_monitor_speed_factor():
+    speed, fs = 10.0, 100.0
+    emu, _, rows, elapsed = run_monitor(speed=speed, fs=fs)
+    # Sampel dijadwalkan dari waktu dinding x speed; tertinggal paling banyak beberapa tick
+    rate = emu.samples_sent / elapsed
+    assert speed * fs * 0.8 <= rate <= speed * fs * 1.05
@@ -0,0 +1,88 @@
+"""FrameDecoder: frame terpotong antar chunk, CRC salah, resync setelah sampah dan sync palsu di payload."""
+import numpy as np
+
+from frame_protocol import COL, FRAME_SIZE, FRAME_SYNC_BYTES, FrameDecoder, MONITOR_COLUMNS, encode_frames
+from synthetic import monitor_rows
+
+
+def rows_and_bytes(n, seq_start=0):
+    rows = monitor_rows(n, noise=0.0, rng=np.random.default_rng(0))
+    data = encode_frames(rows, seq_start=seq_start)
+    expected = FrameDecoder().feed(data)
+    return expected, data
+
+
+def feed_all(decoder, chunks):
+    out = [decoder.feed(chunk) for chunk in chunks]
+    return np.concatenate(out) if out else np.empty((0, len(MONITOR_COLUMNS)), dtype=np.float32)
+
+
+def test_round_trip_matches_source_rows():
+    rows = monitor_rows(20, noise=0.0, rng=np.random.default_rng(1))
+    decoded = FrameDecoder().feed(encode_frames(rows))
+    np.testing.assert_allclose(decoded[:, COL['II']], rows[:, COL['II']], atol=1e-3)
+    np.testing.assert_allclose(decoded[:, COL['SpO2_W']], rows[:, COL['SpO2_W']], atol=32)
+    np.testing.assert_array_equal(decoded[:, COL['SYS']], 120)
+
+
+def test_frames_split_across_chunks():
+    expected, data = rows_and_bytes(50)
+    rng = np.random.default_rng(2)
+    cuts = np.sort(rng.choice(np.arange(1, len(data)), size=60, replace=False))
+    decoder = FrameDecoder()
+    rows = feed_all(decoder, np.split(np.frombuffer(data, dtype=np.uint8), cuts))
+    np.testing.assert_array_equal(rows, expected)
+    assert decoder.frames == 50
+    assert decoder.crc_errors == decoder.lost_frames == decoder.skipped == 0
+
+
+def test_sync_word_split_between_chunks():
+    expected, data = rows_and_bytes(3)
+    decoder = FrameDecoder()
+    # Potong tepat di antara A5 dan 5A frame kedua
+    rows = feed_all(decoder, [data[:FRAME_SIZE + 1], data[FRAME_SIZE + 1:]])
+    np.testing.assert_array_equal(rows, expected)
+
+
+def test_crc_failure_drops_frame_and_counts_gap():
+    expected, data = rows_and_bytes(10)
+    data = bytearray(data)
+    data[4 * FRAME_SIZE + 10] ^= 0xFF  # byte gelombang frame ke-4
+    decoder = FrameDecoder()
+    rows = decoder.feed(bytes(data))
+    np.testing.assert_array_equal(rows, np.delete(expected, 4, axis=0))
+    assert decoder.crc_errors == 1
+    assert decoder.lost_frames == 1
+    assert decoder.false_syncs == 0
+
+
+def test_resync_after_garbage():
+    expected, data = rows_and_bytes(6)
+    garbage = bytes(range(1, 30))
+    stream = garbage + data[:3 * FRAME_SIZE] + b'\x00\xa5' + garbage + data[3 * FRAME_SIZE:]
+    decoder = FrameDecoder()
+    rows = feed_all(decoder, [stream[i:i + 17] for i in range(0, len(stream), 17)])
+    np.testing.assert_array_equal(rows, expected)
+    assert decoder.skipped == 2 * len(garbage) + 2
+    assert decoder.crc_errors == decoder.lost_frames == 0
+
+
+def test_false_sync_inside_payload_is_not_a_crc_error():
+    # Nomor urut 0x5AA5 ditulis little-endian sebagai A5 5A: sync palsu di offset 2 frame pertama
+    expected, data = rows_and_bytes(4, seq_start=0x5AA5)
+    assert data[2:4] == FRAME_SYNC_BYTES
+    decoder = FrameDecoder()
+    # Sampah di depan memaksa jalur umum (pencarian sync)
+    rows = decoder.feed(b'\x01\x02\x03' + data)
+    np.testing.assert_array_equal(rows, expected)
+    assert decoder.false_syncs >= 1
+    assert decoder.crc_errors == 0
+    assert decoder.skipped == 3
+
+
+def test_encoder_clips_pleth_like_firmware():
+    rows = monitor_rows(2, noise=0.0, rng=np.random.default_rng(0))
+    # RED_data 22-bit: >= 2^21 akan wrap kalau di-cast ke int16 tanpa batas
+    rows[:, COL['SpO2_W']] = [2 ** 21 + 5, -(2 ** 22)]
+    decoded = FrameDecoder().feed(encode_frames(rows))
+    np.testing.assert_array_equal(decoded[:, COL['SpO2_W']], [32767 * 64.0, -32768 * 64.0])
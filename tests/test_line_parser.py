@@ -0,0 +1,158 @@
+"""ChunkParser / MonitorStreamParser: baris terpotong antar chunk, field rusak, jumlah koma salah."""
+import numpy as np
+import pytest
+
+from firmware_emulator import format_monitor_line
+from frame_protocol import FRAME_SIZE, MONITOR_COLUMNS, encode_frames
+from line_parser import (ECG_SPO2_RESP, MONITOR_16, PRESSURE_SMOOTHED, TEKANAN, ChunkParser,
+                         MonitorStreamParser, nibp_result_lines, parse_nibp_result)
+from synthetic import monitor_rows
+
+ECG_LINES = b"ECG:0.12,SpO2:0.98,RESP:0.50\r\nECG:-1.5,SpO2:0.97,RESP:0.25\r\n"
+TEKANAN_LINES = b"Tekanan: 123.45 mmHg\r\nTekanan: 99.00 mmHg\r\n"
+PRESSURE_LINES = b"Pressure (mmHg): 123.4 | Smoothed: 120.1\r\nPressure (mmHg): 80 | Smoothed: 81.5\r\n"
+
+
+def feed_pieces(parser, data, sizes):
+    values, other = [], []
+    pos = 0
+    for size in sizes:
+        chunk = parser.feed(data[pos:pos + size])
+        n = sum(len(v) for v in values)
+        values.append(chunk.values)
+        other.extend((n + i, line) for i, line in chunk.other)
+        pos += size
+    assert pos >= len(data)
+    return np.concatenate(values), other
+
+
+@pytest.mark.parametrize('fmt, data, expected', [
+    (ECG_SPO2_RESP, ECG_LINES, [[0.12, 0.98, 0.50], [-1.5, 0.97, 0.25]]),
+    (TEKANAN, TEKANAN_LINES, [[123.45], [99.0]]),
+    (PRESSURE_SMOOTHED, PRESSURE_LINES, [[123.4, 120.1], [80.0, 81.5]]),
+])
+def test_partial_lines_across_chunks(fmt, data, expected):
+    # Satu byte per chunk, lalu potongan acak: hasilnya harus sama dengan satu chunk utuh
+    whole = ChunkParser(fmt).feed(data).values
+    np.testing.assert_allclose(whole, expected)
+    bytewise, _ = feed_pieces(ChunkParser(fmt), data, [1] * len(data))
+    np.testing.assert_array_equal(bytewise, whole)
+    rng = np.random.default_rng(0)
+    sizes = rng.integers(1, 9, size=len(data))
+    pieces, _ = feed_pieces(ChunkParser(fmt), data, sizes)
+    np.testing.assert_array_equal(pieces, whole)
+
+
+def test_line_without_newline_waits_for_next_chunk():
+    parser = ChunkParser(TEKANAN)
+    assert len(parser.feed(b"Tekanan: 12").values) == 0
+    assert parser.carry == b"Tekanan: 12"
+    np.testing.assert_allclose(parser.feed(b"3.5 mmHg\n").values, [[123.5]])
+    assert parser.carry == b""
+
+
+def test_corrupt_fields_are_counted_not_raised():
+    parser = ChunkParser(ECG_SPO2_RESP)
+    data = (b"ECG:0.1,SpO2:0.9,RESP:0.5\n"
+            b"ECG:abc,SpO2:0.9,RESP:0.5\n"
+            b"ECG:0.2,SpO2:,RESP:0.5\n"
+            b"ECG:0.3,SpO2:0.8,RESP:0.4\n")
+    values, other = parser.feed(data)
+    np.testing.assert_allclose(values, [[0.1, 0.9, 0.5], [0.3, 0.8, 0.4]])
+    assert parser.malformed == 2
+    assert parser.lines == 2
+    assert other == []
+
+
+@pytest.mark.parametrize('line', [
+    b"ECG:0.1,SpO2:0.9\n",                       # kolom kurang
+    b"ECG:0.1,SpO2:0.9,RESP:0.5,EXTRA:1\n",      # kolom lebih
+    b"ECG:0.1,,SpO2:0.9,RESP:0.5\n",             # koma ganda
+])
+def test_wrong_comma_count(line):
+    parser = ChunkParser(ECG_SPO2_RESP)
+    values, _ = parser.feed(line + b"ECG:1,SpO2:2,RESP:3\n")
+    np.testing.assert_allclose(values, [[1.0, 2.0, 3.0]])
+    assert parser.malformed == 1
+
+
+def test_monitor_line_wrong_field_count():
+    rows = monitor_rows(3, noise=0.0, rng=np.random.default_rng(0))
+    lines = [format_monitor_line(r) for r in rows]
+    lines[1] = lines[1].rsplit(",", 1)[0]  # field terakhir (sys\dia) hilang
+    parser = ChunkParser(MONITOR_16)
+    values, _ = parser.feed(("\r\n".join(lines) + "\r\n").encode())
+    assert values.shape == (2, len(MONITOR_COLUMNS))
+    assert parser.malformed == 1
+
+
+def test_other_lines_keep_sample_index_after_bad_rows():
+    parser = ChunkParser(TEKANAN)
+    data = (b"Tekanan: 1.00 mmHg\n"
+            b"Tekanan: x mmHg\n"
+            b"Tekanan: 2.00 mmHg\n"
+            b"=== HASIL NIBP ===\n"
+            b"Tekanan: 3.00 mmHg\n")
+    values, other = parser.feed(data)
+    np.testing.assert_allclose(values[:, 0], [1.0, 2.0, 3.0])
+    # Baris HASIL datang setelah 2 sampel valid (baris rusak tidak dihitung)
+    assert other == [(2, "=== HASIL NIBP ===")]
+
+
+def test_prefix_matching_follows_original_scripts():
+    # ECG: startswith (PYTHONCODE.py); Tekanan/Pressure: `in` (NIBP System.py, Serial_Pythoncode.py)
+    ecg = ChunkParser(ECG_SPO2_RESP)
+    values, other = ecg.feed(b"  ECG:1,SpO2:2,RESP:3\nlog ECG:4,SpO2:5,RESP:6\n")
+    np.testing.assert_allclose(values, [[1.0, 2.0, 3.0]])
+    assert other == [(1, "log ECG:4,SpO2:5,RESP:6")]
+    # Di skrip NIBP lama baris ini masuk cabang data lalu float() gagal: di sini dihitung malformed
+    tekanan = ChunkParser(TEKANAN)
+    values, other = tekanan.feed(b"> Tekanan: 150.00 mmHg\nTekanan: 1.00 mmHg\n")
+    np.testing.assert_allclose(values, [[1.0]])
+    assert other == [] and tekanan.malformed == 1
+
+
+def test_overlong_line_without_newline_is_dropped():
+    parser = ChunkParser(TEKANAN)
+    parser.feed(b"x" * (ChunkParser.MAX_LINE + 1))
+    assert parser.malformed == 1 and parser.carry == b""
+    np.testing.assert_allclose(parser.feed(b"Tekanan: 5.00 mmHg\n").values, [[5.0]])
+
+
+def test_monitor_stream_text_then_partial_lines():
+    rows = monitor_rows(20, noise=0.0, rng=np.random.default_rng(0))
+    data = ("AFE44xx Inisiasi Selesai\r\n" + "\r\n".join(format_monitor_line(r) for r in rows) + "\r\n").encode()
+    parser = MonitorStreamParser()
+    out = [parser.feed(data[i:i + 13]) for i in range(0, len(data), 13)]
+    values = np.concatenate(out)
+    assert values.shape == (20, len(MONITOR_COLUMNS))
+    np.testing.assert_allclose(values[:, :9], np.round(rows[:, :9], 2))
+    assert parser.malformed == 1
+    assert not parser.decoder.locked
+
+
+def test_monitor_stream_switches_to_binary_with_split_sync():
+    rows = monitor_rows(5, noise=0.0, rng=np.random.default_rng(0))
+    frames = encode_frames(rows)
+    data = b"AFE44xx Inisiasi Selesai\r\n" + frames
+    cut = data.index(frames[:2]) + 1  # A5 di chunk pertama, 5A di chunk berikutnya
+    parser = MonitorStreamParser()
+    values = np.concatenate([parser.feed(data[:cut]), parser.feed(data[cut:cut + FRAME_SIZE]),
+                             parser.feed(data[cut + FRAME_SIZE:])])
+    assert len(values) == 5
+    assert parser.decoder.locked
+    assert parser.decoder.crc_errors == 0
+
+
+def test_nibp_result_formats():
+    inline = "HASIL: Sistolik=120 mmHg, Diastolik=80 mmHg, BPM=72"
+    assert parse_nibp_result(inline) == (120.0, 80.0, 72.0)
+    block = ["=== HASIL NIBP ===", "Sistolik  : 118.5 mmHg", "Diastolik : 76.0 mmHg",
+             "MAP       : 90.2 mmHg", "===================================",
+             "Ketik START lagi untuk pengukuran baru."]
+    assert parse_nibp_result("\n".join(block)) == (118.5, 76.0, None)
+    assert parse_nibp_result("=== HASIL NIBP ===") is None
+    # Blok baru lengkap setelah garis penutup; baris sesudahnya tidak ikut
+    assert nibp_result_lines([inline]) == [inline]
+    assert nibp_result_lines(block[:3]) is None
+    assert nibp_result_lines(block) == block[:5]
@@ -0,0 +1,57 @@
+"""BlitLinePlot: garis didekimasi ke lebar axes, hasil inkremental sama dengan dekimasi sekaligus."""
+import os
+
+import numpy as np
+import pytest
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+QtWidgets = pytest.importorskip('PyQt5.QtWidgets')
+
+from decimation import minmax_decimate  # noqa: E402
+from live_plot import BlitLinePlot  # noqa: E402
+
+
+@pytest.fixture(scope='module')
+def app():
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+
+def test_blit_plot_decimates_incrementally(app):
+    plot = BlitLinePlot()
+    plot.widget.resize(800, 300)
+    plot.widget.show()
+    app.processEvents()
+    y = np.sin(np.arange(20000) / 37.0) * 40 + 100
+    y[12345] = 250.0  # spike satu sampel harus tetap tergambar
+    for start in range(0, len(y), 97):
+        plot.append(y[start:start + 97])
+        plot.redraw()
+    app.processEvents()
+
+    xs, ys = plot.line.get_data()
+    width = plot.ax.bbox.width
+    bin_size = plot.decimated.bin_size
+    assert bin_size > 1
+    # Paling banyak 2 titik per pixel (plus sisa bin terakhir)
+    assert len(ys) <= 2 * (plot.ax.get_xlim()[1] / bin_size) + bin_size
+    assert len(ys) <= 4 * width
+    assert ys.max() == 250.0 and ys.min() == y.min()
+
+    full = len(y) // bin_size * bin_size
+    x_ref, y_ref = minmax_decimate(np.arange(full, dtype=np.float64), y[:full], bin_size)
+    m = len(y_ref)
+    np.testing.assert_array_equal(xs[:m], x_ref)
+    np.testing.assert_array_equal(ys[:m], y_ref)
+    np.testing.assert_array_equal(ys[m:], y[full:])
+
+
+def test_blit_plot_reset_clears_cached_bins(app):
+    plot = BlitLinePlot()
+    plot.widget.show()
+    plot.append(np.linspace(0, 40, 3000))
+    plot.redraw()
+    plot.reset()
+    plot.append([1.0, 2.0, 3.0])
+    plot.redraw()
+    app.processEvents()
+    np.testing.assert_array_equal(plot.line.get_data()[1], [1.0, 2.0, 3.0])
@@ -0,0 +1,240 @@
+"""SerialHub di port pty (os.openpty lewat VirtualSerialPort) dan loop:// (tanpa file descriptor)."""
+import asyncio
+import time
+
+import numpy as np
+import pytest
+import serial
+
+import serial_hub
+from firmware_emulator import VirtualSerialPort, format_monitor_line
+from serial_hub import DeviceConfig, SerialHub
+from synthetic import monitor_rows
+
+ECG_LINE = b"ECG:0.12,SpO2:0.98,RESP:0.50\r\n"
+TEKANAN_LINE = b"Tekanan: 123.45 mmHg\r\n"
+PRESSURE_LINE = b"Pressure (mmHg): 123.4 | Smoothed: 120.1\r\n"
+
+
+async def wait_until(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("kondisi tidak terpenuhi sebelum timeout")
+        await asyncio.sleep(0.005)
+
+
+async def start(hub):
+    task = asyncio.create_task(hub.run())
+    await asyncio.sleep(0)
+    return task
+
+
+async def stop(hub, task):
+    hub.stop()
+    await asyncio.wait_for(task, 1.0)
+
+
+@pytest.fixture
+def pty_port():
+    port = VirtualSerialPort()
+    yield port
+    port.close()
+
+
+@pytest.fixture
+def opened(monkeypatch):
+    """Catat setiap port yang dibuka hub (waktu, objek serial) supaya tes bisa menulis ke loop://"""
+    ports = []
+    real = serial.serial_for_url
+
+    def serial_for_url(*args, **kwargs):
+        try:
+            ser = real(*args, **kwargs)
+        except Exception:
+            ports.append((time.monotonic(), None))
+            raise
+        ports.append((time.monotonic(), ser))
+        return ser
+
+    monkeypatch.setattr(serial_hub.serial, 'serial_for_url', serial_for_url)
+    return ports
+
+
+def monitor_payload(n):
+    rows = monitor_rows(n, noise=0.0, rng=np.random.default_rng(0))
+    return rows, ("\r\n".join(format_monitor_line(r) for r in rows) + "\r\n").encode()
+
+
+@pytest.mark.parametrize('fmt, payload, expected', [
+    ('ecg', ECG_LINE * 3, [[0.12, 0.98, 0.50]] * 3),
+    ('tekanan', TEKANAN_LINE * 2, [[123.45]] * 2),
+    ('pressure', PRESSURE_LINE, [[123.4, 120.1]]),
+])
+def test_pty_parses_each_format(pty_port, fmt, payload, expected):
+    async def main():
+        hub = SerialHub([DeviceConfig('bed', pty_port.port, fmt=fmt)])
+        task = await start(hub)
+        state = hub.devices['bed']
+        await wait_until(lambda: state.connected)
+        pty_port.write(payload)
+        await wait_until(lambda: state.samples == len(expected))
+        await stop(hub, task)
+        return state
+
+    state = asyncio.run(main())
+    _, rows = state.ring.read()
+    np.testing.assert_allclose(rows, expected, rtol=1e-6)
+    assert state.malformed == 0
+
+
+def test_pty_parses_monitor_lines(pty_port):
+    sent, payload = monitor_payload(50)
+
+    async def main():
+        hub = SerialHub([DeviceConfig('bed', pty_port.port, fmt='monitor')])
+        task = await start(hub)
+        state = hub.devices['bed']
+        await wait_until(lambda: state.connected)
+        pty_port.write(payload)
+        await wait_until(lambda: state.samples == len(sent))
+        await stop(hub, task)
+        return state
+
+    state = asyncio.run(main())
+    _, rows = state.ring.read()
+    assert rows.shape == (50, len(serial_hub.MONITOR_COLUMNS))
+    # Teks firmware dibulatkan 2 desimal, ring buffer float32
+    np.testing.assert_allclose(rows[:, :9], np.round(np.asarray(sent)[:, :9], 2), atol=1e-4)
+
+
+def test_pty_counts_malformed_lines(pty_port):
+    async def main():
+        hub = SerialHub([DeviceConfig('nibp', pty_port.port, fmt='tekanan')])
+        task = await start(hub)
+        state = hub.devices['nibp']
+        await wait_until(lambda: state.connected)
+        pty_port.write(TEKANAN_LINE + b"Tekanan: abc mmHg\r\n" + b"Tekanan: 1,2 mmHg\r\n" + TEKANAN_LINE)
+        await wait_until(lambda: state.samples == 2 and state.malformed == 2)
+        await stop(hub, task)
+        return state
+
+    state = asyncio.run(main())
+    assert state.samples == 2
+    assert state.malformed == 2
+
+
+def test_pty_line_split_across_chunks(pty_port):
+    async def main():
+        hub = SerialHub([DeviceConfig('nibp', pty_port.port, fmt='tekanan')])
+        task = await start(hub)
+        state = hub.devices['nibp']
+        await wait_until(lambda: state.connected)
+        pty_port.write(b"Tekanan: 12")
+        # Potongan pertama harus sudah dibaca hub sebelum sisanya datang
+        await asyncio.sleep(0.05)
+        assert state.samples == 0
+        pty_port.write(b"3.5 mmHg\r\nTekan")
+        await wait_until(lambda: state.samples == 1)
+        pty_port.write(b"an: 99.0 mmHg\r\n")
+        await wait_until(lambda: state.samples == 2)
+        await stop(hub, task)
+        return state
+
+    state = asyncio.run(main())
+    _, rows = state.ring.read()
+    np.testing.assert_allclose(rows[:, 0], [123.5, 99.0])
+    assert state.malformed == 0
+
+
+def test_pty_port_disappears_retries_with_backoff(pty_port, opened):
+    async def main():
+        hub = SerialHub([DeviceConfig('nibp', pty_port.port, fmt='tekanan')], min_backoff=0.02, max_backoff=0.08)
+        task = await start(hub)
+        state = hub.devices['nibp']
+        await wait_until(lambda: state.connected)
+        pty_port.write(TEKANAN_LINE)
+        await wait_until(lambda: state.samples == 1)
+        # Sisi master ditutup: device pty hilang seperti USB dicabut
+        pty_port.close()
+        await wait_until(lambda: not state.connected and len(opened) >= 6)
+        await stop(hub, task)
+        return state
+
+    state = asyncio.run(main())
+    assert state.connects == 1
+    assert state.last_error
+    # Percobaan buka ulang gagal semua, jeda berlipat dua sampai max_backoff
+    times = [t for t, ser in opened]
+    assert opened[0][1] is not None and all(ser is None for _, ser in opened[1:])
+    # (sleep tidak pernah lebih cepat; batas atas longgar hanya memastikan jeda berhenti di max_backoff)
+    gaps = np.diff(times[1:])
+    assert 0.04 <= gaps[0] < 0.08
+    assert all(0.08 <= gap < 0.3 for gap in gaps[1:])
+
+
+def test_loop_url_reconnects_after_close(opened):
+    async def main():
+        hub = SerialHub([DeviceConfig('bed', 'loop://', fmt='ecg')], min_backoff=0.02, poll_interval=0.002)
+        task = await start(hub)
+        state = hub.devices['bed']
+        await wait_until(lambda: state.connected)
+        opened[-1][1].write(ECG_LINE)
+        await wait_until(lambda: state.samples == 1)
+        # Port ditutup dari luar: read raise, hub menunggu min_backoff lalu membuka port baru
+        opened[-1][1].close()
+        await wait_until(lambda: state.connects == 2 and state.connected)
+        opened[-1][1].write(ECG_LINE * 2)
+        await wait_until(lambda: state.samples == 3)
+        await stop(hub, task)
+        return state
+
+    state = asyncio.run(main())
+    assert state.last_error
+    assert opened[1][0] - opened[0][0] >= 0.02
+    _, rows = state.ring.read()
+    assert len(rows) == 3
+
+
+def test_stop_is_clean(pty_port, opened):
+    async def main():
+        hub = SerialHub([DeviceConfig('pty', pty_port.port, fmt='tekanan'),
+                         DeviceConfig('loop', 'loop://', fmt='ecg')], poll_interval=0.002)
+        task = await start(hub)
+        await wait_until(lambda: all(s.connected for s in hub.devices.values()))
+        # Hub sedang menunggu data di kedua port; stop() harus membangunkan dan menutup semuanya
+        t0 = time.monotonic()
+        await stop(hub, task)
+        return hub, time.monotonic() - t0
+
+    hub, elapsed = asyncio.run(main())
+    assert elapsed < 0.5
+    assert not any(s.connected for s in hub.devices.values())
+    assert all(not ser.is_open for _, ser in opened)
+    assert not hub._events
+
+
+def test_hub_thread_serves_ports_from_background_thread(pty_port, opened):
+    # Satu thread untuk semua device (dipakai central_station); loop:// ditutup dari luar lalu dibuka ulang
+    sent, payload = monitor_payload(20)
+    hub = SerialHub([DeviceConfig('bed1', pty_port.port, fmt='monitor'),
+                     DeviceConfig('bed2', 'loop://', fmt='monitor')], min_backoff=0.02, poll_interval=0.002)
+    runner = serial_hub.HubThread(hub)
+    runner.start()
+    runner.start()
+    try:
+        bed1, bed2 = hub.devices['bed1'], hub.devices['bed2']
+        deadline = time.monotonic() + 2.0
+        while not (bed1.connected and bed2.connected):
+            assert time.monotonic() < deadline
+            time.sleep(0.005)
+        pty_port.write(payload)
+        next(ser for _, ser in opened if ser is not None and ser.portstr == 'loop://').close()
+        while not (bed1.samples == len(sent) and bed2.connects == 2):
+            assert time.monotonic() < deadline
+            time.sleep(0.005)
+    finally:
+        runner.stop(timeout=1.0)
+    assert not runner.thread.is_alive()
+    assert len(bed1.ring.read()[1]) == len(sent)
+    assert not any(s.connected for s in hub.devices.values())